@@ -1,13 +1,27 @@
 from flask import Flask, render_template
-from config import SQLALCHEMY_DATABASE_URI, UPLOAD_FOLDER
+from config import (
+    SQLALCHEMY_DATABASE_URI, UPLOAD_FOLDER, DOCUMENT_WORKERS,
+    JOB_POLL_INTERVAL, JOB_STALE_SECONDS, JOB_STALE_CHECK_INTERVAL, JOB_MAX_ATTEMPTS, JOB_MAX_WAIT,
+    EXTRACTION_BATCH_SIZE, EXTRACTION_FLUSH_SECONDS, MAX_UPLOAD_BYTES,
+    JOINT_BATCH_WORKERS
+)
 from database.init_db import init_database
 import os
 
-def create_app():
+def create_app(start_workers=True):
     app = Flask(__name__, template_folder='templates', static_folder='static')
     app.config['SQLALCHEMY_DATABASE_URI'] = SQLALCHEMY_DATABASE_URI
     app.config['UPLOAD_FOLDER'] = str(UPLOAD_FOLDER)
-    app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+    app.config['MAX_CONTENT_LENGTH'] = MAX_UPLOAD_BYTES  # Max request size (default 16MB)
+    app.config['DOCUMENT_WORKERS'] = DOCUMENT_WORKERS
+    app.config['JOB_POLL_INTERVAL'] = JOB_POLL_INTERVAL
+    app.config['JOB_STALE_SECONDS'] = JOB_STALE_SECONDS
+    app.config['JOB_STALE_CHECK_INTERVAL'] = JOB_STALE_CHECK_INTERVAL
+    app.config['JOB_MAX_ATTEMPTS'] = JOB_MAX_ATTEMPTS
+    app.config['JOB_MAX_WAIT'] = JOB_MAX_WAIT
+    app.config['EXTRACTION_BATCH_SIZE'] = EXTRACTION_BATCH_SIZE
+    app.config['EXTRACTION_FLUSH_SECONDS'] = EXTRACTION_FLUSH_SECONDS
+    app.config['JOINT_BATCH_WORKERS'] = JOINT_BATCH_WORKERS
     
     # Ensure upload directory exists
     os.makedirs(UPLOAD_FOLDER, exist_ok=True)
@@ -49,9 +63,16 @@ def create_app():
     with app.app_context():
         init_database()
     
+    # Start background document processing workers
+    if start_workers:
+        from services.document_job_queue import DocumentJobQueue
+        DocumentJobQueue.start(app)
+    
     return app
 
 if __name__ == '__main__':
-    app = create_app()
+    # The debug reloader's parent process only watches files and restarts the
+    # child (WERKZEUG_RUN_MAIN set), which serves requests and runs the workers
+    app = create_app(start_workers=os.environ.get('WERKZEUG_RUN_MAIN') == 'true')
     app.run(debug=True, host='0.0.0.0', port=5555)
 
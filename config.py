@@ -11,12 +11,29 @@ SQLALCHEMY_TRACK_MODIFICATIONS = False
 
 # File upload configuration
 UPLOAD_FOLDER = BASE_DIR / 'static' / 'uploads'
-MAX_UPLOAD_SIZE = 16 * 1024 * 1024  # 16MB
+MAX_UPLOAD_BYTES = int(os.environ.get('MAX_UPLOAD_BYTES', 16 * 1024 * 1024))  # Upload size limit; files stream to disk in chunks
 ALLOWED_EXTENSIONS = {'pdf', 'jpg', 'jpeg', 'png'}
 
+# Document processing queue (see services/document_job_queue.py)
+DOCUMENT_WORKERS = int(os.environ.get('DOCUMENT_WORKERS', 2))  # Background workers; 0 processes inline
+JOB_POLL_INTERVAL = 1.0  # Seconds between checks for jobs queued by other processes
+JOB_STALE_SECONDS = 600  # Jobs 'processing' longer than this are re-queued
+JOB_STALE_CHECK_INTERVAL = 60  # Seconds between the workers' checks for stale jobs
+JOB_MAX_ATTEMPTS = 3
+JOB_MAX_WAIT = 30  # Longest long-poll a client may request, in seconds
+EXTRACTION_BATCH_SIZE = 50  # ExtractedData rows per write while a document streams through parsing
+EXTRACTION_FLUSH_SECONDS = 2.0  # Longest a parsed field waits before it is written
+
+# Household batch joint analysis (see services/household_batch_service.py)
+JOINT_BATCH_WORKERS = int(os.environ.get('JOINT_BATCH_WORKERS', 4))  # Couples analyzed at once
+
 # Security
 SECRET_KEY = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
 
 # OCR Configuration
 TESSERACT_CMD = os.environ.get('TESSERACT_CMD', None)  # Path to tesseract executable if needed
+OCR_MAX_PROCESSES = int(os.environ.get('OCR_MAX_PROCESSES', 0))  # Page extraction processes; 0 = one per core
+OCR_RESOLUTION = 300  # DPI used to rasterize scanned PDF pages for OCR
+OCR_CACHE_FOLDER = BASE_DIR / 'cache' / 'ocr'  # Content-addressed extraction results
+OCR_CACHE_MAX_BYTES = int(os.environ.get('OCR_CACHE_MAX_BYTES', 256 * 1024 * 1024))  # LRU eviction above this size
 
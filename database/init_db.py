@@ -1,5 +1,6 @@
 from models import db, IRSReference, AnalysisSummary, TaxBracket, StandardDeduction
-from sqlalchemy import text
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import IntegrityError
 
 def init_database():
     """Initialize database tables and seed IRS references"""
@@ -11,8 +12,11 @@ def init_database():
     from models.irs_reference import IRSReference
     from models.tax_tables import TaxBracket, StandardDeduction
     from models.joint_analysis import JointAnalysisSummary
+    from models.processing_job import ProcessingJob, ProcessingBatch
 
     db.create_all()
+    add_missing_columns()
+    create_data_version_triggers()
 
     # Enable WAL mode for concurrent reads + writes (REQ-12)
     # Dual-filer analysis doubles write frequency; WAL prevents "database locked" errors
@@ -23,6 +27,56 @@ def init_database():
     seed_irs_references()
     populate_tax_tables()
 
+def add_missing_columns():
+    """
+    Add model columns missing from existing tables.
+
+    db.create_all() only creates missing tables, so a database created before a
+    column or index was added to a model gets the column (nullable, with the
+    column's server default if it has one) and the index here. A unique index
+    that existing rows violate is skipped with a warning.
+    """
+    inspector = inspect(db.engine)
+    existing_tables = []
+
+    for table in db.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing_tables.append(table)
+        existing_columns = {column['name'] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing_columns:
+                continue
+            column_type = column.type.compile(dialect=db.engine.dialect)
+            default = f' DEFAULT {column.server_default.arg}' if column.server_default is not None else ''
+            db.session.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}{default}'))
+
+    db.session.commit()
+
+    for table in existing_tables:
+        for index in table.indexes:
+            try:
+                index.create(db.engine, checkfirst=True)
+            except IntegrityError:
+                print(f"Warning: could not create unique index {index.name}; existing {table.name} rows are duplicates")
+
+def create_data_version_triggers():
+    """
+    Keep clients.data_version current on every ExtractedData insert, update and delete.
+
+    Triggers cover ORM writes, bulk inserts and bulk deletes alike, so analysis
+    cache validation can read one client row instead of scanning its data.
+    """
+    bump = 'UPDATE clients SET data_version = data_version + 1'
+    triggers = {
+        'extracted_data_version_insert': f'AFTER INSERT ON extracted_data BEGIN {bump} WHERE id = NEW.client_id; END',
+        'extracted_data_version_update': f'AFTER UPDATE ON extracted_data BEGIN {bump} WHERE id IN (OLD.client_id, NEW.client_id); END',
+        'extracted_data_version_delete': f'AFTER DELETE ON extracted_data BEGIN {bump} WHERE id = OLD.client_id; END',
+    }
+    for name, body in triggers.items():
+        db.session.execute(text(f'CREATE TRIGGER IF NOT EXISTS {name} {body}'))
+    db.session.commit()
+
 def seed_irs_references():
     """Seed IRS references table with common tax code sections"""
     # Check if already seeded
@@ -10,6 +10,7 @@ from models.joint_analysis import JointAnalysisSummary
 from models.itemized_deduction import ItemizedDeduction
 from models.irs_reference import IRSReference
 from models.tax_tables import TaxBracket, StandardDeduction
+from models.processing_job import ProcessingJob, ProcessingBatch
 
-__all__ = ['db', 'Client', 'Document', 'ExtractedData', 'AnalysisResult', 'AnalysisSummary', 'JointAnalysisSummary', 'ItemizedDeduction', 'IRSReference', 'TaxBracket', 'StandardDeduction']
+__all__ = ['db', 'Client', 'Document', 'ExtractedData', 'AnalysisResult', 'AnalysisSummary', 'JointAnalysisSummary', 'ItemizedDeduction', 'IRSReference', 'TaxBracket', 'StandardDeduction', 'ProcessingJob', 'ProcessingBatch']
 
@@ -18,6 +18,7 @@ class Client(db.Model):
     phone = db.Column(db.Text, nullable=True)
     address = db.Column(db.Text, nullable=True)
     spouse_id = db.Column(db.Integer, db.ForeignKey('clients.id'), nullable=True)
+    data_version = db.Column(db.Integer, default=0, server_default='0', nullable=False)  # Bumped by triggers on every ExtractedData write
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -11,11 +11,18 @@ class Document(db.Model):
     file_type = db.Column(db.Text, nullable=False)  # pdf, jpg, png
     tax_year = db.Column(db.Integer, nullable=True)
     uploaded_at = db.Column(db.DateTime, default=datetime.utcnow)
-    ocr_status = db.Column(db.Text, default='pending')  # pending, processing, completed, failed
+    ocr_status = db.Column(db.Text, default='pending')  # pending, queued, processing, completed, failed
     attribution = db.Column(db.Text, default='taxpayer', nullable=False)  # 'taxpayer', 'spouse', 'joint'
+    content_hash = db.Column(db.Text, nullable=True)  # SHA-256 of the file, set on upload
 
     # Relationships
     extracted_data = db.relationship('ExtractedData', backref='document', lazy=True, cascade='all, delete-orphan')
+    processing_jobs = db.relationship('ProcessingJob', backref='document', lazy=True, cascade='all, delete-orphan')
+    
+    # A unique index rather than a constraint, so add_missing_columns can add it to existing databases
+    __table_args__ = (
+        db.Index('unique_client_document_hash', 'client_id', 'content_hash', unique=True),
+    )
     
     def to_dict(self):
         return {
@@ -27,6 +34,7 @@ class Document(db.Model):
             'tax_year': self.tax_year,
             'uploaded_at': self.uploaded_at.isoformat() if self.uploaded_at else None,
             'ocr_status': self.ocr_status,
-            'attribution': self.attribution
+            'attribution': self.attribution,
+            'content_hash': self.content_hash
         }
 
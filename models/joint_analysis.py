@@ -43,6 +43,7 @@ class JointAnalysisSummary(db.Model):
 
     # Caching
     data_version_hash = db.Column(db.String(64))  # Combined hash from both spouses
+    result_snapshot = db.Column(db.Text, nullable=True)  # JSON of the full analyze_joint result, returned on cache hits
     last_analyzed_at = db.Column(db.DateTime, default=datetime.utcnow)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,78 @@
+from models import db
+from datetime import datetime
+import json
+
+
+class ProcessingJob(db.Model):
+    __tablename__ = 'processing_jobs'
+
+    id = db.Column(db.Integer, primary_key=True)
+    document_id = db.Column(db.Integer, db.ForeignKey('documents.id'), nullable=False, index=True)
+    client_id = db.Column(db.Integer, db.ForeignKey('clients.id'), nullable=False)
+    batch_id = db.Column(db.Integer, db.ForeignKey('processing_batches.id'), nullable=True, index=True)
+    status = db.Column(db.Text, default='queued', nullable=False, index=True)  # queued, processing, completed, failed
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    result = db.Column(db.Text, nullable=True)  # JSON response payload once completed
+    error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    def to_dict(self):
+        """Convert to dictionary"""
+        result_dict = None
+        if self.result:
+            try:
+                result_dict = json.loads(self.result)
+            except (json.JSONDecodeError, TypeError):
+                pass
+
+        return {
+            'id': self.id,
+            'document_id': self.document_id,
+            'client_id': self.client_id,
+            'batch_id': self.batch_id,
+            'status': self.status,
+            'attempts': self.attempts,
+            'result': result_dict,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+
+class ProcessingBatch(db.Model):
+    """A client's documents processed together, with one analysis run after the last job"""
+    __tablename__ = 'processing_batches'
+
+    id = db.Column(db.Integer, primary_key=True)
+    client_id = db.Column(db.Integer, db.ForeignKey('clients.id'), nullable=False, index=True)
+    status = db.Column(db.Text, default='processing', nullable=False)  # processing, analyzing, completed
+    analysis_triggered = db.Column(db.Boolean, default=False, nullable=False)
+    analysis_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    jobs = db.relationship('ProcessingJob', backref='batch', lazy=True, order_by='ProcessingJob.id')
+
+    def to_dict(self):
+        """Convert to dictionary, with each job's status but not its result"""
+        return {
+            'id': self.id,
+            'client_id': self.client_id,
+            'status': self.status,
+            'analysis_triggered': self.analysis_triggered,
+            'analysis_error': self.analysis_error,
+            'jobs': [
+                {
+                    'id': job.id,
+                    'document_id': job.document_id,
+                    'status': job.status,
+                    'error': job.error
+                }
+                for job in self.jobs
+            ],
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
@@ -1,9 +1,14 @@
 from flask import Blueprint, request, jsonify
 from services.tax_calculator import TaxCalculator
+from services.s_corp_optimizer import SCorpOptimizerService
 from models import TaxBracket, StandardDeduction
+import numpy as np
 
 calculator_bp = Blueprint('calculator', __name__)
 
+# Upper bound on points per income sweep request
+MAX_SWEEP_STEPS = 5000
+
 # US States list
 US_STATES = [
     {'code': 'AL', 'name': 'Alabama'}, {'code': 'AK', 'name': 'Alaska'}, {'code': 'AZ', 'name': 'Arizona'},
@@ -105,14 +110,12 @@ def calculate_tax():
         total_state_tax = 0.0
         
         if multiple_states and selected_states:
-            # Calculate for multiple selected states
-            for state in selected_states:
-                state_result = TaxCalculator.calculate_state_tax(
-                    income_for_state_tax, filing_status, dependents, state, tax_year
-                )
-                if state_result:
-                    state_results.append(state_result)
-                    total_state_tax += state_result['total_tax']
+            # Calculate for multiple selected states in one pass
+            state_results = TaxCalculator.calculate_multi_state_tax(
+                income_for_state_tax, filing_status, dependents, selected_states, tax_year
+            )
+            for state_result in state_results:
+                total_state_tax += state_result['total_tax']
         elif state_code:
             # Calculate for single state
             state_result = TaxCalculator.calculate_state_tax(
@@ -152,6 +155,285 @@ def calculate_tax():
         }), 400
 
 
+@calculator_bp.route('/calculator/compare-states', methods=['POST'])
+def compare_states():
+    """
+    Compare total tax across states for relocation analysis.
+
+    Accepts the /calculator/calculate payload. Federal tax is calculated once and
+    every state (or 'selected_states' if given) is evaluated at the same income.
+    Returns rows sorted by total tax, lowest first; if 'state_code' is given each
+    row also reports the difference from that state.
+    """
+    try:
+        data = request.get_json()
+
+        income = float(data.get('income', 0))
+        income_frequency = data.get('income_frequency', 'annual')
+        income_source = data.get('income_source', 'w2')
+        salary = float(data.get('salary', 0))
+        distributions = float(data.get('distributions', 0))
+        filing_status = data.get('filing_status', 'single')
+        dependents = int(data.get('dependents', 0))
+        state_code = data.get('state_code', None)
+        selected_states = data.get('selected_states', [])
+        tax_year = int(data.get('tax_year', 2026))
+
+        if income_source in ['llc_s_corp', 's_corp']:
+            if not salary or salary <= 0:
+                return jsonify({
+                    'success': False,
+                    'error': 'Salary is required for S-Corp income sources'
+                }), 400
+            annual_income = salary + distributions
+        else:
+            annual_income = TaxCalculator.convert_income_to_annual(income, income_frequency)
+
+        federal_result = TaxCalculator.calculate_federal_tax(
+            annual_income, filing_status, dependents, tax_year,
+            income_source=income_source, salary=salary, distributions=distributions
+        )
+        gross_income = federal_result.get('gross_income', annual_income)
+
+        state_names = {state['code']: state['name'] for state in US_STATES}
+        state_codes = [code.upper() for code in selected_states if code] or list(state_names)
+        state_results = TaxCalculator.calculate_multi_state_tax(
+            gross_income, filing_status, dependents, state_codes, tax_year,
+            include_breakdown=False
+        )
+
+        rows = []
+        for code, state_result in zip(state_codes, state_results):
+            total_tax = federal_result['total_tax'] + state_result['total_tax']
+            rows.append({
+                'state_code': code,
+                'state_name': state_names.get(code, code),
+                'state_tax': state_result['total_tax'],
+                'state_effective_tax_rate': state_result['effective_tax_rate'],
+                'state_marginal_tax_rate': state_result['marginal_tax_rate'],
+                'no_income_tax': state_result.get('no_income_tax', False),
+                'total_tax': round(total_tax, 2),
+                'effective_tax_rate': round(total_tax / gross_income * 100, 2) if gross_income > 0 else 0.0
+            })
+        rows.sort(key=lambda row: (row['total_tax'], row['state_code']))
+
+        baseline = next((row for row in rows if state_code and row['state_code'] == state_code.upper()), None)
+        if baseline:
+            for row in rows:
+                row['difference'] = round(row['total_tax'] - baseline['total_tax'], 2)
+
+        return jsonify({
+            'success': True,
+            'annual_income': gross_income,
+            'federal': {
+                'total_tax': federal_result['total_tax'],
+                'effective_tax_rate': federal_result['effective_tax_rate'],
+                'marginal_tax_rate': federal_result['marginal_tax_rate']
+            },
+            'current_state': baseline['state_code'] if baseline else None,
+            'states': rows
+        })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+
+@calculator_bp.route('/calculator/sweep', methods=['POST'])
+def sweep_tax():
+    """
+    Calculate the federal + state tax curve over an income range in one request.
+
+    Accepts the /calculator/calculate payload plus 'income_min', 'income_max'
+    (annual amounts) and 'steps'. For S-Corp types each point keeps the payload's
+    salary share of total income. Evaluated with the batch calculators.
+    """
+    try:
+        data = request.get_json()
+
+        income_source = data.get('income_source', 'w2')
+        salary = float(data.get('salary', 0))
+        distributions = float(data.get('distributions', 0))
+        filing_status = data.get('filing_status', 'single')
+        dependents = int(data.get('dependents', 0))
+        state_code = data.get('state_code', None)
+        multiple_states = data.get('multiple_states', False)
+        selected_states = data.get('selected_states', [])
+        tax_year = int(data.get('tax_year', 2026))
+
+        income_min = float(data.get('income_min', 0))
+        income_max = float(data.get('income_max', 0))
+        steps = int(data.get('steps', 100))
+
+        if income_min < 0 or income_max <= income_min:
+            return jsonify({
+                'success': False,
+                'error': 'income_max must be greater than income_min (both 0 or greater)'
+            }), 400
+        if steps < 2 or steps > MAX_SWEEP_STEPS:
+            return jsonify({
+                'success': False,
+                'error': f'steps must be between 2 and {MAX_SWEEP_STEPS}'
+            }), 400
+
+        # Same S-Corp requirements as /calculator/calculate
+        if income_source in ['llc_s_corp', 's_corp']:
+            if not salary or salary <= 0:
+                return jsonify({
+                    'success': False,
+                    'error': 'Salary is required for S-Corp income sources'
+                }), 400
+            if distributions < 0:
+                return jsonify({
+                    'success': False,
+                    'error': 'Distributions must be 0 or greater'
+                }), 400
+
+        incomes = np.linspace(income_min, income_max, steps)
+
+        # Calculate federal tax curve
+        if income_source in ['llc_s_corp', 's_corp']:
+            salary_share = salary / (salary + distributions)
+            split = np.zeros(steps, dtype=[('salary', float), ('distributions', float)])
+            split['salary'] = incomes * salary_share
+            split['distributions'] = incomes - split['salary']
+            federal = TaxCalculator.calculate_federal_tax_batch(
+                split, filing_status, tax_year, income_source=income_source, dependents=dependents
+            )
+        else:
+            federal = TaxCalculator.calculate_federal_tax_batch(
+                incomes, filing_status, tax_year, income_source=income_source, dependents=dependents
+            )
+
+        # Calculate state tax curve(s)
+        if multiple_states and selected_states:
+            states = selected_states
+        elif state_code:
+            states = [state_code]
+        else:
+            states = []
+
+        state_curves = {}
+        state_tax = np.zeros(steps)
+        state_marginal = np.zeros(steps)
+        for state in states:
+            state_result = TaxCalculator.calculate_state_tax_batch(incomes, filing_status, state, tax_year)
+            state_curves[state.upper()] = state_result['total_tax'].tolist()
+            state_tax += state_result['total_tax']
+            # Highest selected state's rate, as /calculate reports it
+            state_marginal = np.maximum(state_marginal, state_result['marginal_tax_rate'])
+
+        total_tax = np.round(federal['total_tax'] + state_tax, 2)
+        safe_income = np.where(incomes > 0, incomes, 1.0)
+        effective_rate = np.where(incomes > 0, total_tax / safe_income * 100, 0.0)
+
+        # Breakpoints: first sweep point where the federal or state marginal rate changes
+        federal_marginal = federal['marginal_tax_rate']
+        changed = np.flatnonzero(
+            (np.diff(federal_marginal) != 0) | (np.diff(state_marginal) != 0)
+        ) + 1
+        breakpoints = [
+            {
+                'income': round(float(incomes[i]), 2),
+                'federal_marginal_rate': float(federal_marginal[i]),
+                'state_marginal_rate': round(float(state_marginal[i]), 2)
+            }
+            for i in np.concatenate(([0], changed))
+        ]
+
+        return jsonify({
+            'success': True,
+            'incomes': np.round(incomes, 2).tolist(),
+            'federal_tax': federal['total_tax'].tolist(),
+            'state_tax': np.round(state_tax, 2).tolist(),
+            'states': state_curves,
+            'total_tax': total_tax.tolist(),
+            'effective_tax_rate': np.round(effective_rate, 2).tolist(),
+            'federal_marginal_rate': federal_marginal.tolist(),
+            'state_marginal_rate': np.round(state_marginal, 2).tolist(),
+            'breakpoints': breakpoints
+        })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+
+@calculator_bp.route('/calculator/optimize-salary', methods=['POST'])
+def optimize_salary():
+    """
+    Find the S-Corp salary/distribution split that minimizes federal tax.
+
+    Accepts 'total_income' (or 'salary' + 'distributions', which is also treated
+    as the current split to compare against), 'filing_status', 'dependents',
+    'tax_year', 'income_source' and optional 'min_salary'.
+    """
+    try:
+        data = request.get_json()
+
+        income_source = data.get('income_source', 's_corp')
+        salary = float(data.get('salary', 0))
+        distributions = float(data.get('distributions', 0))
+        total_income = float(data.get('total_income', 0)) or salary + distributions
+        filing_status = data.get('filing_status', 'single')
+        dependents = int(data.get('dependents', 0))
+        tax_year = int(data.get('tax_year', 2026))
+        min_salary = float(data.get('min_salary', 0))
+
+        if income_source not in ['llc_s_corp', 's_corp']:
+            return jsonify({
+                'success': False,
+                'error': 'Salary optimization requires an S-Corp income source'
+            }), 400
+        if total_income <= 0:
+            return jsonify({
+                'success': False,
+                'error': 'Total S-Corp income must be greater than 0'
+            }), 400
+
+        result = SCorpOptimizerService.optimize_salary(
+            total_income, filing_status, tax_year, dependents,
+            income_source=income_source, min_salary=min_salary
+        )
+
+        # Compare against the submitted split when one was given
+        current = None
+        if salary + distributions > 0 and not data.get('total_income'):
+            current_result = TaxCalculator.calculate_federal_tax(
+                total_income, filing_status, dependents, tax_year,
+                income_source=income_source, salary=salary, distributions=distributions
+            )
+            current = {
+                'salary': salary,
+                'distributions': distributions,
+                'total_tax': current_result['total_tax'],
+                'savings': round(current_result['total_tax'] - result['total_tax'], 2)
+            }
+
+        return jsonify({
+            'success': True,
+            'total_income': total_income,
+            'optimal': {
+                'salary': result['salary'],
+                'distributions': result['distributions'],
+                'total_tax': result['total_tax']
+            },
+            'current': current,
+            'federal': result['federal'],
+            'curve': result['curve']
+        })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+
 def _get_annual_income(spouse_data):
     """Convert spouse data to annual income, handling S-Corp types."""
     income = float(spouse_data.get('income', 0))
@@ -255,7 +537,7 @@ def _calculate_mfj_combined(husband_data, wife_data, dependents, tax_year):
     taxable_income = max(0, combined_income - standard_deduction - qbi_deduction)
 
     # Income tax using MFJ brackets
-    brackets = TaxCalculator.get_tax_brackets('federal', None, 'married_joint', tax_year)
+    brackets = TaxCalculator.get_tax_schedule('federal', None, 'married_joint', tax_year)
     tax_result = TaxCalculator.calculate_tax_by_brackets(taxable_income, brackets)
 
     # Child tax credit (non-refundable)
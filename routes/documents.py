@@ -1,14 +1,32 @@
 from flask import Blueprint, request, jsonify, current_app
 from werkzeug.utils import secure_filename
-from models import db, Document, Client, ExtractedData
-from services.ocr_service import OCRService
-from services.tax_parser import TaxParser
+from werkzeug.exceptions import RequestEntityTooLarge
+from sqlalchemy.exc import IntegrityError
+from models import db, Document, Client, ExtractedData, ProcessingBatch
+from services.document_job_queue import DocumentJobQueue
+from services.upload_service import UploadService
 from services.analysis_engine import AnalysisEngine
 import os
+import tempfile
+import uuid
 from datetime import datetime
 
 documents_bp = Blueprint('documents', __name__)
 
+@documents_bp.errorhandler(RequestEntityTooLarge)
+def upload_too_large(e):
+    """Report uploads over MAX_UPLOAD_BYTES as JSON"""
+    max_mb = current_app.config.get('MAX_CONTENT_LENGTH', 0) / (1024 * 1024)
+    return jsonify({'error': f'File too large. Maximum upload size is {max_mb:g}MB'}), 413
+
+def duplicate_upload(temp_path, duplicate):
+    """Discard a repeated upload's temporary file and report the client's existing copy"""
+    os.remove(temp_path)
+    return jsonify({
+        'error': f'Duplicate upload: this file was already uploaded as "{duplicate.filename}"',
+        'document': duplicate.to_dict()
+    }), 409
+
 def allowed_file(filename):
     """Check if file extension is allowed"""
     return '.' in filename and \
@@ -49,12 +67,24 @@ def upload_document():
     file_ext = filename.rsplit('.', 1)[1].lower()
     file_type = 'pdf' if file_ext == 'pdf' else ('jpg' if file_ext in ['jpg', 'jpeg'] else 'png')
 
-    # Create unique filename
+    # Create unique filename; the file only moves there once its document is committed
+    upload_folder = current_app.config['UPLOAD_FOLDER']
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    unique_filename = f"{client_id}_{timestamp}_{filename}"
-    file_path = os.path.join(current_app.config['UPLOAD_FOLDER'], unique_filename)
+    unique_filename = f"{client_id}_{timestamp}_{uuid.uuid4().hex[:12]}_{filename}"
+    file_path = os.path.join(upload_folder, unique_filename)
+
+    # Stream to a temporary file in chunks, hashing as it is written, so a
+    # rejected upload never touches another document's file
+    temp_fd, temp_path = tempfile.mkstemp(dir=upload_folder, suffix='.part')
+    os.close(temp_fd)
+    content_hash, _ = UploadService.save_stream(
+        file.stream, temp_path, current_app.config.get('MAX_CONTENT_LENGTH')
+    )
 
-    file.save(file_path)
+    # Reject a repeat of a file this client already uploaded, before any OCR is queued
+    duplicate = UploadService.find_duplicate(client_id, content_hash)
+    if duplicate:
+        return duplicate_upload(temp_path, duplicate)
 
     # Create document record with attribution
     document = Document(
@@ -64,11 +94,27 @@ def upload_document():
         file_type=file_type,
         tax_year=tax_year,
         attribution=attribution,
-        ocr_status='pending'
+        ocr_status='pending',
+        content_hash=content_hash
     )
 
     db.session.add(document)
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        # A concurrent upload of the same file committed first (unique client_id, content_hash)
+        db.session.rollback()
+        duplicate = UploadService.find_duplicate(client_id, content_hash)
+        if not duplicate:
+            os.remove(temp_path)
+            raise
+        return duplicate_upload(temp_path, duplicate)
+    except BaseException:
+        db.session.rollback()
+        os.remove(temp_path)
+        raise
+
+    os.replace(temp_path, file_path)
 
     return jsonify(document.to_dict()), 201
 
@@ -80,52 +126,93 @@ def get_document(document_id):
 
 @documents_bp.route('/documents/<int:document_id>/process', methods=['POST'])
 def process_document(document_id):
-    """Process document with OCR and extract tax data"""
+    """
+    Queue a document for OCR and tax data extraction.
+
+    Returns 202 with the job; poll GET /documents/jobs/<job_id> for the result.
+    With no background workers configured the job runs inline and the finished
+    job is returned with 200.
+    """
     document = Document.query.get_or_404(document_id)
-    
-    # Update status
-    document.ocr_status = 'processing'
-    db.session.commit()
-    
-    try:
-        # Extract text using OCR
-        text = OCRService.extract_text(document.file_path, document.file_type)
-        
-        # Parse tax data
-        parsed_data = TaxParser.parse_text(text, document.id, document.client_id)
-        
-        # Update status
-        document.ocr_status = 'completed'
-        db.session.commit()
-        
-        # Automatically trigger analysis after successful extraction
-        analysis_triggered = False
-        analysis_error = None
-        try:
-            strategies, summary = AnalysisEngine.analyze_client(document.client_id)
-            analysis_triggered = True
-        except Exception as analysis_ex:
-            # Log error but don't fail the document processing
-            analysis_error = str(analysis_ex)
-            current_app.logger.error(f'Analysis failed for client {document.client_id}: {analysis_error}')
-        
-        response_data = {
-            'message': 'Document processed successfully',
-            'document': document.to_dict(),
-            'forms_detected': list(parsed_data.keys()),
-            'parsed_data': parsed_data,
-            'analysis_triggered': analysis_triggered
-        }
-        
-        if analysis_error:
-            response_data['analysis_error'] = analysis_error
-        
-        return jsonify(response_data), 200
-    
-    except Exception as e:
-        document.ocr_status = 'failed'
-        db.session.commit()
-        return jsonify({'error': f'Processing failed: {str(e)}'}), 500
+
+    job = DocumentJobQueue.enqueue(document)
+
+    if DocumentJobQueue.worker_count() == 0:
+        DocumentJobQueue.run_job(job.id)
+        db.session.refresh(job)
+
+    status_code = 200 if job.status in DocumentJobQueue.FINISHED_STATUSES else 202
+    return jsonify({
+        'job': job.to_dict(),
+        'document': db.session.get(Document, document_id).to_dict()
+    }), status_code
+
+@documents_bp.route('/documents/jobs/<int:job_id>', methods=['GET'])
+def get_processing_job(job_id):
+    """
+    Get a processing job. Pass ?wait=<seconds> to long-poll until it finishes.
+    """
+    wait = min(
+        request.args.get('wait', 0, type=float),
+        current_app.config.get('JOB_MAX_WAIT', 30)
+    )
+
+    job = DocumentJobQueue.wait_for_job(job_id, wait)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+
+    return jsonify(job.to_dict())
+
+@documents_bp.route('/documents/<int:document_id>/job', methods=['GET'])
+def get_document_job(document_id):
+    """Get the most recent processing job for a document"""
+    Document.query.get_or_404(document_id)
+
+    job = DocumentJobQueue.get_latest_job(document_id)
+    if not job:
+        return jsonify({'error': 'Document has not been queued for processing'}), 404
+
+    return jsonify(job.to_dict())
+
+@documents_bp.route('/documents/client/<int:client_id>/process-all', methods=['POST'])
+def process_client_documents(client_id):
+    """
+    Queue every pending document of a client as one batch.
+
+    Documents are processed concurrently by the job workers (DOCUMENT_WORKERS)
+    and the client's analysis runs once, after the last one. Returns 202 with
+    the batch; poll GET /documents/batches/<batch_id> for completion. With no
+    background workers configured the batch runs inline and returns 200.
+    """
+    Client.query.get_or_404(client_id)
+
+    batch = DocumentJobQueue.enqueue_client(client_id)
+    if not batch:
+        return jsonify({'batch': None, 'message': 'No pending documents to process'}), 200
+
+    if DocumentJobQueue.worker_count() == 0:
+        for job in list(batch.jobs):
+            DocumentJobQueue.run_job(job.id)
+
+    batch = db.session.get(ProcessingBatch, batch.id, populate_existing=True)
+    status_code = 200 if batch.status == 'completed' else 202
+    return jsonify({'batch': batch.to_dict()}), status_code
+
+@documents_bp.route('/documents/batches/<int:batch_id>', methods=['GET'])
+def get_processing_batch(batch_id):
+    """
+    Get a processing batch. Pass ?wait=<seconds> to long-poll until its analysis has run.
+    """
+    wait = min(
+        request.args.get('wait', 0, type=float),
+        current_app.config.get('JOB_MAX_WAIT', 30)
+    )
+
+    batch = DocumentJobQueue.wait_for_batch(batch_id, wait)
+    if not batch:
+        return jsonify({'error': 'Batch not found'}), 404
+
+    return jsonify(batch.to_dict())
 
 @documents_bp.route('/documents/client/<int:client_id>', methods=['GET'])
 def get_client_documents(client_id):
@@ -1,6 +1,10 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, Response, stream_with_context
 from models import db, Client, JointAnalysisSummary
 from services.joint_analysis_service import JointAnalysisService
+from services.filing_scenario_service import FilingScenarioService
+from services.household_batch_service import HouseholdBatchService
+import json
+import math
 
 joint_analysis_bp = Blueprint('joint_analysis', __name__)
 
@@ -26,6 +30,23 @@ def run_joint_analysis(spouse1_id, spouse2_id):
         return jsonify({'error': f'Analysis failed: {str(e)}'}), 500
 
 
+@joint_analysis_bp.route('/joint-analysis/batch', methods=['POST'])
+def run_joint_analysis_batch():
+    """
+    Run joint analysis for every linked couple, streaming progress as NDJSON.
+
+    Couples whose cached analysis is still valid are skipped unless ?refresh=true.
+    Each line is one event: 'started', one 'couple' per couple as it finishes, 'finished'.
+    """
+    force_refresh = request.args.get('refresh', 'false').lower() == 'true'
+
+    def generate():
+        for event in HouseholdBatchService.analyze_all(force_refresh=force_refresh):
+            yield json.dumps(event) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
 @joint_analysis_bp.route('/joint-analysis/<int:spouse1_id>/<int:spouse2_id>', methods=['GET'])
 def get_joint_analysis(spouse1_id, spouse2_id):
     """Get joint analysis results (returns cached if available, otherwise calculates)"""
@@ -66,6 +87,38 @@ def get_comparison_summary(spouse1_id, spouse2_id):
         return jsonify({'error': f'Comparison failed: {str(e)}'}), 500
 
 
+@joint_analysis_bp.route('/joint-analysis/<int:spouse1_id>/<int:spouse2_id>/scenarios', methods=['GET'])
+def get_filing_scenarios(spouse1_id, spouse2_id):
+    """
+    Rank filing scenarios (MFJ/MFS x standard/itemized, plus optional levers).
+
+    Query params: retirement_contribution (per spouse), income_shift (spouse 1 to spouse 2)
+    """
+    try:
+        levers = {}
+        for name in ('retirement_contribution', 'income_shift'):
+            value = request.args.get(name, '0')
+            try:
+                levers[name] = float(value)
+            except ValueError:
+                return jsonify({'error': f'{name} must be a number'}), 400
+            if not math.isfinite(levers[name]):
+                return jsonify({'error': f'{name} must be a finite number'}), 400
+
+        result = FilingScenarioService.solve(spouse1_id, spouse2_id, **levers)
+
+        return jsonify({
+            'spouse1_id': spouse1_id,
+            'spouse2_id': spouse2_id,
+            'result': result
+        }), 200
+
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': f'Scenario analysis failed: {str(e)}'}), 500
+
+
 @joint_analysis_bp.route('/validate-deduction-method', methods=['POST'])
 def validate_deduction_method():
     """
@@ -1,11 +1,47 @@
 from models import db, ExtractedData, AnalysisResult, AnalysisSummary, Client, Document
 from services.irs_reference import IRSReferenceService
 from services.tax_strategies import TaxStrategiesService
+from services.form_data import FormData
 from decimal import Decimal
 import hashlib
 import json
 from datetime import datetime
-from collections import Counter
+from sqlalchemy import func, select
+from sqlalchemy.orm import aliased
+
+class ClientDataSnapshot:
+    """
+    A client's analysis inputs, loaded once and reused for the whole analysis.
+    
+    Built by AnalysisEngine.load_client_snapshot().
+    """
+    
+    def __init__(self, client, data_version_hash, summary, tax_year):
+        """
+        Args:
+            client: Client model instance
+            data_version_hash: Hash of the client's and spouse's data versions
+            summary: Stored AnalysisSummary, or None
+            tax_year: Most common tax year among the client's documents, or None
+        """
+        self.client = client
+        self.data_version_hash = data_version_hash
+        self.summary = summary
+        self.tax_year = tax_year
+        self._form_data = None
+    
+    def load_form_data(self):
+        """
+        The client's extracted data as a FormData, with numeric fields parsed.
+        
+        Loaded on first call from AnalysisEngine.load_extracted_fields(); later
+        rows win when a field repeats.
+        """
+        if self._form_data is None:
+            self._form_data = FormData(AnalysisEngine.load_extracted_fields(self.client.id))
+        
+        return self._form_data
+
 
 class AnalysisEngine:
     """Service for analyzing tax data and generating strategy recommendations"""
@@ -13,35 +49,109 @@ class AnalysisEngine:
     @staticmethod
     def _calculate_data_version_hash(client_id):
         """
-        Calculate a hash of all ExtractedData timestamps for a client to detect data changes.
+        Calculate a hash of the client's data version to detect data changes.
 
-        REQ-08: If client has spouse_id, spouse's data is ALSO included in hash.
+        clients.data_version is bumped by database triggers on every ExtractedData
+        insert, update and delete (see init_db), so this is a single-row lookup
+        rather than a scan of the client's data.
+
+        REQ-08: If client has spouse_id, spouse's data version is ALSO included in hash.
         This ensures changing either spouse's data invalidates both cached analyses.
 
         Args:
             client_id: ID of the client
 
         Returns:
-            str: SHA-256 hash of sorted timestamps (including spouse if linked)
+            str: SHA-256 hash of the client's (and linked spouse's) data version
         """
-        extracted_data = ExtractedData.query.filter_by(client_id=client_id).all()
-
-        # REQ-08: Include spouse data for bidirectional cache invalidation
-        client = Client.query.get(client_id)
-        if client and client.spouse_id:
-            spouse_data = ExtractedData.query.filter_by(client_id=client.spouse_id).all()
-            extracted_data.extend(spouse_data)
+        spouse = aliased(Client)
+        row = db.session.query(
+            Client.data_version, Client.spouse_id, spouse.data_version
+        ).outerjoin(
+            spouse, spouse.id == Client.spouse_id
+        ).filter(Client.id == client_id).first()
 
-        if not extracted_data:
+        if not row:
             return hashlib.sha256(b'').hexdigest()
+
+        return AnalysisEngine._version_hash(client_id, *row)
+    
+    @staticmethod
+    def _version_hash(client_id, data_version, spouse_id, spouse_data_version):
+        """SHA-256 of a client's data version and its linked spouse's"""
+        version_string = f'{client_id}:{data_version}|{spouse_id}:{spouse_data_version}'
+        return hashlib.sha256(version_string.encode('utf-8')).hexdigest()
+    
+    @staticmethod
+    def load_extracted_fields(client_id):
+        """
+        A client's extracted fields as plain (form_type, field_name, field_value) tuples, in insert order.
+        
+        A Core select on the session's connection: no ExtractedData instances,
+        identity-map entries or ORM row processing (see benchmark_data_load()).
         
-        # Sort timestamps and concatenate
-        timestamps = sorted([str(data.extracted_at.isoformat()) if data.extracted_at else '' 
-                            for data in extracted_data])
-        timestamp_string = '|'.join(timestamps)
+        Args:
+            client_id: ID of the client
         
-        # Generate hash
-        return hashlib.sha256(timestamp_string.encode('utf-8')).hexdigest()
+        Returns:
+            list: Row tuples
+        """
+        # Core execution skips autoflush; flush so pending rows are included as before
+        db.session.flush()
+        return db.session.connection().execute(
+            select(ExtractedData.form_type, ExtractedData.field_name, ExtractedData.field_value)
+            .where(ExtractedData.client_id == client_id)
+            .order_by(ExtractedData.id)
+        ).all()
+    
+    @staticmethod
+    def load_client_snapshot(client_id):
+        """
+        Load everything analyze_client needs to validate its cache in one query.
+        
+        Fetches the client, its data version and the linked spouse's, the stored
+        AnalysisSummary and the most common document tax year together. The
+        extracted data itself is loaded separately, only on a cache miss (see
+        ClientDataSnapshot.load_form_data).
+        
+        Args:
+            client_id: ID of the client
+        
+        Returns:
+            ClientDataSnapshot or None if the client does not exist
+        """
+        spouse = aliased(Client)
+        
+        # Most common tax year; ties go to the year of the earliest document
+        tax_year = db.session.query(Document.tax_year).filter(
+            Document.client_id == Client.id,
+            Document.tax_year.isnot(None)
+        ).group_by(Document.tax_year).order_by(
+            func.count().desc(), func.min(Document.id)
+        ).limit(1).scalar_subquery()
+        
+        # data_version is selected as a column so a client already in the session
+        # still yields the version the triggers last wrote
+        row = db.session.query(
+            Client, Client.data_version, spouse.data_version, AnalysisSummary, tax_year
+        ).outerjoin(
+            spouse, spouse.id == Client.spouse_id
+        ).outerjoin(
+            AnalysisSummary, AnalysisSummary.client_id == Client.id
+        ).filter(Client.id == client_id).first()
+        
+        if not row:
+            return None
+        
+        client, data_version, spouse_data_version, summary, tax_year = row
+        return ClientDataSnapshot(
+            client=client,
+            data_version_hash=AnalysisEngine._version_hash(
+                client_id, data_version, client.spouse_id, spouse_data_version
+            ),
+            summary=summary,
+            tax_year=tax_year
+        )
     
     @staticmethod
     def analyze_client(client_id, force_refresh=False):
@@ -55,19 +165,17 @@ class AnalysisEngine:
         Returns:
             tuple: (list of AnalysisResult objects, summary dict)
         """
-        # Get all extracted data for the client
-        extracted_data = ExtractedData.query.filter_by(client_id=client_id).all()
-        
-        if not extracted_data:
+        # Client, data version hash, existing summary and tax year in one query
+        snapshot = AnalysisEngine.load_client_snapshot(client_id)
+        if not snapshot:
             return [], AnalysisEngine._generate_empty_summary()
         
-        # Calculate current data version hash
-        current_hash = AnalysisEngine._calculate_data_version_hash(client_id)
-        
-        # Check for existing analysis summary
-        existing_summary = AnalysisSummary.query.filter_by(client_id=client_id).first()
+        current_hash = snapshot.data_version_hash
+        existing_summary = snapshot.summary
         
-        # If analysis exists and data hasn't changed, return cached results
+        # If analysis exists and data hasn't changed, return cached results.
+        # A summary is only stored when the client had data, and deleting that
+        # data changes the hash, so a match means the data is still there.
         if existing_summary and existing_summary.data_version_hash == current_hash and not force_refresh:
             strategies = AnalysisResult.query.filter_by(client_id=client_id).all()
             summary_dict = existing_summary.to_dict()
@@ -80,25 +188,21 @@ class AnalysisEngine:
             summary_dict.pop('updated_at', None)
             return strategies, summary_dict
         
-        # Organize data by form type
-        data_by_form = {}
-        for data in extracted_data:
-            if data.form_type not in data_by_form:
-                data_by_form[data.form_type] = {}
-            data_by_form[data.form_type][data.field_name] = data.field_value
+        # Extracted data, parsed once for the summary and every strategy analyzer
+        form_data = snapshot.load_form_data()
         
-        # Get client info
-        client = Client.query.get(client_id)
+        if not form_data:
+            return [], AnalysisEngine._generate_empty_summary()
         
-        # Get tax_year from documents (most common year)
-        tax_year = AnalysisEngine._get_client_tax_year(client_id)
+        client = snapshot.client
+        tax_year = snapshot.tax_year
         
         # Generate summary
-        summary = AnalysisEngine._calculate_summary(data_by_form, client)
+        summary = AnalysisEngine._calculate_summary(form_data, client)
         summary['tax_year'] = tax_year
         
         # Generate strategies using comprehensive tax strategies service
-        strategies = TaxStrategiesService.analyze_all_strategies(data_by_form, client)
+        strategies = TaxStrategiesService.analyze_all_strategies(form_data, client)
         
         # Delete existing analysis results for this client
         AnalysisResult.query.filter_by(client_id=client_id).delete()
@@ -165,19 +269,19 @@ class AnalysisEngine:
         }
     
     @staticmethod
-    def _calculate_summary(data_by_form, client):
+    def _calculate_summary(form_data, client):
         """Calculate tax summary from extracted data"""
         # Get income values
-        wages_1040 = AnalysisEngine._get_numeric_value(data_by_form, '1040', 'wages', 0)
-        wages_w2 = AnalysisEngine._get_numeric_value(data_by_form, 'W-2', 'wages', 0)
+        wages_1040 = form_data.number('1040', 'wages', 0)
+        wages_w2 = form_data.number('W-2', 'wages', 0)
         total_wages = wages_1040 + wages_w2
         
         # Get other income sources
-        interest_income = AnalysisEngine._get_numeric_value(data_by_form, '1099-INT', 'income', 0)
-        dividend_income = AnalysisEngine._get_numeric_value(data_by_form, '1099-DIV', 'income', 0)
-        business_income = AnalysisEngine._get_numeric_value(data_by_form, 'Schedule C', 'net_profit', 0)
-        misc_income = AnalysisEngine._get_numeric_value(data_by_form, '1099-MISC', 'income', 0)
-        nec_income = AnalysisEngine._get_numeric_value(data_by_form, '1099-NEC', 'income', 0)
+        interest_income = form_data.number('1099-INT', 'income', 0)
+        dividend_income = form_data.number('1099-DIV', 'income', 0)
+        business_income = form_data.number('Schedule C', 'net_profit', 0)
+        misc_income = form_data.number('1099-MISC', 'income', 0)
+        nec_income = form_data.number('1099-NEC', 'income', 0)
         
         # Build income breakdown
         income_sources = []
@@ -198,7 +302,7 @@ class AnalysisEngine:
         total_from_sources = sum(source['amount'] for source in income_sources)
         
         # Get AGI
-        agi = AnalysisEngine._get_numeric_value(data_by_form, '1040', 'agi', total_from_sources)
+        agi = form_data.number('1040', 'agi', total_from_sources)
         
         # If AGI is higher than sum of sources, add "Other Income" category
         if agi > total_from_sources and total_from_sources > 0:
@@ -209,11 +313,11 @@ class AnalysisEngine:
             income_sources.append({'source': 'Total Income (from AGI)', 'amount': round(agi, 2)})
         
         # Get taxable income
-        taxable_income = AnalysisEngine._get_numeric_value(data_by_form, '1040', 'taxable_income', agi)
+        taxable_income = form_data.number('1040', 'taxable_income', agi)
         
         # Get tax amounts
-        total_tax = AnalysisEngine._get_numeric_value(data_by_form, '1040', 'total_tax', 0)
-        federal_tax_withheld = AnalysisEngine._get_numeric_value(data_by_form, 'W-2', 'federal_tax_withheld', 0)
+        total_tax = form_data.number('1040', 'total_tax', 0)
+        federal_tax_withheld = form_data.number('W-2', 'federal_tax_withheld', 0)
         
         # Calculate effective tax rate
         effective_tax_rate = (total_tax / agi * 100) if agi > 0 else 0
@@ -262,43 +366,14 @@ class AnalysisEngine:
             return 37
     
     @staticmethod
-    def _get_client_tax_year(client_id):
-        """Get the most common tax_year from client's documents"""
-        documents = Document.query.filter_by(client_id=client_id).filter(
-            Document.tax_year.isnot(None)
-        ).all()
-        
-        if not documents:
-            return None
-        
-        # Get most common tax_year
-        tax_years = [doc.tax_year for doc in documents if doc.tax_year]
-        if tax_years:
-            return Counter(tax_years).most_common(1)[0][0]
-        
-        return None
-    
-    @staticmethod
-    def _get_numeric_value(data_dict, form_type, field_name, default=0):
-        """Helper to get numeric value from extracted data"""
-        try:
-            if form_type in data_dict and field_name in data_dict[form_type]:
-                value = data_dict[form_type][field_name]
-                if value:
-                    return float(value)
-        except:
-            pass
-        return default
-    
-    @staticmethod
-    def _analyze_retirement_strategies(data_by_form, client):
+    def _analyze_retirement_strategies(form_data, client):
         """Analyze retirement contribution opportunities"""
         strategies = []
         
         # Get income
-        wages = AnalysisEngine._get_numeric_value(data_by_form, '1040', 'wages', 0)
-        wages += AnalysisEngine._get_numeric_value(data_by_form, 'W-2', 'wages', 0)
-        agi = AnalysisEngine._get_numeric_value(data_by_form, '1040', 'agi', wages)
+        wages = form_data.number('1040', 'wages', 0)
+        wages += form_data.number('W-2', 'wages', 0)
+        agi = form_data.number('1040', 'agi', wages)
         
         if agi > 0:
             # 401(k) contribution strategy
@@ -353,14 +428,14 @@ class AnalysisEngine:
         return strategies
     
     @staticmethod
-    def _analyze_business_strategies(data_by_form, client):
+    def _analyze_business_strategies(form_data, client):
         """Analyze business deduction opportunities"""
         strategies = []
         
         # Check for Schedule C
-        if 'Schedule C' in data_by_form:
-            gross_receipts = AnalysisEngine._get_numeric_value(data_by_form, 'Schedule C', 'gross_receipts', 0)
-            net_profit = AnalysisEngine._get_numeric_value(data_by_form, 'Schedule C', 'net_profit', 0)
+        if 'Schedule C' in form_data:
+            gross_receipts = form_data.number('Schedule C', 'gross_receipts', 0)
+            net_profit = form_data.number('Schedule C', 'net_profit', 0)
             
             if gross_receipts > 0:
                 # Section 179 deduction
@@ -395,14 +470,14 @@ class AnalysisEngine:
         return strategies
     
     @staticmethod
-    def _analyze_deduction_strategies(data_by_form, client):
+    def _analyze_deduction_strategies(form_data, client):
         """Analyze deduction opportunities"""
         strategies = []
         
-        agi = AnalysisEngine._get_numeric_value(data_by_form, '1040', 'agi', 0)
+        agi = form_data.number('1040', 'agi', 0)
         
         # Charitable contributions
-        charity = AnalysisEngine._get_numeric_value(data_by_form, 'Schedule A', 'charitable_contributions', 0)
+        charity = form_data.number('Schedule A', 'charitable_contributions', 0)
         if charity == 0 and agi > 50000:
             irs_ref = IRSReferenceService.get_reference_by_section('IRC Section 170')
             strategies.append(AnalysisResult(
@@ -419,12 +494,12 @@ class AnalysisEngine:
         return strategies
     
     @staticmethod
-    def _analyze_investment_strategies(data_by_form, client):
+    def _analyze_investment_strategies(form_data, client):
         """Analyze investment-related strategies"""
         strategies = []
         
         # Tax-loss harvesting
-        if 'Schedule D' in data_by_form or '1099-DIV' in data_by_form:
+        if 'Schedule D' in form_data or '1099-DIV' in form_data:
             irs_ref = IRSReferenceService.get_reference_by_section('IRC Section 1211')
             strategies.append(AnalysisResult(
                 client_id=client.id,
@@ -440,11 +515,11 @@ class AnalysisEngine:
         return strategies
     
     @staticmethod
-    def _analyze_education_strategies(data_by_form, client):
+    def _analyze_education_strategies(form_data, client):
         """Analyze education-related strategies"""
         strategies = []
         
-        agi = AnalysisEngine._get_numeric_value(data_by_form, '1040', 'agi', 0)
+        agi = form_data.number('1040', 'agi', 0)
         
         # Education credits
         if agi < 90000:  # Phase-out range
@@ -462,3 +537,79 @@ class AnalysisEngine:
         
         return strategies
 
+
+def benchmark_data_load(field_count=10000, repeat=5):
+    """
+    Compare ExtractedData read paths for one client with field_count fields.
+
+    Runs against a throwaway in-memory SQLite database, so no app or data is needed:
+        python -c "from services.analysis_engine import benchmark_data_load; print(benchmark_data_load())"
+
+    Each method builds the FormData analyze_client uses.
+
+    Args:
+        field_count: Number of ExtractedData rows for the client
+        repeat: Runs per method; the fastest time is reported
+
+    Returns:
+        dict: {method: {'ms': fastest time, 'peak_kib': peak traced allocation}} for
+              'orm_objects' (the previous full-instance load), 'column_query'
+              (ORM column projection) and 'core_tuples' (load_extracted_fields)
+    """
+    import time
+    import tracemalloc
+    from sqlalchemy import create_engine, insert
+    from sqlalchemy.orm import Session
+
+    engine = create_engine('sqlite://')
+    ExtractedData.__table__.create(engine)
+    with engine.begin() as connection:
+        connection.execute(insert(ExtractedData), [
+            {
+                'client_id': 1,
+                'form_type': f'Form {index % 40}',
+                'field_name': f'field_{index}',
+                'field_value': str(index * 100.0)
+            }
+            for index in range(field_count)
+        ])
+
+    columns = (ExtractedData.form_type, ExtractedData.field_name, ExtractedData.field_value)
+
+    def orm_objects(session):
+        return session.query(ExtractedData).filter_by(client_id=1).all()
+
+    def column_query(session):
+        return session.query(*columns).filter(ExtractedData.client_id == 1).order_by(ExtractedData.id).all()
+
+    def core_tuples(session):
+        return session.connection().execute(
+            select(*columns).where(ExtractedData.client_id == 1).order_by(ExtractedData.id)
+        ).all()
+
+    def build(method, session):
+        return FormData(
+            (row.form_type, row.field_name, row.field_value) if isinstance(row, ExtractedData) else row
+            for row in method(session)
+        )
+
+    results = {}
+    for method in (orm_objects, column_query, core_tuples):
+        best = None
+        for _ in range(repeat):
+            with Session(engine) as session:
+                started = time.perf_counter()
+                build(method, session)
+                elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+
+        with Session(engine) as session:
+            tracemalloc.start()
+            build(method, session)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+        results[method.__name__] = {'ms': round(best * 1000, 2), 'peak_kib': round(peak / 1024)}
+
+    engine.dispose()
+    return results
@@ -0,0 +1,533 @@
+"""
+Document Job Queue - Background OCR and Extraction
+
+SQLite-backed job queue for document processing, so OCR and parsing run
+outside the request that asked for them. Jobs live in the processing_jobs
+table; no external broker is needed and several app processes can share one
+queue because jobs are claimed with a conditional UPDATE.
+
+Job Lifecycle (mirrored on Document.ocr_status):
+- queued: enqueue() created the job
+- processing: a worker claimed it
+- completed / failed: the worker finished; result or error is stored on the job
+
+Workers:
+- start(app) launches DOCUMENT_WORKERS daemon threads that claim the oldest
+  queued job, run it inside an app context, and wait for the next one;
+  create_app calls it, except in the debug reloader's parent process
+- Enqueues in this process wake workers immediately; jobs queued by other
+  processes are picked up within JOB_POLL_INTERVAL seconds
+- Jobs left in 'processing' longer than JOB_STALE_SECONDS (e.g. after a crash)
+  are re-queued, up to JOB_MAX_ATTEMPTS attempts: on start, by the workers
+  every JOB_STALE_CHECK_INTERVAL seconds, and by enqueue() when the stuck job
+  is the document's active one. A process without workers does not re-queue
+  on start, since nothing in it would run the jobs
+
+Batches:
+- enqueue_client() queues every pending document of a client as one
+  ProcessingBatch; the workers bound how many run at once
+- Batch jobs skip the per-document analysis; the job that finishes last claims
+  the batch with a conditional UPDATE and runs the client's analysis once
+
+Clients poll GET /documents/jobs/<id> (or /documents/batches/<id>), or
+long-poll with ?wait=<seconds>.
+"""
+
+from models import db, Document, ProcessingJob, ProcessingBatch
+from services.ocr_service import OCRService
+from services.tax_parser import TaxParser
+from services.analysis_engine import AnalysisEngine
+from datetime import datetime, timedelta
+from sqlalchemy import exists
+from flask import current_app
+import json
+import threading
+import time
+
+
+class DocumentJobQueue:
+    """Service for queueing and running document processing jobs"""
+
+    ACTIVE_STATUSES = ('queued', 'processing')
+    FINISHED_STATUSES = ('completed', 'failed')
+
+    DEFAULT_WORKERS = 2
+    DEFAULT_POLL_INTERVAL = 1.0
+    DEFAULT_STALE_SECONDS = 600
+    DEFAULT_STALE_CHECK_INTERVAL = 60
+    DEFAULT_MAX_ATTEMPTS = 3
+
+    _app = None
+    _workers = []
+    _lock = threading.Lock()
+    _last_stale_check = 0.0
+    # Signalled when a job is queued (wakes workers) or finishes (wakes long-polls)
+    _job_queued = threading.Condition()
+    _job_finished = threading.Condition()
+
+    @staticmethod
+    def start(app):
+        """
+        Start the worker pool for an app. Safe to call more than once.
+
+        Args:
+            app: Flask app whose config supplies DOCUMENT_WORKERS and JOB_* settings
+        """
+        with DocumentJobQueue._lock:
+            if DocumentJobQueue._workers:
+                return
+
+            DocumentJobQueue._app = app
+            worker_count = app.config.get('DOCUMENT_WORKERS', DocumentJobQueue.DEFAULT_WORKERS)
+
+            # Nothing here would run re-queued jobs; enqueue() re-queues a stuck job when asked again
+            if worker_count <= 0:
+                return
+
+            with app.app_context():
+                DocumentJobQueue.requeue_stale_jobs()
+            DocumentJobQueue._last_stale_check = time.monotonic()
+
+            for index in range(worker_count):
+                worker = threading.Thread(
+                    target=DocumentJobQueue._worker_loop,
+                    name=f'document-worker-{index + 1}',
+                    daemon=True
+                )
+                worker.start()
+                DocumentJobQueue._workers.append(worker)
+
+    @staticmethod
+    def worker_count():
+        """Number of background workers running in this process"""
+        return len(DocumentJobQueue._workers)
+
+    @staticmethod
+    def enqueue(document):
+        """
+        Queue a document for processing, reusing its active job if it already has one.
+
+        An active job stuck in 'processing' past JOB_STALE_SECONDS is re-queued
+        (or failed, after JOB_MAX_ATTEMPTS) instead of being returned as is.
+
+        Args:
+            document: Document to process
+
+        Returns:
+            ProcessingJob: The queued (or already active) job
+        """
+        job = DocumentJobQueue._active_job(document.id)
+
+        if job and job.status == 'processing' and job.started_at and job.started_at < DocumentJobQueue._stale_cutoff():
+            DocumentJobQueue.requeue_stale_jobs(document.id)
+            job = DocumentJobQueue._active_job(document.id)
+
+        if job:
+            return job
+
+        job = ProcessingJob(
+            document_id=document.id,
+            client_id=document.client_id,
+            status='queued'
+        )
+        document.ocr_status = 'queued'
+        db.session.add(job)
+        db.session.commit()
+
+        with DocumentJobQueue._job_queued:
+            DocumentJobQueue._job_queued.notify()
+
+        return job
+
+    @staticmethod
+    def enqueue_client(client_id):
+        """
+        Queue every pending document of a client as one batch.
+
+        Args:
+            client_id: ID of the client
+
+        Returns:
+            ProcessingBatch or None if the client has no pending documents
+        """
+        documents = Document.query.filter_by(
+            client_id=client_id,
+            ocr_status='pending'
+        ).order_by(Document.id.asc()).all()
+
+        if not documents:
+            return None
+
+        batch = ProcessingBatch(client_id=client_id, status='processing')
+        db.session.add(batch)
+        db.session.flush()
+
+        for document in documents:
+            db.session.add(ProcessingJob(
+                document_id=document.id,
+                client_id=client_id,
+                batch_id=batch.id,
+                status='queued'
+            ))
+            document.ocr_status = 'queued'
+        db.session.commit()
+
+        with DocumentJobQueue._job_queued:
+            DocumentJobQueue._job_queued.notify_all()
+
+        return batch
+
+    @staticmethod
+    def get_latest_job(document_id):
+        """Most recent job for a document, or None"""
+        return ProcessingJob.query.filter_by(
+            document_id=document_id
+        ).order_by(ProcessingJob.id.desc()).first()
+
+    @staticmethod
+    def wait_for_job(job_id, timeout=0.0):
+        """
+        Return a job once it finishes, or after timeout seconds (long-poll).
+
+        Args:
+            job_id: ID of the job
+            timeout: Seconds to wait for the job to finish; 0 returns immediately
+
+        Returns:
+            ProcessingJob or None if the job does not exist
+        """
+        return DocumentJobQueue._wait_until_finished(
+            ProcessingJob, job_id, DocumentJobQueue.FINISHED_STATUSES, timeout
+        )
+
+    @staticmethod
+    def wait_for_batch(batch_id, timeout=0.0):
+        """
+        Return a batch once its analysis has run, or after timeout seconds (long-poll).
+
+        Args:
+            batch_id: ID of the batch
+            timeout: Seconds to wait for the batch to finish; 0 returns immediately
+
+        Returns:
+            ProcessingBatch or None if the batch does not exist
+        """
+        return DocumentJobQueue._wait_until_finished(
+            ProcessingBatch, batch_id, ('completed',), timeout
+        )
+
+    @staticmethod
+    def _wait_until_finished(model, record_id, finished_statuses, timeout):
+        """Reload a job or batch until its status is finished or the timeout passes"""
+        poll_interval = current_app.config.get('JOB_POLL_INTERVAL', DocumentJobQueue.DEFAULT_POLL_INTERVAL)
+        deadline = datetime.utcnow() + timedelta(seconds=max(0.0, timeout))
+
+        while True:
+            record = db.session.get(model, record_id, populate_existing=True)
+            if not record or record.status in finished_statuses:
+                return record
+
+            remaining = (deadline - datetime.utcnow()).total_seconds()
+            if remaining <= 0:
+                return record
+
+            # End the read transaction so the next loop sees the worker's commit
+            db.session.rollback()
+            with DocumentJobQueue._job_finished:
+                DocumentJobQueue._job_finished.wait(min(poll_interval, remaining))
+
+    @staticmethod
+    def requeue_stale_jobs(document_id=None):
+        """
+        Re-queue jobs stuck in 'processing', e.g. after a crash; fail them after too many attempts.
+
+        Each job is updated with a conditional UPDATE, so a job that another
+        process re-queued and claimed again in the meantime is left alone.
+
+        Args:
+            document_id: Only re-queue this document's jobs
+
+        Returns:
+            int: Number of jobs re-queued or failed
+        """
+        max_attempts = current_app.config.get('JOB_MAX_ATTEMPTS', DocumentJobQueue.DEFAULT_MAX_ATTEMPTS)
+        cutoff = DocumentJobQueue._stale_cutoff()
+
+        stale_query = db.session.query(
+            ProcessingJob.id, ProcessingJob.document_id, ProcessingJob.batch_id, ProcessingJob.attempts
+        ).filter(
+            ProcessingJob.status == 'processing',
+            ProcessingJob.started_at < cutoff
+        )
+        if document_id is not None:
+            stale_query = stale_query.filter(ProcessingJob.document_id == document_id)
+        stale_jobs = stale_query.all()
+
+        changed_count = 0
+        requeued = 0
+        failed_batch_ids = set()
+        for job_id, document_id, batch_id, attempts in stale_jobs:
+            if attempts >= max_attempts:
+                values = {
+                    'status': 'failed',
+                    'error': 'Processing did not finish after repeated attempts',
+                    'finished_at': datetime.utcnow()
+                }
+            else:
+                values = {'status': 'queued'}
+
+            changed = ProcessingJob.query.filter(
+                ProcessingJob.id == job_id,
+                ProcessingJob.status == 'processing',
+                ProcessingJob.started_at < cutoff
+            ).update(values, synchronize_session=False)
+            if not changed:
+                continue
+            changed_count += 1
+
+            Document.query.filter_by(id=document_id).update(
+                {'ocr_status': values['status']}, synchronize_session=False
+            )
+            if values['status'] == 'queued':
+                requeued += 1
+            elif batch_id:
+                failed_batch_ids.add(batch_id)
+
+        db.session.commit()
+
+        # A batch whose last job was just failed still gets its analysis
+        for batch_id in failed_batch_ids:
+            DocumentJobQueue.finish_batch(batch_id)
+
+        if requeued:
+            with DocumentJobQueue._job_queued:
+                DocumentJobQueue._job_queued.notify_all()
+
+        return changed_count
+
+    @staticmethod
+    def run_job(job_id):
+        """
+        Claim a queued job and run it in the current app context.
+
+        Returns:
+            bool: True if the job was claimed and run, False if another worker had it
+        """
+        if not DocumentJobQueue._claim(job_id):
+            return False
+
+        job = db.session.get(ProcessingJob, job_id)
+        document = db.session.get(Document, job.document_id)
+
+        try:
+            if not document:
+                raise ValueError('Document no longer exists')
+
+            # Batch jobs leave analysis to finish_batch(), once for the whole batch
+            result = DocumentJobQueue.process_document(document, analyze=job.batch_id is None)
+
+            job.status = 'completed'
+            job.result = json.dumps(result)
+            document.ocr_status = 'completed'
+        except Exception as e:
+            db.session.rollback()
+            job = db.session.get(ProcessingJob, job_id)
+            document = db.session.get(Document, job.document_id)
+            job.status = 'failed'
+            job.error = f'Processing failed: {str(e)}'
+            if document:
+                document.ocr_status = 'failed'
+            current_app.logger.error(f'Document job {job_id} failed: {str(e)}')
+
+        job.finished_at = datetime.utcnow()
+        batch_id = job.batch_id
+        db.session.commit()
+
+        if batch_id:
+            DocumentJobQueue.finish_batch(batch_id)
+
+        with DocumentJobQueue._job_finished:
+            DocumentJobQueue._job_finished.notify_all()
+
+        return True
+
+    @staticmethod
+    def finish_batch(batch_id):
+        """
+        Run a batch's analysis if none of its jobs are still queued or processing.
+
+        The check and the move to 'analyzing' are one conditional UPDATE, so when
+        several workers finish a batch's last jobs at once only one runs the analysis.
+
+        Returns:
+            bool: True if this call ran the analysis
+        """
+        claimed = ProcessingBatch.query.filter(
+            ProcessingBatch.id == batch_id,
+            ProcessingBatch.status == 'processing',
+            ~exists().where(
+                ProcessingJob.batch_id == batch_id,
+                ProcessingJob.status.in_(DocumentJobQueue.ACTIVE_STATUSES)
+            )
+        ).update({'status': 'analyzing'}, synchronize_session=False)
+        db.session.commit()
+
+        if not claimed:
+            return False
+
+        batch = db.session.get(ProcessingBatch, batch_id)
+        completed_jobs = ProcessingJob.query.filter_by(batch_id=batch_id, status='completed').count()
+
+        # One analysis for the whole batch, if any document was processed
+        if completed_jobs:
+            try:
+                AnalysisEngine.analyze_client(batch.client_id)
+                batch.analysis_triggered = True
+            except Exception as analysis_ex:
+                db.session.rollback()
+                batch = db.session.get(ProcessingBatch, batch_id)
+                batch.analysis_error = str(analysis_ex)
+                current_app.logger.error(f'Analysis failed for client {batch.client_id}: {batch.analysis_error}')
+
+        batch.status = 'completed'
+        batch.finished_at = datetime.utcnow()
+        db.session.commit()
+        return True
+
+    @staticmethod
+    def process_document(document, analyze=True):
+        """
+        Run OCR and extraction for a document and refresh the client's analysis.
+
+        Args:
+            document: Document to process
+            analyze: Whether to run the client's analysis afterwards
+
+        Returns:
+            dict: Processing result (forms detected, parsed data and provenance, page timings, analysis status)
+        """
+        # Stream pages from OCR (multi-page PDFs in parallel, repeat files from the OCR cache)
+        # through parsing; fields are written in batches while later pages are extracted
+        page_timings = []
+
+        def timed_pages():
+            for page in OCRService.iter_pages(
+                document.file_path, document.file_type, file_digest=document.content_hash
+            ):
+                page_timings.append({
+                    'page_number': page['page_number'],
+                    'method': page['method'],
+                    'seconds': page['seconds'],
+                    'cached': page['cached'],
+                    'characters': len(page['text'])
+                })
+                yield page
+
+        parsed_data, provenance, fields_written = TaxParser.parse_pages(
+            timed_pages(),
+            document.id,
+            document.client_id,
+            batch_size=current_app.config.get('EXTRACTION_BATCH_SIZE'),
+            flush_seconds=current_app.config.get('EXTRACTION_FLUSH_SECONDS')
+        )
+
+        # Automatically trigger analysis after successful extraction
+        analysis_triggered = False
+        analysis_error = None
+        if analyze:
+            try:
+                AnalysisEngine.analyze_client(document.client_id)
+                analysis_triggered = True
+            except Exception as analysis_ex:
+                # Log error but don't fail the document processing
+                analysis_error = str(analysis_ex)
+                current_app.logger.error(f'Analysis failed for client {document.client_id}: {analysis_error}')
+
+        result = {
+            'message': 'Document processed successfully',
+            'forms_detected': list(parsed_data.keys()),
+            'parsed_data': parsed_data,
+            'provenance': provenance,
+            'fields_written': fields_written,
+            'pages': page_timings,
+            'analysis_triggered': analysis_triggered
+        }
+
+        if analysis_error:
+            result['analysis_error'] = analysis_error
+
+        return result
+
+    @staticmethod
+    def _active_job(document_id):
+        """A document's newest queued or processing job, or None"""
+        return ProcessingJob.query.filter(
+            ProcessingJob.document_id == document_id,
+            ProcessingJob.status.in_(DocumentJobQueue.ACTIVE_STATUSES)
+        ).order_by(ProcessingJob.id.desc()).first()
+
+    @staticmethod
+    def _stale_cutoff():
+        """Jobs started before this and still 'processing' are considered abandoned"""
+        stale_seconds = current_app.config.get('JOB_STALE_SECONDS', DocumentJobQueue.DEFAULT_STALE_SECONDS)
+        return datetime.utcnow() - timedelta(seconds=stale_seconds)
+
+    @staticmethod
+    def _requeue_stale_jobs_if_due():
+        """Run requeue_stale_jobs() at most once per JOB_STALE_CHECK_INTERVAL across this process's workers"""
+        interval = current_app.config.get('JOB_STALE_CHECK_INTERVAL', DocumentJobQueue.DEFAULT_STALE_CHECK_INTERVAL)
+        with DocumentJobQueue._lock:
+            now = time.monotonic()
+            if now - DocumentJobQueue._last_stale_check < interval:
+                return 0
+            DocumentJobQueue._last_stale_check = now
+        return DocumentJobQueue.requeue_stale_jobs()
+
+    @staticmethod
+    def _claim(job_id):
+        """Atomically move a job from queued to processing; False if already claimed"""
+        claimed = ProcessingJob.query.filter_by(id=job_id, status='queued').update({
+            'status': 'processing',
+            'attempts': ProcessingJob.attempts + 1,
+            'started_at': datetime.utcnow()
+        }, synchronize_session=False)
+
+        if claimed:
+            Document.query.filter(
+                Document.id == db.session.query(ProcessingJob.document_id).filter_by(id=job_id).scalar_subquery()
+            ).update({'ocr_status': 'processing'}, synchronize_session=False)
+
+        db.session.commit()
+        return claimed == 1
+
+    @staticmethod
+    def _next_queued_job_id():
+        """ID of the oldest queued job, or None"""
+        row = db.session.query(ProcessingJob.id).filter_by(
+            status='queued'
+        ).order_by(ProcessingJob.id.asc()).first()
+        db.session.commit()
+        return row.id if row else None
+
+    @staticmethod
+    def _worker_loop():
+        """Claim and run queued jobs until the process exits"""
+        app = DocumentJobQueue._app
+        poll_interval = app.config.get('JOB_POLL_INTERVAL', DocumentJobQueue.DEFAULT_POLL_INTERVAL)
+
+        while True:
+            ran_job = False
+            try:
+                with app.app_context():
+                    # Jobs abandoned by a crashed process become stale while this one runs
+                    DocumentJobQueue._requeue_stale_jobs_if_due()
+                    job_id = DocumentJobQueue._next_queued_job_id()
+                    if job_id is not None:
+                        DocumentJobQueue.run_job(job_id)
+                        ran_job = True
+            except Exception as e:
+                app.logger.error(f'Document worker error: {str(e)}')
+
+            if not ran_job:
+                with DocumentJobQueue._job_queued:
+                    DocumentJobQueue._job_queued.wait(poll_interval)
@@ -0,0 +1,247 @@
+"""
+Filing Scenario Service - Ranked Filing-Status Scenarios for a Couple
+
+Evaluates a couple's filing scenarios in one pass and ranks them by combined
+federal tax, instead of running joint analysis once per deduction method and
+comparing the results by hand.
+
+Scenarios:
+- MFJ and MFS, each with the standard deduction and with itemized deductions
+  (MFS itemized means both spouses itemize, as the IRS requires)
+- Optional levers, each evaluated on top of every base scenario:
+  - retirement_contribution: additional pre-tax contribution per spouse,
+    reducing each spouse's AGI (capped at their income)
+  - income_shift: income moved from spouse 1 to spouse 2 (negative moves it
+    the other way); only evaluated for MFS, since MFJ pools income anyway
+
+Shared work:
+- Spouse analyses, itemized breakdowns, standard deductions and brackets come
+  from one JointScenarioContext, so each is looked up once however many
+  scenarios are evaluated
+- Taxes for every scenario of a filing status are computed in one
+  TaxCalculator.calculate_tax_by_brackets_batch call
+
+Itemized deductions are recomputed at each scenario's AGI with the SALT cap
+of the scenario's filing status, so levers that lower AGI also move the
+medical threshold and SALT phase-out.
+"""
+
+from models import Client
+from services.joint_analysis_service import JointScenarioContext
+from services.tax_calculator import TaxCalculator
+import math
+
+
+class FilingScenarioService:
+    """Service for evaluating and ranking a couple's filing scenarios"""
+
+    FILING_STATUSES = ('married_joint', 'married_separate')
+    DEDUCTION_METHODS = ('standard', 'itemized')
+
+    STATUS_LABELS = {
+        'married_joint': 'MFJ',
+        'married_separate': 'MFS'
+    }
+
+    @staticmethod
+    def build_scenarios(retirement_contribution=0, income_shift=0):
+        """
+        Scenario definitions for the requested levers.
+
+        Args:
+            retirement_contribution: Additional pre-tax contribution per spouse
+            income_shift: Income moved from spouse 1 to spouse 2
+
+        Returns:
+            list: dicts with filing_status, deduction_method, retirement_contribution
+                  and income_shift
+        """
+        lever_sets = [(0, 0)]
+        if retirement_contribution:
+            lever_sets.append((retirement_contribution, 0))
+        if income_shift:
+            lever_sets.append((0, income_shift))
+        if retirement_contribution and income_shift:
+            lever_sets.append((retirement_contribution, income_shift))
+
+        scenarios = []
+        for filing_status in FilingScenarioService.FILING_STATUSES:
+            for deduction_method in FilingScenarioService.DEDUCTION_METHODS:
+                for contribution, shift in lever_sets:
+                    # Shifting income between spouses does not change a joint return
+                    if shift and filing_status == 'married_joint':
+                        continue
+                    scenarios.append({
+                        'filing_status': filing_status,
+                        'deduction_method': deduction_method,
+                        'retirement_contribution': contribution,
+                        'income_shift': shift
+                    })
+        return scenarios
+
+    @staticmethod
+    def _scenario_label(scenario):
+        """Readable scenario name, e.g. 'MFS itemized + $10,000 shifted to spouse 2'"""
+        label = (f"{FilingScenarioService.STATUS_LABELS[scenario['filing_status']]} "
+                 f"{scenario['deduction_method']}")
+
+        if scenario['retirement_contribution']:
+            label += f" + ${scenario['retirement_contribution']:,.0f} retirement each"
+        if scenario['income_shift'] > 0:
+            label += f" + ${scenario['income_shift']:,.0f} shifted to spouse 2"
+        elif scenario['income_shift'] < 0:
+            label += f" + ${-scenario['income_shift']:,.0f} shifted to spouse 1"
+
+        return label
+
+    @staticmethod
+    def _spouse_agis(scenario, spouse1_income, spouse2_income):
+        """Each spouse's AGI after the scenario's levers"""
+        # Income can only be shifted up to what the giving spouse earns
+        shift = min(max(scenario['income_shift'], -spouse2_income), spouse1_income)
+        spouse1_agi = spouse1_income - shift
+        spouse2_agi = spouse2_income + shift
+
+        contribution = scenario['retirement_contribution']
+        spouse1_agi -= min(contribution, max(spouse1_agi, 0))
+        spouse2_agi -= min(contribution, max(spouse2_agi, 0))
+
+        return spouse1_agi, spouse2_agi
+
+    @staticmethod
+    def solve(spouse1_id, spouse2_id, retirement_contribution=0, income_shift=0):
+        """
+        Evaluate every filing scenario for a couple and rank them by total tax.
+
+        Args:
+            spouse1_id: First spouse client ID
+            spouse2_id: Second spouse client ID
+            retirement_contribution: Additional pre-tax contribution per spouse (>= 0)
+            income_shift: Income moved from spouse 1 to spouse 2 (negative for the reverse)
+
+        Returns:
+            dict: {
+                'tax_year': tax year of the analysis,
+                'current': label of the couple's current filing status and deduction method,
+                'best': label of the lowest-tax scenario,
+                'savings_vs_current': current scenario's tax minus the best's,
+                'scenarios': ranked list of scenario rows, lowest tax first
+            }
+
+        Raises:
+            ValueError: If the clients are not linked spouses or a lever is invalid
+        """
+        for name, value in (('retirement_contribution', retirement_contribution),
+                            ('income_shift', income_shift)):
+            if not math.isfinite(value):
+                raise ValueError(f"{name} must be a finite number")
+        if retirement_contribution < 0:
+            raise ValueError("retirement_contribution must not be negative")
+
+        spouse1 = Client.query.get(spouse1_id)
+        spouse2 = Client.query.get(spouse2_id)
+
+        if not spouse1 or not spouse2:
+            raise ValueError("Both spouse IDs must be valid")
+
+        if spouse1.spouse_id != spouse2_id or spouse2.spouse_id != spouse1_id:
+            raise ValueError("Clients must be linked as spouses")
+
+        context = JointScenarioContext(spouse1_id, spouse2_id)
+        spouse1_income = context.summary(spouse1_id).get('total_income', 0)
+        spouse2_income = context.summary(spouse2_id).get('total_income', 0)
+        combined_income = spouse1_income + spouse2_income
+
+        scenarios = FilingScenarioService.build_scenarios(retirement_contribution, income_shift)
+
+        # One row per scenario; 'returns' holds one entry per tax return filed
+        rows = []
+        taxable_by_status = {status: [] for status in FilingScenarioService.FILING_STATUSES}
+
+        # Step 1: AGI, deduction and taxable income for each return
+        for scenario in scenarios:
+            filing_status = scenario['filing_status']
+            itemized = scenario['deduction_method'] == 'itemized'
+            spouse1_agi, spouse2_agi = FilingScenarioService._spouse_agis(
+                scenario, spouse1_income, spouse2_income
+            )
+
+            if filing_status == 'married_joint':
+                agi = spouse1_agi + spouse2_agi
+                deduction = (context.joint_itemized_total(agi) if itemized
+                             else context.standard_deduction(filing_status))
+                returns = [{'agi': agi, 'deduction': deduction}]
+            else:
+                returns = []
+                for client_id, agi in ((spouse1_id, spouse1_agi), (spouse2_id, spouse2_agi)):
+                    deduction = (context.separate_itemized_total(client_id, agi) if itemized
+                                 else context.standard_deduction(filing_status))
+                    returns.append({'client_id': client_id, 'agi': agi, 'deduction': deduction})
+
+            for tax_return in returns:
+                tax_return['taxable_income'] = TaxCalculator.calculate_taxable_income(
+                    gross_income=tax_return['agi'],
+                    standard_deduction=tax_return['deduction']
+                )
+                # Index into this status's batch, filled in below
+                tax_return['batch_index'] = len(taxable_by_status[filing_status])
+                taxable_by_status[filing_status].append(tax_return['taxable_income'])
+
+            rows.append({
+                'scenario': FilingScenarioService._scenario_label(scenario),
+                'filing_status': filing_status,
+                'deduction_method': scenario['deduction_method'],
+                'levers': {
+                    'retirement_contribution': scenario['retirement_contribution'],
+                    'income_shift': scenario['income_shift']
+                },
+                'returns': returns
+            })
+
+        # Step 2: One vectorized bracket pass per filing status
+        taxes_by_status = {}
+        for filing_status, taxable_incomes in taxable_by_status.items():
+            if taxable_incomes:
+                taxes_by_status[filing_status] = TaxCalculator.calculate_tax_by_brackets_batch(
+                    taxable_incomes, context.brackets(filing_status)
+                )
+
+        for row in rows:
+            total_taxes, marginal_rates = taxes_by_status[row['filing_status']]
+            for tax_return in row['returns']:
+                index = tax_return.pop('batch_index')
+                tax_return['total_tax'] = float(total_taxes[index])
+                tax_return['marginal_rate'] = float(marginal_rates[index])
+
+            total_tax = round(sum(r['total_tax'] for r in row['returns']), 2)
+            row['agi'] = sum(r['agi'] for r in row['returns'])
+            row['deduction'] = sum(r['deduction'] for r in row['returns'])
+            row['taxable_income'] = sum(r['taxable_income'] for r in row['returns'])
+            row['total_tax'] = total_tax
+            row['marginal_rate'] = max(r['marginal_rate'] for r in row['returns'])
+            row['effective_rate'] = (total_tax / combined_income * 100) if combined_income > 0 else 0
+
+        # Step 3: Rank (stable, so ties keep MFJ/standard/no-lever order)
+        rows.sort(key=lambda row: row['total_tax'])
+        best_tax = rows[0]['total_tax']
+        for rank, row in enumerate(rows, start=1):
+            row['rank'] = rank
+            row['difference_from_best'] = round(row['total_tax'] - best_tax, 2)
+
+        current_method = getattr(spouse1, 'deduction_method', None) or 'standard'
+        current = next(
+            (row for row in rows
+             if row['filing_status'] == spouse1.filing_status
+             and row['deduction_method'] == current_method
+             and not row['levers']['retirement_contribution']
+             and not row['levers']['income_shift']),
+            None
+        )
+
+        return {
+            'tax_year': context.tax_year,
+            'current': current['scenario'] if current else None,
+            'best': rows[0]['scenario'],
+            'savings_vs_current': current['difference_from_best'] if current else None,
+            'scenarios': rows
+        }
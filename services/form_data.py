@@ -0,0 +1,91 @@
+"""
+Form Data - Typed View of a Client's Extracted Data
+
+ExtractedData stores every value as text. FormData parses each field once,
+when an analysis starts, so the strategy analyzers read floats instead of
+re-parsing the same strings on every lookup.
+
+Layout:
+- One flat dict keyed by (form_type, field_name) holding parsed floats, so a
+  lookup is a single hash probe
+- The set of form types present, for "was this form filed" checks
+- Fields whose text is empty or not a number are left out, so lookups return
+  the caller's default, as the old string lookups did
+"""
+
+
+class FormData:
+    """Read-only, pre-parsed view of a client's extracted data"""
+
+    __slots__ = ('_numbers', '_form_types')
+
+    def __init__(self, rows=()):
+        """
+        Args:
+            rows: Iterable of (form_type, field_name, field_value); later rows win
+                  when a field repeats
+        """
+        numbers = {}
+        form_types = set()
+
+        for form_type, field_name, field_value in rows:
+            form_types.add(form_type)
+            number = FormData._parse(field_value)
+            if number is None:
+                numbers.pop((form_type, field_name), None)
+            else:
+                numbers[(form_type, field_name)] = number
+
+        self._numbers = numbers
+        self._form_types = frozenset(form_types)
+
+    @staticmethod
+    def from_dict(data_by_form):
+        """Build from a {form_type: {field_name: field_value}} dict"""
+        return FormData(
+            (form_type, field_name, field_value)
+            for form_type, fields in data_by_form.items()
+            for field_name, field_value in fields.items()
+        )
+
+    @staticmethod
+    def coerce(data):
+        """Return data as a FormData, converting a data_by_form dict if needed"""
+        return data if isinstance(data, FormData) else FormData.from_dict(data)
+
+    def number(self, form_type, field_name, default=0):
+        """
+        Numeric value of a field, or default if the field is missing, empty or not a number.
+
+        Args:
+            form_type: Form type (e.g. 'Schedule C')
+            field_name: Field name (e.g. 'net_profit')
+            default: Value returned when the field has no number
+
+        Returns:
+            float or default
+        """
+        return self._numbers.get((form_type, field_name), default)
+
+    def __contains__(self, form_type):
+        return form_type in self._form_types
+
+    def __iter__(self):
+        return iter(self._form_types)
+
+    def __len__(self):
+        return len(self._form_types)
+
+    def keys(self):
+        """Form types present"""
+        return self._form_types
+
+    @staticmethod
+    def _parse(value):
+        """Float for a stored value, or None if it is empty or not a number"""
+        if not value:
+            return None
+        try:
+            return float(value)
+        except (ValueError, TypeError):
+            return None
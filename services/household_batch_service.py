@@ -0,0 +1,154 @@
+"""
+Household Batch Service - Joint Analysis for Every Linked Couple
+
+Refreshes JointAnalysisService.analyze_joint for the whole book of couples at
+once (e.g. at the start of a season), instead of one couple at a time from the
+UI.
+
+Behavior:
+- Couples are clients linked to each other through spouse_id; each couple is
+  analyzed once, in the orientation of its existing JointAnalysisSummary if it
+  has one (lower client ID first otherwise)
+- Couples whose summary's data_version_hash still matches their current joint
+  hash (and that have a stored result snapshot) are skipped, unless
+  force_refresh is set
+- Stale couples run on a pool of JOINT_BATCH_WORKERS threads, each with its own
+  app context and database session; a couple never shares a client with
+  another couple, so workers never analyze the same client
+- analyze_all() is a generator that yields one progress event per couple as it
+  finishes, so callers can stream progress (the route sends NDJSON)
+"""
+
+from models import db, Client, JointAnalysisSummary
+from services.joint_analysis_service import JointAnalysisService
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from flask import current_app
+from sqlalchemy.orm import aliased
+
+
+class HouseholdBatchService:
+    """Service for running joint analysis across every linked couple"""
+
+    DEFAULT_WORKERS = 4
+
+    @staticmethod
+    def linked_couples():
+        """
+        Every couple of mutually linked clients, once each.
+
+        Returns:
+            list: (spouse1_id, spouse2_id) tuples, in the orientation of the couple's
+                  existing JointAnalysisSummary, otherwise lower client ID first
+        """
+        spouse = aliased(Client)
+        pairs = db.session.query(Client.id, spouse.id).join(
+            spouse, Client.spouse_id == spouse.id
+        ).filter(
+            spouse.spouse_id == Client.id,
+            Client.id < spouse.id
+        ).order_by(Client.id.asc()).all()
+
+        summarized = set(db.session.query(
+            JointAnalysisSummary.spouse1_id, JointAnalysisSummary.spouse2_id
+        ).all())
+
+        return [
+            (higher_id, lower_id) if (higher_id, lower_id) in summarized and (lower_id, higher_id) not in summarized
+            else (lower_id, higher_id)
+            for lower_id, higher_id in pairs
+        ]
+
+    @staticmethod
+    def analyze_couple(spouse1_id, spouse2_id, force_refresh=False):
+        """
+        Refresh one couple's joint analysis unless its cached summary is still valid.
+
+        Args:
+            spouse1_id: First spouse client ID
+            spouse2_id: Second spouse client ID
+            force_refresh: Re-run even if the cached summary is still valid
+
+        Returns:
+            dict: Progress event {spouse1_id, spouse2_id, status, recommended_status,
+                  savings_amount, error} with status 'skipped', 'completed' or 'failed'
+        """
+        event = {
+            'spouse1_id': spouse1_id,
+            'spouse2_id': spouse2_id,
+            'status': None,
+            'recommended_status': None,
+            'savings_amount': None,
+            'error': None
+        }
+
+        try:
+            if not force_refresh:
+                cached = JointAnalysisSummary.query.filter_by(
+                    spouse1_id=spouse1_id,
+                    spouse2_id=spouse2_id
+                ).first()
+                if (cached and cached.result_snapshot and
+                        cached.data_version_hash == JointAnalysisService._calculate_joint_hash(spouse1_id, spouse2_id)):
+                    event.update(
+                        status='skipped',
+                        recommended_status=cached.recommended_status,
+                        savings_amount=cached.savings_amount
+                    )
+                    return event
+
+            # Known to be stale (or forced), so skip analyze_joint's own cache check
+            result = JointAnalysisService.analyze_joint(spouse1_id, spouse2_id, force_refresh=True)
+            event.update(
+                status='completed',
+                recommended_status=result['comparison']['recommended_status'],
+                savings_amount=result['comparison']['savings_amount']
+            )
+        except Exception as e:
+            db.session.rollback()
+            event.update(status='failed', error=str(e))
+
+        return event
+
+    @staticmethod
+    def analyze_all(force_refresh=False, workers=None):
+        """
+        Run joint analysis for every linked couple, yielding progress as couples finish.
+
+        Args:
+            force_refresh: Re-run couples whose cached summary is still valid
+            workers: Worker threads; defaults to JOINT_BATCH_WORKERS
+
+        Yields:
+            dict: {'event': 'started', 'total'}, then one {'event': 'couple', 'done',
+                  'total', ...analyze_couple() fields} per couple in completion order,
+                  then {'event': 'finished', 'total', 'completed', 'skipped', 'failed'}
+        """
+        app = current_app._get_current_object()
+        if workers is None:
+            workers = app.config.get('JOINT_BATCH_WORKERS', HouseholdBatchService.DEFAULT_WORKERS)
+
+        couples = HouseholdBatchService.linked_couples()
+        # Workers use their own sessions; release this one's read transaction
+        db.session.commit()
+
+        total = len(couples)
+        counts = {'completed': 0, 'skipped': 0, 'failed': 0}
+        yield {'event': 'started', 'total': total}
+
+        def run(spouse1_id, spouse2_id):
+            with app.app_context():
+                return HouseholdBatchService.analyze_couple(spouse1_id, spouse2_id, force_refresh)
+
+        executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='joint-batch')
+        try:
+            futures = [executor.submit(run, spouse1_id, spouse2_id) for spouse1_id, spouse2_id in couples]
+
+            for done, future in enumerate(as_completed(futures), start=1):
+                event = future.result()
+                counts[event['status']] += 1
+                yield {'event': 'couple', 'done': done, 'total': total, **event}
+        finally:
+            # A closed stream (client went away) cancels couples not yet started
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        yield {'event': 'finished', 'total': total, **counts}
@@ -150,7 +150,7 @@ class ItemizedDeductionService:
             }
 
     @staticmethod
-    def calculate_itemized_deductions(client_id, tax_year=2026):
+    def calculate_itemized_deductions(client_id, tax_year=2026, agi=None):
         """
         Calculate total itemized deductions with SALT cap and medical threshold.
 
@@ -164,6 +164,8 @@ class ItemizedDeductionService:
         Args:
             client_id: Client ID
             tax_year: Tax year
+            agi: AGI for the medical threshold and SALT phase-out, if already known;
+                 otherwise estimated from the client's analysis
 
         Returns:
             dict: {use_itemized, itemized_total, standard_deduction, benefit_vs_standard, breakdown}
@@ -201,12 +203,13 @@ class ItemizedDeductionService:
             }
 
         # Estimate AGI from existing analysis or income data
-        from services.analysis_engine import AnalysisEngine
-        try:
-            _, summary = AnalysisEngine.analyze_client(client_id)
-            agi = summary.get('total_income', 0)
-        except Exception:
-            agi = 0
+        if agi is None:
+            from services.analysis_engine import AnalysisEngine
+            try:
+                _, summary = AnalysisEngine.analyze_client(client_id)
+                agi = summary.get('total_income', 0)
+            except Exception:
+                agi = 0
 
         # 1. Medical expenses: only above 7.5% of AGI
         medical_threshold = agi * ItemizedDeductionService.MEDICAL_AGI_THRESHOLD
@@ -12,6 +12,8 @@ Key Features:
 - REQ-05: Credit eligibility filtering (MFS ineligible for EITC, student loan, education)
 - REQ-06: QBI threshold enforcement (MFS $197,300, MFJ $394,600)
 - REQ-08: Bidirectional cache invalidation via combined hash
+- Cache hits return the stored result snapshot (strategies, income types,
+  joint strategies and exact marginal rates as rendered), with no recomputation
 
 Filing Status Values:
 - 'married_joint' for MFJ calculations
@@ -28,11 +30,157 @@ from services.analysis_engine import AnalysisEngine
 from services.tax_calculator import TaxCalculator
 from services.itemized_deduction_service import ItemizedDeductionService
 from services.joint_strategy_service import JointStrategyService
+from services.tax_strategies import TaxStrategiesService
+from flask import current_app
 import hashlib
 import json
 from datetime import datetime
 
 
+class JointScenarioContext:
+    """
+    Inputs shared by the scenarios of one joint analysis, computed once each.
+
+    MFJ and MFS both need each spouse's analysis and itemized deductions, and
+    every scenario of a filing status needs the same standard deduction and
+    brackets. The context memoizes them for the duration of one call, so each
+    spouse is analyzed once even when itemized deductions also need their AGI.
+    """
+
+    def __init__(self, spouse1_id, spouse2_id):
+        """
+        Args:
+            spouse1_id: First spouse client ID
+            spouse2_id: Second spouse client ID
+        """
+        self.spouse1_id = spouse1_id
+        self.spouse2_id = spouse2_id
+        self._analyses = {}
+        self._income_types = {}
+        self._itemized = {}
+        self._standard_deductions = {}
+        self._brackets = {}
+
+    def analysis(self, client_id):
+        """(strategies, summary) from AnalysisEngine.analyze_client"""
+        if client_id not in self._analyses:
+            self._analyses[client_id] = AnalysisEngine.analyze_client(client_id)
+        return self._analyses[client_id]
+
+    def summary(self, client_id):
+        """Analysis summary dict for a spouse"""
+        return self.analysis(client_id)[1]
+
+    def income_types(self, client_id):
+        """Income types from TaxStrategiesService.detect_income_types"""
+        if client_id not in self._income_types:
+            self._income_types[client_id] = TaxStrategiesService.detect_income_types(client_id)
+        return self._income_types[client_id]
+
+    @property
+    def tax_year(self):
+        """Tax year of the analysis: spouse 1's, defaulting to 2026"""
+        return self.summary(self.spouse1_id).get('tax_year') or 2026
+
+    def itemized(self, client_id):
+        """
+        ItemizedDeductionService result for a spouse, using the AGI from their analysis.
+
+        The same breakdown serves the MFS deduction and the combined MFJ amounts.
+        """
+        if client_id not in self._itemized:
+            self._itemized[client_id] = ItemizedDeductionService.calculate_itemized_deductions(
+                client_id,
+                self.tax_year,
+                agi=self.summary(client_id).get('total_income', 0)
+            )
+        return self._itemized[client_id]
+
+    def joint_itemized_total(self, agi):
+        """
+        Combined MFJ itemized deductions at a household AGI.
+
+        Both spouses' raw amounts are pooled; SALT is capped at the MFJ cap and
+        medical expenses are deductible above 7.5% of the combined AGI.
+        """
+        spouse1_breakdown = self.itemized(self.spouse1_id)['breakdown']
+        spouse2_breakdown = self.itemized(self.spouse2_id)['breakdown']
+
+        # Combine raw amounts and recalculate with MFJ SALT cap
+        combined_salt_raw = (spouse1_breakdown['state_local_taxes']['raw'] +
+                             spouse2_breakdown['state_local_taxes']['raw'])
+        combined_medical_raw = (spouse1_breakdown['medical_expenses']['raw'] +
+                                spouse2_breakdown['medical_expenses']['raw'])
+        combined_mortgage = (spouse1_breakdown['mortgage_interest'] +
+                             spouse2_breakdown['mortgage_interest'])
+        combined_charitable = (spouse1_breakdown['charitable_contributions'] +
+                               spouse2_breakdown['charitable_contributions'])
+
+        # Apply MFJ SALT cap ($40,400) to combined SALT
+        mfj_salt = ItemizedDeductionService.calculate_salt_deduction(
+            state_local_taxes=combined_salt_raw,
+            filing_status='married_joint',
+            magi=agi,
+            tax_year=self.tax_year
+        )
+
+        # Medical threshold uses combined AGI for MFJ
+        medical_threshold = agi * ItemizedDeductionService.MEDICAL_AGI_THRESHOLD
+        medical_deductible = max(0, combined_medical_raw - medical_threshold)
+
+        return round(
+            medical_deductible +
+            mfj_salt['deduction_allowed'] +
+            combined_mortgage +
+            combined_charitable,
+            2
+        )
+
+    def separate_itemized_total(self, client_id, agi):
+        """
+        One spouse's MFS itemized deductions at their own AGI, with the MFS SALT cap.
+        """
+        breakdown = self.itemized(client_id)['breakdown']
+
+        salt = ItemizedDeductionService.calculate_salt_deduction(
+            state_local_taxes=breakdown['state_local_taxes']['raw'],
+            filing_status='married_separate',
+            magi=agi,
+            tax_year=self.tax_year
+        )
+
+        medical_threshold = agi * ItemizedDeductionService.MEDICAL_AGI_THRESHOLD
+        medical_deductible = max(0, breakdown['medical_expenses']['raw'] - medical_threshold)
+
+        return round(
+            medical_deductible +
+            salt['deduction_allowed'] +
+            breakdown['mortgage_interest'] +
+            breakdown['charitable_contributions'],
+            2
+        )
+
+    def standard_deduction(self, filing_status):
+        """Federal standard deduction for a filing status"""
+        if filing_status not in self._standard_deductions:
+            self._standard_deductions[filing_status] = TaxCalculator.get_standard_deduction(
+                filing_status=filing_status,
+                tax_type='federal',
+                tax_year=self.tax_year
+            )
+        return self._standard_deductions[filing_status]
+
+    def brackets(self, filing_status):
+        """Federal brackets for a filing status"""
+        if filing_status not in self._brackets:
+            self._brackets[filing_status] = TaxCalculator.get_tax_schedule(
+                tax_type='federal',
+                filing_status=filing_status,
+                tax_year=self.tax_year
+            )
+        return self._brackets[filing_status]
+
+
 class JointAnalysisService:
     """Service for dual-filer MFJ vs MFS analysis"""
 
@@ -86,11 +234,36 @@ class JointAnalysisService:
         Calculate combined hash from both spouses' individual hashes.
         If either spouse's data changes, joint hash changes.
 
+        Both spouses' data versions (bumped by triggers on every ExtractedData
+        change) are read in one primary-key query, and each spouse's hash is
+        built from them exactly as AnalysisEngine._calculate_data_version_hash
+        would, so existing cached summaries stay valid.
+
         Returns:
             str: SHA-256 hash combining both spouse hashes
         """
-        spouse1_hash = AnalysisEngine._calculate_data_version_hash(spouse1_id)
-        spouse2_hash = AnalysisEngine._calculate_data_version_hash(spouse2_id)
+        # Columns, not instances: loaded Client objects may hold a stale data_version
+        versions = {
+            client_id: (data_version, spouse_id)
+            for client_id, data_version, spouse_id in db.session.query(
+                Client.id, Client.data_version, Client.spouse_id
+            ).filter(Client.id.in_((spouse1_id, spouse2_id))).all()
+        }
+
+        def spouse_hash(client_id):
+            if client_id not in versions:
+                return AnalysisEngine._calculate_data_version_hash(client_id)
+
+            data_version, spouse_id = versions[client_id]
+            if spouse_id is not None and spouse_id not in versions:
+                # Linked to someone else; look that spouse's version up separately
+                return AnalysisEngine._calculate_data_version_hash(client_id)
+
+            spouse_data_version = versions[spouse_id][0] if spouse_id is not None else None
+            return AnalysisEngine._version_hash(client_id, data_version, spouse_id, spouse_data_version)
+
+        spouse1_hash = spouse_hash(spouse1_id)
+        spouse2_hash = spouse_hash(spouse2_id)
 
         # Combine in consistent order (lower ID first for symmetry)
         ordered_ids = sorted([spouse1_id, spouse2_id])
@@ -281,99 +454,6 @@ class JointAnalysisService:
             'error': None
         }
 
-    @staticmethod
-    def _format_cached_result(cached, spouse1_id, spouse2_id):
-        """Format cached JointAnalysisSummary into return structure"""
-        spouse1_strategies, spouse1_summary = AnalysisEngine.analyze_client(spouse1_id)
-        spouse2_strategies, spouse2_summary = AnalysisEngine.analyze_client(spouse2_id)
-
-        # Get income types for cached results too (REQ-21)
-        from services.tax_strategies import TaxStrategiesService
-        spouse1_income_types = TaxStrategiesService.detect_income_types(spouse1_id)
-        spouse2_income_types = TaxStrategiesService.detect_income_types(spouse2_id)
-
-        # Prioritize strategies by income type
-        spouse1_strategies = TaxStrategiesService.filter_strategies_by_income_type(
-            spouse1_strategies, spouse1_income_types
-        )
-        spouse2_strategies = TaxStrategiesService.filter_strategies_by_income_type(
-            spouse2_strategies, spouse2_income_types
-        )
-
-        notes_list = []
-        if cached.comparison_notes:
-            try:
-                notes_list = json.loads(cached.comparison_notes)
-            except (json.JSONDecodeError, TypeError):
-                pass
-
-        # Generate joint strategies for cached result (REQ-22)
-        mfs_combined_for_strategies = {
-            'mfs_combined_tax': cached.mfs_combined_tax,
-            'mfs_spouse1_tax': cached.mfs_spouse1_tax,
-            'mfs_spouse2_tax': cached.mfs_spouse2_tax
-        }
-
-        mfj_result_for_strategies = {
-            'total_tax': cached.mfj_total_tax,
-            'combined_income': cached.mfj_combined_income,
-            'effective_rate': cached.mfj_effective_rate,
-            'marginal_rate': 24  # Approximate for cached results
-        }
-
-        joint_strategies = JointStrategyService.generate_joint_strategies(
-            spouse1_summary=spouse1_summary,
-            spouse2_summary=spouse2_summary,
-            mfj_result=mfj_result_for_strategies,
-            mfs_result=mfs_combined_for_strategies
-        )
-
-        return {
-            'spouse1': {
-                'summary': spouse1_summary,
-                'strategies': [s.to_dict() for s in spouse1_strategies],
-                'income_types': spouse1_income_types  # REQ-21
-            },
-            'spouse2': {
-                'summary': spouse2_summary,
-                'strategies': [s.to_dict() for s in spouse2_strategies],
-                'income_types': spouse2_income_types  # REQ-21
-            },
-            'mfj': {
-                'combined_income': cached.mfj_combined_income,
-                'agi': cached.mfj_agi,
-                'standard_deduction': cached.mfj_standard_deduction,
-                'taxable_income': cached.mfj_taxable_income,
-                'total_tax': cached.mfj_total_tax,
-                'effective_rate': cached.mfj_effective_rate,
-            },
-            'mfs_spouse1': {
-                'income': cached.mfs_spouse1_income,
-                'agi': cached.mfs_spouse1_agi,
-                'standard_deduction': cached.mfs_standard_deduction,
-                'taxable_income': cached.mfs_spouse1_taxable_income,
-                'total_tax': cached.mfs_spouse1_tax,
-                'effective_rate': (cached.mfs_spouse1_tax / cached.mfs_spouse1_income * 100) if cached.mfs_spouse1_income > 0 else 0,
-            },
-            'mfs_spouse2': {
-                'income': cached.mfs_spouse2_income,
-                'agi': cached.mfs_spouse2_agi,
-                'standard_deduction': cached.mfs_standard_deduction,
-                'taxable_income': cached.mfs_spouse2_taxable_income,
-                'total_tax': cached.mfs_spouse2_tax,
-                'effective_rate': (cached.mfs_spouse2_tax / cached.mfs_spouse2_income * 100) if cached.mfs_spouse2_income > 0 else 0,
-            },
-            'comparison': {
-                'recommended_status': cached.recommended_status,
-                'savings_amount': cached.savings_amount,
-                'mfj_total_tax': cached.mfj_total_tax,
-                'mfs_total_tax': cached.mfs_combined_tax,
-                'reason': f"{cached.recommended_status} saves ${cached.savings_amount:,.2f}",
-                'notes': notes_list,
-            },
-            'joint_strategies': joint_strategies,  # REQ-22: MFJ-only strategies
-        }
-
     @staticmethod
     def analyze_joint(spouse1_id, spouse2_id, force_refresh=False):
         """
@@ -421,17 +501,18 @@ class JointAnalysisService:
             spouse2_id=spouse2_id
         ).first()
 
-        if cached and cached.data_version_hash == joint_hash and not force_refresh:
-            return JointAnalysisService._format_cached_result(cached, spouse1_id, spouse2_id)
+        # Summaries stored before snapshots existed are recalculated once
+        if cached and cached.data_version_hash == joint_hash and cached.result_snapshot and not force_refresh:
+            return json.loads(cached.result_snapshot)
 
-        # Step 4: Analyze each spouse individually
-        spouse1_strategies, spouse1_summary = AnalysisEngine.analyze_client(spouse1_id)
-        spouse2_strategies, spouse2_summary = AnalysisEngine.analyze_client(spouse2_id)
+        # Step 4: Analyze each spouse individually (once each, shared by every scenario)
+        context = JointScenarioContext(spouse1_id, spouse2_id)
+        spouse1_strategies, spouse1_summary = context.analysis(spouse1_id)
+        spouse2_strategies, spouse2_summary = context.analysis(spouse2_id)
 
         # Detect income types for personalization (REQ-21)
-        from services.tax_strategies import TaxStrategiesService
-        spouse1_income_types = TaxStrategiesService.detect_income_types(spouse1_id)
-        spouse2_income_types = TaxStrategiesService.detect_income_types(spouse2_id)
+        spouse1_income_types = context.income_types(spouse1_id)
+        spouse2_income_types = context.income_types(spouse2_id)
 
         # Prioritize strategies by income type
         spouse1_strategies = TaxStrategiesService.filter_strategies_by_income_type(
@@ -442,53 +523,17 @@ class JointAnalysisService:
         )
 
         # Step 5: Calculate MFJ scenario (REQ-01, REQ-07)
-        tax_year = spouse1_summary.get('tax_year') or 2026
+        tax_year = context.tax_year
         spouse1_income = spouse1_summary.get('total_income', 0)
         spouse2_income = spouse2_summary.get('total_income', 0)
         combined_income = spouse1_income + spouse2_income
 
-        mfj_std_deduction = TaxCalculator.get_standard_deduction(
-            filing_status='married_joint',
-            tax_type='federal',
-            tax_year=tax_year
-        )
+        mfj_std_deduction = context.standard_deduction('married_joint')
 
         # Determine MFJ deduction (standard or itemized)
         if deduction_method == 'itemized':
-            # Calculate combined itemized deductions for MFJ
-            spouse1_itemized = ItemizedDeductionService.calculate_itemized_deductions(spouse1_id, tax_year)
-            spouse2_itemized = ItemizedDeductionService.calculate_itemized_deductions(spouse2_id, tax_year)
-
-            # Combine raw amounts and recalculate with MFJ SALT cap
-            combined_salt_raw = (spouse1_itemized['breakdown']['state_local_taxes']['raw'] +
-                                 spouse2_itemized['breakdown']['state_local_taxes']['raw'])
-            combined_medical_raw = (spouse1_itemized['breakdown']['medical_expenses']['raw'] +
-                                    spouse2_itemized['breakdown']['medical_expenses']['raw'])
-            combined_mortgage = (spouse1_itemized['breakdown']['mortgage_interest'] +
-                                 spouse2_itemized['breakdown']['mortgage_interest'])
-            combined_charitable = (spouse1_itemized['breakdown']['charitable_contributions'] +
-                                   spouse2_itemized['breakdown']['charitable_contributions'])
-
-            # Apply MFJ SALT cap ($40,400) to combined SALT
-            mfj_salt = ItemizedDeductionService.calculate_salt_deduction(
-                state_local_taxes=combined_salt_raw,
-                filing_status='married_joint',
-                magi=combined_income,
-                tax_year=tax_year
-            )
-
-            # Medical threshold uses combined AGI for MFJ
-            medical_threshold = combined_income * 0.075
-            medical_deductible = max(0, combined_medical_raw - medical_threshold)
-
-            mfj_itemized_total = round(
-                medical_deductible +
-                mfj_salt['deduction_allowed'] +
-                combined_mortgage +
-                combined_charitable,
-                2
-            )
-
+            # Combined itemized deductions for MFJ, with the MFJ SALT cap
+            mfj_itemized_total = context.joint_itemized_total(combined_income)
             mfj_deduction = max(mfj_itemized_total, mfj_std_deduction)
         else:
             mfj_deduction = mfj_std_deduction
@@ -498,15 +543,12 @@ class JointAnalysisService:
             standard_deduction=mfj_deduction
         )
 
-        mfj_brackets = TaxCalculator.get_tax_brackets(
-            tax_type='federal',
-            filing_status='married_joint',
-            tax_year=tax_year
-        )
+        mfj_brackets = context.brackets('married_joint')
 
         mfj_tax_result = TaxCalculator.calculate_tax_by_brackets(
             taxable_income=mfj_taxable,
-            brackets=mfj_brackets
+            brackets=mfj_brackets,
+            include_breakdown=False
         )
 
         mfj_result = {
@@ -520,26 +562,14 @@ class JointAnalysisService:
         }
 
         # Step 6: Calculate MFS scenario (REQ-02, REQ-07, REQ-09, REQ-10)
-        mfs_std_deduction = TaxCalculator.get_standard_deduction(
-            filing_status='married_separate',
-            tax_type='federal',
-            tax_year=tax_year
-        )
-
-        mfs_brackets = TaxCalculator.get_tax_brackets(
-            tax_type='federal',
-            filing_status='married_separate',
-            tax_year=tax_year
-        )
+        mfs_std_deduction = context.standard_deduction('married_separate')
+        mfs_brackets = context.brackets('married_separate')
 
         # Determine MFS deductions per spouse (standard or itemized)
         if deduction_method == 'itemized':
             # Each spouse calculates itemized separately with MFS SALT cap ($20k each)
-            spouse1_itemized_result = ItemizedDeductionService.calculate_itemized_deductions(spouse1_id, tax_year)
-            mfs_spouse1_deduction = spouse1_itemized_result['itemized_total']
-
-            spouse2_itemized_result = ItemizedDeductionService.calculate_itemized_deductions(spouse2_id, tax_year)
-            mfs_spouse2_deduction = spouse2_itemized_result['itemized_total']
+            mfs_spouse1_deduction = context.separate_itemized_total(spouse1_id, spouse1_income)
+            mfs_spouse2_deduction = context.separate_itemized_total(spouse2_id, spouse2_income)
         else:
             mfs_spouse1_deduction = mfs_std_deduction
             mfs_spouse2_deduction = mfs_std_deduction
@@ -551,7 +581,8 @@ class JointAnalysisService:
         )
         mfs_spouse1_tax_result = TaxCalculator.calculate_tax_by_brackets(
             taxable_income=mfs_spouse1_taxable,
-            brackets=mfs_brackets
+            brackets=mfs_brackets,
+            include_breakdown=False
         )
 
         mfs_spouse1_result = {
@@ -571,7 +602,8 @@ class JointAnalysisService:
         )
         mfs_spouse2_tax_result = TaxCalculator.calculate_tax_by_brackets(
             taxable_income=mfs_spouse2_taxable,
-            brackets=mfs_brackets
+            brackets=mfs_brackets,
+            include_breakdown=False
         )
 
         mfs_spouse2_result = {
@@ -668,6 +700,26 @@ class JointAnalysisService:
             mfs_result=mfs_combined_for_strategies
         )
 
+        result = {
+            'spouse1': {
+                'summary': spouse1_summary,
+                'strategies': [s.to_dict() for s in spouse1_strategies],
+                'income_types': spouse1_income_types  # REQ-21
+            },
+            'spouse2': {
+                'summary': spouse2_summary,
+                'strategies': [s.to_dict() for s in spouse2_strategies],
+                'income_types': spouse2_income_types  # REQ-21
+            },
+            'mfj': mfj_result,
+            'mfs_spouse1': mfs_spouse1_result,
+            'mfs_spouse2': mfs_spouse2_result,
+            'comparison': comparison,
+            'joint_strategies': joint_strategies,  # REQ-22: MFJ-only strategies
+        }
+        # Serialized as the API would send it, so a cache hit returns the same payload
+        result_snapshot = current_app.json.dumps(result)
+
         # Step 8: Store result in cache
         if cached:
             cached.tax_year = tax_year
@@ -692,6 +744,7 @@ class JointAnalysisService:
             cached.savings_amount = abs(savings)
             cached.comparison_notes = json.dumps(comparison_notes)
             cached.data_version_hash = joint_hash
+            cached.result_snapshot = result_snapshot
             cached.last_analyzed_at = datetime.utcnow()
         else:
             cached = JointAnalysisSummary(
@@ -719,29 +772,14 @@ class JointAnalysisService:
                 savings_amount=abs(savings),
                 comparison_notes=json.dumps(comparison_notes),
                 data_version_hash=joint_hash,
+                result_snapshot=result_snapshot,
             )
             db.session.add(cached)
 
         db.session.commit()
 
         # Step 9: Return structured result
-        return {
-            'spouse1': {
-                'summary': spouse1_summary,
-                'strategies': [s.to_dict() for s in spouse1_strategies],
-                'income_types': spouse1_income_types  # REQ-21
-            },
-            'spouse2': {
-                'summary': spouse2_summary,
-                'strategies': [s.to_dict() for s in spouse2_strategies],
-                'income_types': spouse2_income_types  # REQ-21
-            },
-            'mfj': mfj_result,
-            'mfs_spouse1': mfs_spouse1_result,
-            'mfs_spouse2': mfs_spouse2_result,
-            'comparison': comparison,
-            'joint_strategies': joint_strategies,  # REQ-22: MFJ-only strategies
-        }
+        return result
 
     @staticmethod
     def get_comparison_summary(spouse1_id, spouse2_id):
@@ -76,7 +76,7 @@ class JointStrategyService:
         Args:
             spouse1_summary: Analysis summary for spouse 1
             spouse2_summary: Analysis summary for spouse 2
-            mfj_result: MFJ calculation result dict
+            mfj_result: MFJ calculation result dict (marginal_rate as a decimal, e.g. 0.24)
             mfs_result: MFS calculation result dict (combined both spouses)
 
         Returns:
@@ -142,7 +142,7 @@ class JointStrategyService:
             }
 
         # Calculate tax benefit (estimate 22% marginal rate if unknown)
-        marginal_rate = mfj_result.get('marginal_rate', 22) / 100
+        marginal_rate = mfj_result.get('marginal_rate', 0.22)
         max_contribution = limit
         benefit = max_contribution * marginal_rate
 
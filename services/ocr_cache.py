@@ -0,0 +1,173 @@
+"""
+OCR Cache - Content-Addressed Extraction Results
+
+On-disk cache of OCRService page extraction results, keyed by the SHA-256 of
+the file bytes plus the extractor version. Re-processing a document, or the
+same file uploaded for another client, reads the cached pages instead of
+re-running pdfplumber/tesseract; only parsing runs again.
+
+Layout:
+- OCR_CACHE_FOLDER/<key[:2]>/<key>.json, one JSON list of page dicts per entry
+- key = SHA-256 of '<file sha256>:<extractor version>', so bumping the
+  extractor version orphans old entries (they age out through eviction)
+
+Eviction:
+- Entries are touched on every hit; when the folder grows past
+  OCR_CACHE_MAX_BYTES the least recently used entries are deleted
+"""
+
+from config import OCR_CACHE_FOLDER, OCR_CACHE_MAX_BYTES
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+
+class OCRCache:
+    """Content-addressed on-disk cache of OCR page results with LRU eviction"""
+
+    READ_CHUNK_SIZE = 1024 * 1024
+
+    _lock = threading.Lock()
+
+    @staticmethod
+    def file_digest(file_path):
+        """
+        SHA-256 of a file's bytes, read in chunks.
+
+        Returns:
+            str: Hex digest
+        """
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(OCRCache.READ_CHUNK_SIZE), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def make_key(file_digest, extractor_version):
+        """Cache key for a file digest and extractor version"""
+        return hashlib.sha256(f'{file_digest}:{extractor_version}'.encode()).hexdigest()
+
+    @staticmethod
+    def get(key):
+        """
+        Look up cached pages and mark the entry as recently used.
+
+        Returns:
+            list or None: Cached page dicts, or None on a miss
+        """
+        path = OCRCache._entry_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                pages = json.load(f)
+            os.utime(path)
+            return pages
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def put(key, pages):
+        """
+        Store pages under a key, then evict least recently used entries if over the size limit.
+
+        The entry is written to a temporary file and renamed into place so readers
+        never see a partial entry.
+        """
+        writer = OCRCache.open_writer(key)
+        try:
+            for page in pages:
+                writer.add(page)
+        except Exception:
+            writer.discard()
+            raise
+        writer.commit()
+
+    @staticmethod
+    def open_writer(key):
+        """
+        Start writing an entry one page at a time, so pages need not be held in memory.
+
+        Returns:
+            OCRCacheWriter: Call add() per page, then commit() or discard()
+        """
+        return OCRCacheWriter(OCRCache._entry_path(key))
+
+    @staticmethod
+    def evict(max_bytes):
+        """
+        Delete least recently used entries until the cache fits in max_bytes.
+
+        Returns:
+            int: Number of entries deleted
+        """
+        with OCRCache._lock:
+            entries = []
+            total_bytes = 0
+            for root, _, files in os.walk(OCR_CACHE_FOLDER):
+                for name in files:
+                    if not name.endswith('.json'):
+                        continue
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, path))
+                    total_bytes += stat.st_size
+
+            deleted = 0
+            for _, size, path in sorted(entries):
+                if total_bytes <= max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total_bytes -= size
+                    deleted += 1
+                except OSError:
+                    pass
+
+            return deleted
+
+    @staticmethod
+    def _entry_path(key):
+        """File path for a cache key"""
+        return os.path.join(str(OCR_CACHE_FOLDER), key[:2], f'{key}.json')
+
+
+class OCRCacheWriter:
+    """Incremental writer for one cache entry; the entry appears only on commit()"""
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, self.temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        self._file = os.fdopen(fd, 'w', encoding='utf-8')
+        self._file.write('[')
+        self._count = 0
+
+    def add(self, page):
+        """Append one page dict to the entry"""
+        if self._count:
+            self._file.write(',')
+        json.dump(page, self._file)
+        self._count += 1
+
+    def commit(self):
+        """Rename the finished entry into place, then evict if the cache is over its size limit"""
+        try:
+            self._file.write(']')
+            self._file.close()
+            os.replace(self.temp_path, self.path)
+        except Exception:
+            self.discard()
+            raise
+
+        OCRCache.evict(OCR_CACHE_MAX_BYTES)
+
+    def discard(self):
+        """Drop the partial entry"""
+        self._file.close()
+        if os.path.exists(self.temp_path):
+            os.remove(self.temp_path)
@@ -1,15 +1,101 @@
 import pdfplumber
 import pytesseract
 from PIL import Image
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from collections import OrderedDict, deque
+import multiprocessing
+import threading
+import time
 import os
-from config import TESSERACT_CMD
+from config import TESSERACT_CMD, OCR_MAX_PROCESSES, OCR_RESOLUTION
+from services.ocr_cache import OCRCache
 
 if TESSERACT_CMD:
     pytesseract.pytesseract.tesseract_cmd = TESSERACT_CMD
 
+
+# PDFs kept open by this process for _extract_pdf_page, most recently used last
+_open_pdfs = OrderedDict()
+_OPEN_PDF_LIMIT = 4
+
+
+def _open_pdf(file_path):
+    """
+    pdfplumber handle for file_path, kept open across calls in this process.
+    
+    Opening a PDF parses its whole page tree, so reopening it for every page
+    makes a document cost quadratic in its page count. Pool workers keep the
+    handle instead; it is keyed by size and modification time as well, so a
+    replaced file is reopened. Past _OPEN_PDF_LIMIT documents the least
+    recently used handle is closed.
+    """
+    stat = os.stat(file_path)
+    key = (file_path, stat.st_size, stat.st_mtime_ns)
+    
+    pdf = _open_pdfs.pop(key, None)
+    if pdf is None:
+        pdf = pdfplumber.open(file_path)
+    _open_pdfs[key] = pdf
+    
+    while len(_open_pdfs) > _OPEN_PDF_LIMIT:
+        _, oldest = _open_pdfs.popitem(last=False)
+        oldest.close()
+    return pdf
+
+
+def _extract_pdf_page(file_path, page_index, ocr_available):
+    """
+    Extract one PDF page in a worker process, reusing the process's open handle.
+    
+    Module-level so it can run in a worker process.
+    
+    Returns:
+        dict: {'page_number', 'text', 'method', 'seconds'}
+    """
+    return _extract_page(_open_pdf(file_path).pages[page_index], page_index, ocr_available)
+
+
+def _extract_page(page, page_index, ocr_available):
+    """
+    Extract an open PDF page: text layer first, rasterize and OCR if the page has none.
+    
+    Returns:
+        dict: {'page_number', 'text', 'method', 'seconds'}
+    """
+    started = time.perf_counter()
+    method = 'text_layer'
+    
+    try:
+        text = page.extract_text() or ''
+        
+        # Scanned page with no text layer
+        if not text.strip() and ocr_available:
+            image = page.to_image(resolution=OCR_RESOLUTION).original
+            text = pytesseract.image_to_string(image.convert('RGB'))
+            method = 'ocr'
+    finally:
+        # The handle outlives the page; drop its parsed layout so memory stays flat
+        page.flush_cache()
+    
+    return {
+        'page_number': page_index + 1,
+        'text': text,
+        'method': method,
+        'seconds': round(time.perf_counter() - started, 4)
+    }
+
+
 class OCRService:
     """Service for extracting text from PDF and image files"""
     
+    # Bump when extraction output changes so cached results are not reused
+    EXTRACTOR_VERSION = '2'
+    
+    _pool = None
+    _pool_lock = threading.Lock()
+    _ocr_available = None
+    
     @staticmethod
     def extract_text(file_path, file_type):
         """
@@ -22,30 +108,159 @@ class OCRService:
         Returns:
             str: Extracted text
         """
+        pages = OCRService.extract_pages(file_path, file_type)
+        return '\n\n'.join(page['text'] for page in pages if page['text'])
+    
+    @staticmethod
+    def extract_pages(file_path, file_type, parallel=True, use_cache=True):
+        """
+        Extract text page by page, in page order.
+        
+        Collects iter_pages() into a list; see it for caching and parallelism.
+        
+        Returns:
+            list: Dicts of {'page_number', 'text', 'method', 'seconds', 'cached'} per page,
+                  method being 'text_layer' or 'ocr' and seconds the original extraction time
+        """
+        return list(OCRService.iter_pages(file_path, file_type, parallel, use_cache))
+    
+    @staticmethod
+    def iter_pages(file_path, file_type, parallel=True, use_cache=True, file_digest=None):
+        """
+        Yield extracted pages in page order as soon as each one is ready.
+        
+        Results are cached on disk by file content (see OCRCache), so the same
+        bytes are only extracted once per extractor version; the cache entry is
+        written page by page as pages are yielded. Multi-page PDFs are split
+        across a process pool sized to the available cores, with only a few pages
+        in flight at a time; pages without a text layer are rasterized and OCR'd
+        in the pool.
+        
+        Args:
+            file_path: Path to the file
+            file_type: Type of file (pdf, jpg, png)
+            parallel: Whether to use the process pool for multi-page PDFs
+            use_cache: Whether to read and write the OCR cache
+            file_digest: SHA-256 of the file if already known (e.g. Document.content_hash),
+                         to skip hashing it again
+        
+        Yields:
+            dict: {'page_number', 'text', 'method', 'seconds', 'cached'} per page,
+                  method being 'text_layer' or 'ocr' and seconds the original extraction time
+        """
+        cache_writer = None
         try:
+            if use_cache:
+                cache_key = OCRCache.make_key(
+                    file_digest or OCRCache.file_digest(file_path), OCRService._cache_version(file_type)
+                )
+                cached_pages = OCRCache.get(cache_key)
+                if cached_pages is not None:
+                    for page in cached_pages:
+                        yield dict(page, cached=True)
+                    return
+                cache_writer = OCRCache.open_writer(cache_key)
+            
             if file_type.lower() == 'pdf':
-                return OCRService._extract_from_pdf(file_path)
+                pages = OCRService._iter_pdf_pages(file_path, parallel)
             elif file_type.lower() in ['jpg', 'jpeg', 'png']:
-                return OCRService._extract_from_image(file_path)
+                pages = OCRService._iter_image_pages(file_path)
             else:
                 raise ValueError(f"Unsupported file type: {file_type}")
+            
+            for page in pages:
+                if cache_writer:
+                    cache_writer.add(page)
+                yield dict(page, cached=False)
+            
+            if cache_writer:
+                cache_writer.commit()
+                cache_writer = None
         except Exception as e:
             raise Exception(f"OCR extraction failed: {str(e)}")
+        finally:
+            # Abandoned or failed extraction leaves no partial cache entry
+            if cache_writer:
+                cache_writer.discard()
+    
+    @staticmethod
+    def _cache_version(file_type):
+        """
+        Extractor version string for cache keys.
+        
+        Includes OCR settings and whether tesseract is available, so text-layer-only
+        results for scanned pages are not reused once OCR is installed.
+        """
+        return f'{OCRService.EXTRACTOR_VERSION}:{file_type.lower()}:{OCR_RESOLUTION}:{OCRService.is_ocr_available()}'
     
     @staticmethod
-    def _extract_from_pdf(file_path):
-        """Extract text from PDF using pdfplumber"""
-        text_content = []
+    def _iter_pdf_pages(file_path, parallel=True):
+        """
+        Yield each PDF page's extraction in page order, falling back to OCR for scanned pages.
+        
+        In parallel mode at most two pages per pool process are submitted ahead
+        of the page being yielded, so memory stays flat on long documents; each
+        pool process keeps the PDF open between its pages (see _open_pdf).
+        
+        If a pool process dies (e.g. out of memory on a large scan), the broken
+        pool is replaced and the remaining pages are retried once on the new one;
+        a second failure fails this document but leaves a fresh pool for the next.
+        """
         try:
+            ocr_available = OCRService.is_ocr_available()
+            
             with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text_content.append(page_text)
-            return '\n\n'.join(text_content)
+                page_count = len(pdf.pages)
+                
+                # Serial extraction reads every page from this one open handle
+                if not parallel or page_count < 2:
+                    for page_index, page in enumerate(pdf.pages):
+                        yield _extract_page(page, page_index, ocr_available)
+                    return
+            
+            first_index = 0
+            for retry in (False, True):
+                pool = OCRService._get_pool()
+                try:
+                    for page in OCRService._iter_pool_pages(pool, file_path, first_index, page_count, ocr_available):
+                        yield page
+                        first_index += 1
+                    return
+                except BrokenProcessPool:
+                    OCRService._reset_pool(pool)
+                    if retry:
+                        raise
         except Exception as e:
             raise Exception(f"PDF extraction failed: {str(e)}")
     
+    @staticmethod
+    def _iter_pool_pages(pool, file_path, first_index, page_count, ocr_available):
+        """Yield pages first_index onward from the pool, in page order, with a bounded window in flight"""
+        window = 2 * OCRService._pool_size()
+        in_flight = deque()
+        next_index = first_index
+        try:
+            while next_index < page_count or in_flight:
+                while next_index < page_count and len(in_flight) < window:
+                    in_flight.append(pool.submit(_extract_pdf_page, file_path, next_index, ocr_available))
+                    next_index += 1
+                yield in_flight.popleft().result()
+        finally:
+            for future in in_flight:
+                future.cancel()
+    
+    @staticmethod
+    def _iter_image_pages(file_path):
+        """Yield the single page of an image file"""
+        started = time.perf_counter()
+        text = OCRService._extract_from_image(file_path)
+        yield {
+            'page_number': 1,
+            'text': text,
+            'method': 'ocr',
+            'seconds': round(time.perf_counter() - started, 4)
+        }
+    
     @staticmethod
     def _extract_from_image(file_path):
         """Extract text from image using pytesseract"""
@@ -59,13 +274,43 @@ class OCRService:
         except Exception as e:
             raise Exception(f"Image OCR failed: {str(e)}")
     
+    @staticmethod
+    def _get_pool():
+        """
+        Shared page-extraction process pool, created on first use.
+        
+        Uses 'spawn' so workers do not inherit the app's threads or database connections.
+        """
+        with OCRService._pool_lock:
+            if OCRService._pool is None:
+                OCRService._pool = ProcessPoolExecutor(
+                    max_workers=OCRService._pool_size(),
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+            return OCRService._pool
+    
+    @staticmethod
+    def _reset_pool(pool):
+        """Discard a broken pool so the next _get_pool() call starts a new one"""
+        with OCRService._pool_lock:
+            # Another thread may already have replaced it
+            if OCRService._pool is pool:
+                OCRService._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+    
+    @staticmethod
+    def _pool_size():
+        """Number of page-extraction processes"""
+        return OCR_MAX_PROCESSES or os.cpu_count() or 1
+    
     @staticmethod
     def is_ocr_available():
         """Check if OCR tools are available"""
-        try:
-            # Check if tesseract is available
-            pytesseract.get_tesseract_version()
-            return True
-        except:
-            return False
-
+        if OCRService._ocr_available is None:
+            try:
+                # Check if tesseract is available
+                pytesseract.get_tesseract_version()
+                OCRService._ocr_available = True
+            except:
+                OCRService._ocr_available = False
+        return OCRService._ocr_available
@@ -0,0 +1,202 @@
+"""
+S-Corp Salary Optimizer - Salary/Distribution Split
+
+Finds the salary that minimizes federal tax for a fixed total S-Corp income,
+using the same model as TaxCalculator.calculate_federal_tax: ordinary brackets
+on salary after QBI, LTCG rates on distributions stacked above salary, QBI on
+distributions, and FICA on salary.
+
+Total tax is piecewise linear in salary, so its minimum lies on a breakpoint.
+Instead of scanning salaries, the optimizer enumerates:
+- Structural kinks in salary: standard deduction, SS wage base, Medicare
+  surtax threshold, QBI $400 minimum band edges, QBI = salary-taxable crossover
+- Within each structural piece (where taxable amounts are affine in salary):
+  salaries where salary-taxable crosses a bracket floor or LTCG threshold, where
+  total taxable income crosses an LTCG threshold, and where ordinary tax equals
+  the Child Tax Credit
+All candidates are then priced in one batch call.
+
+State tax is computed on total income, so it does not depend on the split and
+is not part of the search.
+"""
+
+from services.tax_calculator import TaxCalculator
+import numpy as np
+
+
+class SCorpOptimizerService:
+    """Service for finding the tax-minimizing S-Corp salary/distribution split"""
+
+    # Salaries are reported in cents; discontinuities are probed one cent away
+    CENT = 0.01
+
+    @staticmethod
+    def _solve_crossings(salary_start, salary_end, value_start, value_end, targets):
+        """
+        Find salaries where an affine value crosses any target on [salary_start, salary_end].
+
+        Returns:
+            list: Salaries at which the value equals a target
+        """
+        if value_start == value_end:
+            return []
+
+        low, high = min(value_start, value_end), max(value_start, value_end)
+        slope = (salary_end - salary_start) / (value_end - value_start)
+
+        return [
+            salary_start + (target - value_start) * slope
+            for target in targets
+            if low < target < high
+        ]
+
+    @staticmethod
+    def _credit_breakeven(schedule, child_tax_credit):
+        """
+        Taxable income at which ordinary tax equals the Child Tax Credit.
+
+        Returns:
+            float or None: Taxable income, or None if no credit or it is never reached
+        """
+        if child_tax_credit <= 0:
+            return None
+
+        for index in range(len(schedule.floors)):
+            rate = schedule.rates[index]
+            bracket_tax = (schedule.ceilings[index] - schedule.floors[index]) * rate
+            if rate > 0 and schedule.base_taxes[index] + bracket_tax >= child_tax_credit:
+                return schedule.floors[index] + (child_tax_credit - schedule.base_taxes[index]) / rate
+
+        return None
+
+    @staticmethod
+    def find_breakpoints(total_income, filing_status='single', tax_year=2026, dependents=0, min_salary=0.0):
+        """
+        Enumerate candidate salaries where total tax can change slope.
+
+        Args:
+            total_income: Total S-Corp income (salary + distributions)
+            filing_status: Filing status
+            tax_year: Tax year
+            dependents: Number of dependents (Child Tax Credit)
+            min_salary: Lowest salary to consider (reasonable compensation floor)
+
+        Returns:
+            numpy.ndarray: Sorted unique candidate salaries in cents
+        """
+        schedule = TaxCalculator.get_tax_schedule('federal', None, filing_status, tax_year)
+        standard_deduction = schedule.standard_deduction
+        cent = SCorpOptimizerService.CENT
+
+        salary_min = max(0.0, float(min_salary))
+        salary_max = float(total_income)
+
+        # Structural kinks: outside these, taxable amounts are affine in salary
+        structural = [
+            salary_min,
+            salary_max,
+            standard_deduction,
+            TaxCalculator.SOCIAL_SECURITY_WAGE_BASE,
+            TaxCalculator.get_medicare_surtax_threshold(filing_status),
+            # QBI $400 minimum applies while 1,000 <= distributions < 2,000
+            salary_max - 2000,
+            salary_max - 1000,
+            salary_max - 1000 + cent,
+            # QBI deduction equals salary above the standard deduction
+            (standard_deduction + 0.20 * salary_max) / 1.20,
+            standard_deduction + 400,
+        ]
+        structural = np.unique(np.round(np.clip(structural, salary_min, salary_max), 2))
+
+        salary_taxable, distributions_taxable = TaxCalculator.split_s_corp_taxable_income_batch(
+            structural, salary_max - structural, standard_deduction, tax_year
+        )
+        total_taxable = salary_taxable + distributions_taxable
+
+        ltcg_thresholds = [
+            bracket['threshold']
+            for bracket in TaxCalculator.get_long_term_capital_gains_brackets(filing_status, tax_year)
+            if bracket['threshold'] not in (0, float('inf'))
+        ]
+        salary_targets = list(schedule.floors) + ltcg_thresholds
+        credit_breakeven = SCorpOptimizerService._credit_breakeven(
+            schedule, TaxCalculator.calculate_child_tax_credit(dependents, tax_year)
+        )
+        if credit_breakeven is not None:
+            salary_targets.append(credit_breakeven)
+
+        candidates = list(structural)
+        for i in range(len(structural) - 1):
+            candidates += SCorpOptimizerService._solve_crossings(
+                structural[i], structural[i + 1],
+                salary_taxable[i], salary_taxable[i + 1], salary_targets
+            )
+            candidates += SCorpOptimizerService._solve_crossings(
+                structural[i], structural[i + 1],
+                total_taxable[i], total_taxable[i + 1], ltcg_thresholds
+            )
+
+        return np.unique(np.round(np.clip(candidates, salary_min, salary_max), 2))
+
+    @staticmethod
+    def optimize_salary(total_income, filing_status='single', tax_year=2026, dependents=0,
+                        income_source='s_corp', min_salary=0.0):
+        """
+        Find the salary that minimizes federal tax for a fixed total S-Corp income.
+
+        Ties go to the highest salary, which is the safer position on reasonable
+        compensation.
+
+        Args:
+            total_income: Total S-Corp income (salary + distributions)
+            filing_status: Filing status
+            tax_year: Tax year
+            dependents: Number of dependents (Child Tax Credit)
+            income_source: 'llc_s_corp' or 's_corp'
+            min_salary: Lowest salary to consider (reasonable compensation floor)
+
+        Returns:
+            dict: {
+                'salary', 'distributions', 'total_tax': optimal split and its tax,
+                'federal': full calculate_federal_tax result at the optimum,
+                'curve': list of {'salary', 'total_tax'} at every breakpoint evaluated
+            }
+        """
+        if total_income <= 0:
+            raise ValueError('Total S-Corp income must be greater than 0')
+        if min_salary > total_income:
+            raise ValueError('Minimum salary cannot exceed total S-Corp income')
+
+        salaries = SCorpOptimizerService.find_breakpoints(
+            total_income, filing_status, tax_year, dependents, min_salary
+        )
+
+        split = np.zeros(len(salaries), dtype=[('salary', float), ('distributions', float)])
+        split['salary'] = salaries
+        split['distributions'] = np.round(total_income - salaries, 2)
+
+        batch = TaxCalculator.calculate_federal_tax_batch(
+            split, filing_status, tax_year, income_source=income_source, dependents=dependents
+        )
+        total_tax = batch['total_tax']
+
+        # Highest salary among the minima
+        best = len(total_tax) - 1 - int(np.argmin(total_tax[::-1]))
+        salary = float(split['salary'][best])
+        distributions = float(split['distributions'][best])
+
+        federal = TaxCalculator.calculate_federal_tax(
+            salary + distributions, filing_status, dependents, tax_year,
+            income_source=income_source, salary=salary, distributions=distributions
+        )
+
+        return {
+            'salary': salary,
+            'distributions': distributions,
+            'total_tax': federal['total_tax'],
+            'federal': federal,
+            'curve': [
+                {'salary': float(s), 'total_tax': float(t)}
+                for s, t in zip(split['salary'], total_tax)
+            ]
+        }
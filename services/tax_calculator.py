@@ -1,5 +1,8 @@
 from models import TaxBracket, StandardDeduction
+from services.tax_schedule_cache import TaxScheduleCache, CompiledSchedule
 from decimal import Decimal, ROUND_HALF_UP
+from bisect import bisect_left
+import numpy as np
 
 class TaxCalculator:
     """Service for calculating federal and state tax liability"""
@@ -7,6 +10,33 @@ class TaxCalculator:
     # Dependent exemption amount (2026)
     DEPENDENT_EXEMPTION = 0  # Note: Personal exemptions were suspended, but dependents may affect other credits
     
+    # Payroll tax constants (2026 estimates; wage base adjusted from 2024's $168,600)
+    SOCIAL_SECURITY_WAGE_BASE = 175000
+    SOCIAL_SECURITY_RATE = 0.062  # 6.2% employee + 6.2% employer = 12.4% total
+    MEDICARE_RATE = 0.0145  # 1.45% employee + 1.45% employer = 2.9% total
+    MEDICARE_SURTAX_RATE = 0.009  # 0.9% additional Medicare surtax
+    MEDICARE_SURTAX_THRESHOLD_SINGLE = 200000
+    MEDICARE_SURTAX_THRESHOLD_MARRIED = 250000
+    
+    # Self-employment tax constants
+    SE_TAXABLE_FRACTION = 0.9235  # SE tax applies to 92.35% of net income
+    SE_SOCIAL_SECURITY_RATE = 0.124  # 12.4%
+    SE_MEDICARE_RATE = 0.029  # 2.9%
+    SE_EMPLOYER_PORTION_RATE = 0.0765  # 7.65% (deductible)
+    
+    # States with no income tax
+    NO_INCOME_TAX_STATES = ['AK', 'FL', 'NV', 'NH', 'SD', 'TN', 'TX', 'WA', 'WY']
+    
+    # State surtaxes on taxable income by tax year: {year: {state_code: (threshold, rate)}}
+    STATE_SURTAXES = {
+        2026: {
+            # California: 1% Behavioral Health Services Tax on taxable income over $1,000,000
+            'CA': (1000000, 0.01),
+            # Massachusetts: Additional surtaxes (if any documented)
+            # Note: MA surtax details would need to be added based on reference file
+        }
+    }
+    
     @staticmethod
     def convert_income_to_annual(amount, frequency):
         """
@@ -47,19 +77,8 @@ class TaxCalculator:
         Returns:
             float: Standard deduction amount, or 0 if not found
         """
-        query = StandardDeduction.query.filter_by(
-            tax_type=tax_type,
-            filing_status=filing_status,
-            tax_year=tax_year
-        )
-        
-        if tax_type == 'state' and state_code:
-            query = query.filter_by(state_code=state_code)
-        elif tax_type == 'federal':
-            query = query.filter_by(state_code=None)
-        
-        deduction = query.first()
-        return deduction.deduction_amount if deduction else 0.0
+        schedule = TaxScheduleCache.get_schedule(tax_type, state_code, filing_status, tax_year)
+        return schedule.standard_deduction
     
     @staticmethod
     def calculate_taxable_income(gross_income, standard_deduction, qbi_deduction=0.0):
@@ -108,13 +127,35 @@ class TaxCalculator:
         return brackets
     
     @staticmethod
-    def calculate_tax_by_brackets(taxable_income, brackets):
+    def get_tax_schedule(tax_type='federal', state_code=None, filing_status='single', tax_year=2026):
+        """
+        Retrieve the compiled (cached) tax schedule for given parameters.
+        
+        Args:
+            tax_type: 'federal' or 'state'
+            state_code: 2-letter state code (None for federal)
+            filing_status: Filing status
+            tax_year: Tax year
+        
+        Returns:
+            CompiledSchedule: Bracket floors, ceilings, rates, cumulative base taxes
+                              and standard deduction
+        """
+        return TaxScheduleCache.get_schedule(tax_type, state_code, filing_status, tax_year)
+    
+    @staticmethod
+    def calculate_tax_by_brackets(taxable_income, brackets, include_breakdown=True):
         """
         Calculate tax liability using progressive tax brackets.
         
+        The top bracket is found by bisection over the bracket floors and the tax
+        below it is read from the cumulative base-tax table, so the cost does not
+        grow with the number of brackets unless a breakdown is requested.
+        
         Args:
             taxable_income: Taxable income amount
-            brackets: List of TaxBracket objects, sorted by bracket_min
+            brackets: CompiledSchedule, or list of TaxBracket objects sorted by bracket_min
+            include_breakdown: If False, skip building 'bracket_breakdown' (returned empty)
         
         Returns:
             dict: {
@@ -123,56 +164,54 @@ class TaxCalculator:
                 'marginal_rate': highest applicable tax rate
             }
         """
-        if not brackets or taxable_income <= 0:
+        if not isinstance(brackets, CompiledSchedule):
+            brackets = TaxScheduleCache.compile_schedule(
+                [(b.bracket_min, b.bracket_max, b.tax_rate) for b in brackets or []]
+            )
+        
+        if not brackets.floors or taxable_income <= 0:
             return {
                 'total_tax': 0.0,
                 'bracket_breakdown': [],
                 'marginal_rate': 0.0
             }
         
-        total_tax = 0.0
-        bracket_breakdown = []
-        marginal_rate = 0.0
+        # Highest bracket whose floor the income has passed
+        top_index = bisect_left(brackets.floors, taxable_income) - 1
         
-        remaining_income = taxable_income
+        if top_index < 0:
+            return {
+                'total_tax': 0.0,
+                'bracket_breakdown': [],
+                'marginal_rate': 0.0
+            }
         
-        for bracket in brackets:
-            bracket_min = bracket.bracket_min
-            bracket_max = bracket.bracket_max if bracket.bracket_max else float('inf')
-            tax_rate = bracket.tax_rate
-            
-            if taxable_income <= bracket_min:
-                # Income hasn't reached this bracket yet
-                break
-            
-            # Calculate taxable amount in this bracket
-            bracket_income = min(remaining_income, bracket_max - bracket_min) if bracket_max else remaining_income
+        # Tax owed below the bracket floor comes from the cumulative base-tax table
+        top_floor = brackets.floors[top_index]
+        top_income = min(taxable_income, brackets.ceilings[top_index]) - top_floor
+        total_tax = brackets.base_taxes[top_index] + top_income * brackets.rates[top_index]
+        
+        bracket_breakdown = []
+        for index in range(top_index + 1 if include_breakdown else 0):
+            bracket_min = brackets.floors[index]
+            bracket_max = brackets.ceilings[index]
+            tax_rate = brackets.rates[index]
+            bracket_income = min(taxable_income, bracket_max) - bracket_min
             
             if bracket_income > 0:
-                bracket_tax = bracket_income * tax_rate
-                total_tax += bracket_tax
-                marginal_rate = tax_rate
-                
-                # Convert Infinity to None for JSON serialization
-                bracket_max_serializable = None if bracket_max == float('inf') else bracket_max
-                
                 bracket_breakdown.append({
                     'bracket_min': bracket_min,
-                    'bracket_max': bracket_max_serializable,
+                    # Convert Infinity to None for JSON serialization
+                    'bracket_max': None if bracket_max == float('inf') else bracket_max,
                     'tax_rate': tax_rate,
                     'taxable_in_bracket': bracket_income,
-                    'tax_in_bracket': bracket_tax
+                    'tax_in_bracket': bracket_income * tax_rate
                 })
-                
-                remaining_income -= bracket_income
-                
-                if remaining_income <= 0:
-                    break
         
         return {
             'total_tax': round(total_tax, 2),
             'bracket_breakdown': bracket_breakdown,
-            'marginal_rate': marginal_rate
+            'marginal_rate': brackets.rates[top_index]
         }
     
     @staticmethod
@@ -189,26 +228,16 @@ class TaxCalculator:
         Returns:
             dict: FICA tax breakdown
         """
-        # 2026 estimated wage base (adjust from 2024's $168,600)
-        SOCIAL_SECURITY_WAGE_BASE = 175000
-        SOCIAL_SECURITY_RATE = 0.062  # 6.2% employee + 6.2% employer = 12.4% total
-        MEDICARE_RATE = 0.0145  # 1.45% employee + 1.45% employer = 2.9% total
-        MEDICARE_SURTAX_RATE = 0.009  # 0.9% additional Medicare surtax
-        
-        # Medicare surtax thresholds (2026 estimates)
-        MEDICARE_SURTAX_THRESHOLD_SINGLE = 200000
-        MEDICARE_SURTAX_THRESHOLD_MARRIED = 250000
-        
         # Social Security tax (capped at wage base)
-        ss_taxable = min(salary, SOCIAL_SECURITY_WAGE_BASE)
-        social_security_tax = ss_taxable * SOCIAL_SECURITY_RATE
+        ss_taxable = min(salary, TaxCalculator.SOCIAL_SECURITY_WAGE_BASE)
+        social_security_tax = ss_taxable * TaxCalculator.SOCIAL_SECURITY_RATE
         
         # Medicare tax (on all salary)
-        medicare_tax = salary * MEDICARE_RATE
+        medicare_tax = salary * TaxCalculator.MEDICARE_RATE
         
         # Medicare surtax (on income above threshold)
-        surtax_threshold = MEDICARE_SURTAX_THRESHOLD_MARRIED if filing_status == 'married_joint' else MEDICARE_SURTAX_THRESHOLD_SINGLE
-        medicare_surtax = max(0, (salary - surtax_threshold) * MEDICARE_SURTAX_RATE) if salary > surtax_threshold else 0.0
+        surtax_threshold = TaxCalculator.get_medicare_surtax_threshold(filing_status)
+        medicare_surtax = max(0, (salary - surtax_threshold) * TaxCalculator.MEDICARE_SURTAX_RATE) if salary > surtax_threshold else 0.0
         
         total_fica = social_security_tax + medicare_tax + medicare_surtax
         
@@ -220,6 +249,21 @@ class TaxCalculator:
             'fica_rate': 0.153  # 15.3% base rate
         }
     
+    @staticmethod
+    def get_medicare_surtax_threshold(filing_status='single'):
+        """
+        Get the Additional Medicare Tax wage threshold for a filing status.
+        
+        Args:
+            filing_status: Filing status
+        
+        Returns:
+            float: Wage threshold above which the 0.9% surtax applies
+        """
+        if filing_status == 'married_joint':
+            return TaxCalculator.MEDICARE_SURTAX_THRESHOLD_MARRIED
+        return TaxCalculator.MEDICARE_SURTAX_THRESHOLD_SINGLE
+    
     @staticmethod
     def calculate_self_employment_tax(net_income, tax_year=2026):
         """
@@ -234,26 +278,23 @@ class TaxCalculator:
         Returns:
             dict: Self-employment tax breakdown
         """
-        # 2026 estimated wage base
-        SOCIAL_SECURITY_WAGE_BASE = 175000
-        SE_TAX_RATE = 0.153  # 15.3% total (12.4% SS + 2.9% Medicare)
-        EMPLOYER_PORTION_RATE = 0.0765  # 7.65% (deductible)
+        wage_base = TaxCalculator.SOCIAL_SECURITY_WAGE_BASE
         
         # SE tax is calculated on 92.35% of net income (after deduction)
-        se_taxable_income = net_income * 0.9235
+        se_taxable_income = net_income * TaxCalculator.SE_TAXABLE_FRACTION
         
         # Social Security portion (capped at wage base)
-        ss_taxable = min(se_taxable_income, SOCIAL_SECURITY_WAGE_BASE)
-        social_security_se_tax = ss_taxable * 0.124  # 12.4%
+        ss_taxable = min(se_taxable_income, wage_base)
+        social_security_se_tax = ss_taxable * TaxCalculator.SE_SOCIAL_SECURITY_RATE
         
         # Medicare portion (on all SE taxable income)
-        medicare_se_tax = se_taxable_income * 0.029  # 2.9%
+        medicare_se_tax = se_taxable_income * TaxCalculator.SE_MEDICARE_RATE
         
         # Total SE tax
         total_se_tax = social_security_se_tax + medicare_se_tax
         
         # Employer portion deduction (7.65% of SE taxable income, up to wage base)
-        employer_portion_deduction = min(se_taxable_income, SOCIAL_SECURITY_WAGE_BASE) * EMPLOYER_PORTION_RATE
+        employer_portion_deduction = min(se_taxable_income, wage_base) * TaxCalculator.SE_EMPLOYER_PORTION_RATE
         
         # Net SE tax after deduction
         net_se_tax = total_se_tax - employer_portion_deduction
@@ -555,7 +596,7 @@ class TaxCalculator:
                 income, standard_deduction
             )
             
-            brackets = TaxCalculator.get_tax_brackets(
+            brackets = TaxCalculator.get_tax_schedule(
                 'federal', None, filing_status, tax_year
             )
             
@@ -608,7 +649,7 @@ class TaxCalculator:
                 income, standard_deduction, qbi_deduction
             )
             
-            brackets = TaxCalculator.get_tax_brackets(
+            brackets = TaxCalculator.get_tax_schedule(
                 'federal', None, filing_status, tax_year
             )
             
@@ -681,7 +722,7 @@ class TaxCalculator:
             total_taxable_income = salary_taxable + distributions_taxable
             
             # Calculate ordinary income tax on salary portion (after QBI deduction)
-            brackets = TaxCalculator.get_tax_brackets(
+            brackets = TaxCalculator.get_tax_schedule(
                 'federal', None, filing_status, tax_year
             )
             ordinary_income_tax_result = TaxCalculator.calculate_tax_by_brackets(salary_taxable, brackets)
@@ -738,7 +779,7 @@ class TaxCalculator:
                 income, standard_deduction
             )
             
-            brackets = TaxCalculator.get_tax_brackets(
+            brackets = TaxCalculator.get_tax_schedule(
                 'federal', None, filing_status, tax_year
             )
             
@@ -771,7 +812,214 @@ class TaxCalculator:
             }
     
     @staticmethod
-    def calculate_state_tax(income, filing_status='single', dependents=0, state_code=None, tax_year=2026):
+    def calculate_tax_by_brackets_batch(taxable_incomes, schedule):
+        """
+        Vectorized calculate_tax_by_brackets over an array of taxable incomes.
+        
+        Args:
+            taxable_incomes: NumPy array of taxable income amounts
+            schedule: CompiledSchedule
+        
+        Returns:
+            tuple: (total_tax array rounded to cents, marginal_rate array as decimals)
+        """
+        taxable_incomes = np.asarray(taxable_incomes, dtype=float)
+        
+        if not schedule.floors:
+            zeros = np.zeros_like(taxable_incomes)
+            return zeros, zeros.copy()
+        
+        floors = np.asarray(schedule.floors)
+        ceilings = np.asarray(schedule.ceilings)
+        rates = np.asarray(schedule.rates)
+        base_taxes = np.asarray(schedule.base_taxes)
+        
+        # side='left' matches bisect_left in the scalar path
+        top_index = np.searchsorted(floors, taxable_incomes, side='left') - 1
+        in_brackets = (top_index >= 0) & (taxable_incomes > 0)
+        top_index = np.clip(top_index, 0, None)
+        
+        top_income = np.minimum(taxable_incomes, ceilings[top_index]) - floors[top_index]
+        total_tax = np.where(in_brackets, base_taxes[top_index] + top_income * rates[top_index], 0.0)
+        marginal_rate = np.where(in_brackets, rates[top_index], 0.0)
+        
+        return np.round(total_tax, 2), marginal_rate
+    
+    @staticmethod
+    def _calculate_qbi_deduction_batch(qbi_amounts, taxable_incomes_before_qbi, tax_year=2026):
+        """Vectorized calculate_qbi_deduction returning deduction amounts only"""
+        deduction = np.minimum(qbi_amounts * 0.20, taxable_incomes_before_qbi * 0.20)
+        
+        # Minimum deduction: $400 if QBI >= $1,000 (2026 change)
+        if tax_year == 2026:
+            deduction = np.where(qbi_amounts >= 1000.0, np.maximum(deduction, 400.0), deduction)
+        
+        return np.where(qbi_amounts > 0, np.round(deduction, 2), 0.0)
+    
+    @staticmethod
+    def _calculate_fica_tax_batch(salaries, filing_status='single'):
+        """Vectorized calculate_fica_tax returning total FICA only"""
+        social_security_tax = np.minimum(salaries, TaxCalculator.SOCIAL_SECURITY_WAGE_BASE) * TaxCalculator.SOCIAL_SECURITY_RATE
+        medicare_tax = salaries * TaxCalculator.MEDICARE_RATE
+        
+        surtax_threshold = TaxCalculator.get_medicare_surtax_threshold(filing_status)
+        medicare_surtax = np.maximum(0.0, (salaries - surtax_threshold) * TaxCalculator.MEDICARE_SURTAX_RATE)
+        
+        return np.round(social_security_tax + medicare_tax + medicare_surtax, 2)
+    
+    @staticmethod
+    def _calculate_self_employment_tax_batch(net_incomes):
+        """Vectorized calculate_self_employment_tax returning net SE tax only"""
+        wage_base = TaxCalculator.SOCIAL_SECURITY_WAGE_BASE
+        se_taxable_income = net_incomes * TaxCalculator.SE_TAXABLE_FRACTION
+        
+        capped = np.minimum(se_taxable_income, wage_base)
+        total_se_tax = capped * TaxCalculator.SE_SOCIAL_SECURITY_RATE + se_taxable_income * TaxCalculator.SE_MEDICARE_RATE
+        employer_portion_deduction = capped * TaxCalculator.SE_EMPLOYER_PORTION_RATE
+        
+        return np.round(total_se_tax - employer_portion_deduction, 2)
+    
+    @staticmethod
+    def _calculate_long_term_capital_gains_tax_batch(capital_gains, ordinary_incomes_taxable, filing_status='single', tax_year=2026):
+        """Vectorized calculate_long_term_capital_gains_tax returning total tax only"""
+        brackets = sorted(
+            TaxCalculator.get_long_term_capital_gains_brackets(filing_status, tax_year),
+            key=lambda x: x['threshold']
+        )
+        total_taxable = ordinary_incomes_taxable + capital_gains
+        
+        # Gains stack on top of ordinary income; each band taxes the overlap
+        total_tax = np.zeros_like(capital_gains)
+        for i in range(len(brackets) - 1):
+            band_start = np.maximum(brackets[i]['threshold'], ordinary_incomes_taxable)
+            band_end = np.minimum(brackets[i + 1]['threshold'], total_taxable)
+            total_tax += np.maximum(0.0, band_end - band_start) * brackets[i]['rate']
+        
+        return np.where(capital_gains > 0, np.round(total_tax, 2), 0.0)
+    
+    @staticmethod
+    def split_s_corp_taxable_income_batch(salaries, distributions, standard_deduction, tax_year=2026):
+        """
+        Vectorized S-Corp taxable income split, as in the scalar S-Corp branch.
+        
+        Args:
+            salaries: NumPy array of salaries
+            distributions: NumPy array of distributions
+            standard_deduction: Federal standard deduction amount
+            tax_year: Tax year
+        
+        Returns:
+            tuple: (salary_taxable array after QBI, distributions_taxable array)
+        """
+        salary_taxable_before_qbi = np.maximum(0.0, salaries - standard_deduction)
+        qbi_deduction = TaxCalculator._calculate_qbi_deduction_batch(
+            distributions, salary_taxable_before_qbi + distributions, tax_year
+        )
+        salary_taxable = np.maximum(0.0, salary_taxable_before_qbi - qbi_deduction)
+        
+        # Standard deduction left over after salary applies to distributions
+        remaining_deduction = np.maximum(0.0, standard_deduction - salaries)
+        distributions_taxable = np.maximum(0.0, distributions - remaining_deduction)
+        
+        return salary_taxable, distributions_taxable
+    
+    @staticmethod
+    def calculate_federal_tax_batch(incomes, filing_status='single', tax_year=2026,
+                                    income_source='w2', dependents=0):
+        """
+        Vectorized calculate_federal_tax over many incomes for one filing status.
+        
+        Mirrors the scalar w2, llc and S-Corp branches (including rounding at the
+        same steps) so each element agrees with calculate_federal_tax to within a
+        cent (NumPy and Python can round half-cent ties differently).
+        
+        Args:
+            incomes: NumPy array of annual gross incomes (w2/llc), or a structured
+                     array with 'salary' and 'distributions' fields (S-Corp types)
+            filing_status: Filing status
+            tax_year: Tax year
+            income_source: 'w2', 'llc', 'llc_s_corp', 's_corp'
+            dependents: Number of dependents (Child Tax Credit)
+        
+        Returns:
+            dict: Arrays keyed by 'gross_income', 'taxable_income', 'income_tax',
+                  'fica_tax', 'se_tax', 'total_tax', 'effective_tax_rate',
+                  'marginal_tax_rate' (rates in percent)
+        """
+        incomes = np.asarray(incomes)
+        is_structured = incomes.dtype.names is not None
+        
+        schedule = TaxCalculator.get_tax_schedule('federal', None, filing_status, tax_year)
+        standard_deduction = schedule.standard_deduction
+        child_tax_credit = TaxCalculator.calculate_child_tax_credit(dependents, tax_year)
+        
+        if income_source in ['llc_s_corp', 's_corp']:
+            if not is_structured or not {'salary', 'distributions'} <= set(incomes.dtype.names):
+                raise ValueError("S-Corp batch requires a structured array with 'salary' and 'distributions' fields")
+            
+            salaries = incomes['salary'].astype(float)
+            distributions = incomes['distributions'].astype(float)
+            gross_income = salaries + distributions
+            
+            salary_taxable, distributions_taxable = TaxCalculator.split_s_corp_taxable_income_batch(
+                salaries, distributions, standard_deduction, tax_year
+            )
+            taxable_income = salary_taxable + distributions_taxable
+            
+            income_tax_before_credit, marginal_rate = TaxCalculator.calculate_tax_by_brackets_batch(
+                salary_taxable, schedule
+            )
+            capital_gains_tax = TaxCalculator._calculate_long_term_capital_gains_tax_batch(
+                distributions_taxable, salary_taxable, filing_status, tax_year
+            )
+            fica_tax = TaxCalculator._calculate_fica_tax_batch(salaries, filing_status)
+            se_tax = np.zeros_like(gross_income)
+        else:
+            if is_structured:
+                raise ValueError("Structured income arrays are only supported for S-Corp income sources")
+            
+            gross_income = incomes.astype(float)
+            taxable_income = np.maximum(0.0, gross_income - standard_deduction)
+            
+            if income_source == 'llc':
+                # For LLC, entire income is QBI
+                qbi_deduction = TaxCalculator._calculate_qbi_deduction_batch(
+                    gross_income, taxable_income, tax_year
+                )
+                taxable_income = np.maximum(0.0, gross_income - standard_deduction - qbi_deduction)
+                se_tax = TaxCalculator._calculate_self_employment_tax_batch(gross_income)
+            else:
+                # W2 and unknown sources: no FICA/SE taxes
+                se_tax = np.zeros_like(gross_income)
+            
+            income_tax_before_credit, marginal_rate = TaxCalculator.calculate_tax_by_brackets_batch(
+                taxable_income, schedule
+            )
+            capital_gains_tax = np.zeros_like(gross_income)
+            fica_tax = np.zeros_like(gross_income)
+        
+        # Apply Child Tax Credit (non-refundable, cannot go below $0)
+        income_tax = np.round(np.maximum(0.0, income_tax_before_credit - child_tax_credit), 2)
+        
+        total_tax = np.round(income_tax + capital_gains_tax + fica_tax + se_tax, 2)
+        
+        safe_income = np.where(gross_income > 0, gross_income, 1.0)
+        effective_rate = np.where(gross_income > 0, total_tax / safe_income * 100, 0.0)
+        
+        return {
+            'gross_income': gross_income,
+            'taxable_income': taxable_income,
+            'income_tax': income_tax,
+            'fica_tax': fica_tax,
+            'se_tax': se_tax,
+            'total_tax': total_tax,
+            'effective_tax_rate': np.round(effective_rate, 2),
+            'marginal_tax_rate': np.round(marginal_rate * 100, 2)
+        }
+    
+    @staticmethod
+    def calculate_state_tax(income, filing_status='single', dependents=0, state_code=None, tax_year=2026,
+                            include_breakdown=True):
         """
         Calculate state tax liability.
         Note: Child Tax Credit only applies to federal taxes, not state taxes.
@@ -782,6 +1030,7 @@ class TaxCalculator:
             dependents: Number of dependents (not used in state tax calculation)
             state_code: 2-letter state code
             tax_year: Tax year
+            include_breakdown: Whether to build the per-bracket breakdown
         
         Returns:
             dict: Detailed tax calculation results, or None if state has no income tax
@@ -790,9 +1039,7 @@ class TaxCalculator:
             return None
         
         # Check if state has income tax (simplified - would check database)
-        # States with no income tax: AK, FL, NV, NH, SD, TN, TX, WA, WY
-        no_income_tax_states = ['AK', 'FL', 'NV', 'NH', 'SD', 'TN', 'TX', 'WA', 'WY']
-        if state_code.upper() in no_income_tax_states:
+        if state_code.upper() in TaxCalculator.NO_INCOME_TAX_STATES:
             return {
                 'gross_income': income,
                 'standard_deduction': 0.0,
@@ -815,11 +1062,11 @@ class TaxCalculator:
         )
         
         # Get tax brackets
-        brackets = TaxCalculator.get_tax_brackets(
+        brackets = TaxCalculator.get_tax_schedule(
             'state', state_code, filing_status, tax_year
         )
         
-        if not brackets:
+        if not brackets.floors:
             # No brackets found - return zero tax
             return {
                 'gross_income': income,
@@ -832,7 +1079,7 @@ class TaxCalculator:
             }
         
         # Calculate tax
-        tax_result = TaxCalculator.calculate_tax_by_brackets(taxable_income, brackets)
+        tax_result = TaxCalculator.calculate_tax_by_brackets(taxable_income, brackets, include_breakdown)
         
         # Calculate surtax (if applicable)
         surtax_amount = TaxCalculator._calculate_state_surtax(
@@ -860,6 +1107,95 @@ class TaxCalculator:
         
         return result
     
+    @staticmethod
+    def calculate_multi_state_tax(income, filing_status='single', dependents=0, state_codes=None, tax_year=2026,
+                                  include_breakdown=True):
+        """
+        Calculate state tax liability for several states at one income.
+        
+        All state schedules for the year are loaded together by TaxScheduleCache,
+        so evaluating many states costs one load plus dictionary lookups.
+        
+        Args:
+            income: Annual gross income
+            filing_status: Filing status
+            dependents: Number of dependents (not used in state tax calculation)
+            state_codes: List of 2-letter state codes
+            tax_year: Tax year
+            include_breakdown: Whether to build per-bracket breakdowns
+        
+        Returns:
+            list: calculate_state_tax results in state_codes order, skipping empty codes
+        """
+        results = []
+        
+        for state_code in state_codes or []:
+            state_result = TaxCalculator.calculate_state_tax(
+                income, filing_status, dependents, state_code, tax_year, include_breakdown
+            )
+            if state_result:
+                results.append(state_result)
+        
+        return results
+    
+    @staticmethod
+    def calculate_state_tax_batch(incomes, filing_status='single', state_code=None, tax_year=2026):
+        """
+        Vectorized calculate_state_tax over many incomes for one state.
+        
+        Args:
+            incomes: NumPy array of annual gross incomes
+            filing_status: Filing status
+            state_code: 2-letter state code
+            tax_year: Tax year
+        
+        Returns:
+            dict: Arrays keyed by 'taxable_income', 'total_tax', 'effective_tax_rate',
+                  'marginal_tax_rate' (rates in percent), or None if no state_code
+        """
+        if not state_code:
+            return None
+        
+        incomes = np.asarray(incomes, dtype=float)
+        zeros = np.zeros_like(incomes)
+        
+        if state_code.upper() in TaxCalculator.NO_INCOME_TAX_STATES:
+            return {
+                'taxable_income': zeros,
+                'total_tax': zeros.copy(),
+                'effective_tax_rate': zeros.copy(),
+                'marginal_tax_rate': zeros.copy()
+            }
+        
+        schedule = TaxCalculator.get_tax_schedule('state', state_code, filing_status, tax_year)
+        taxable_income = np.maximum(0.0, incomes - schedule.standard_deduction)
+        
+        if not schedule.floors:
+            return {
+                'taxable_income': taxable_income,
+                'total_tax': zeros,
+                'effective_tax_rate': zeros.copy(),
+                'marginal_tax_rate': zeros.copy()
+            }
+        
+        base_tax, marginal_rate = TaxCalculator.calculate_tax_by_brackets_batch(taxable_income, schedule)
+        
+        surtax = TaxCalculator.STATE_SURTAXES.get(tax_year, {}).get(state_code.upper())
+        if surtax:
+            threshold, rate = surtax
+            base_tax = base_tax + np.round(np.maximum(0.0, taxable_income - threshold) * rate, 2)
+        
+        total_tax = np.round(base_tax, 2)
+        safe_income = np.where(incomes > 0, incomes, 1.0)
+        effective_rate = np.where(incomes > 0, total_tax / safe_income * 100, 0.0)
+        
+        return {
+            'taxable_income': taxable_income,
+            'total_tax': total_tax,
+            'effective_tax_rate': np.round(effective_rate, 2),
+            'marginal_tax_rate': np.round(marginal_rate * 100, 2)
+        }
+    
     @staticmethod
     def _calculate_state_surtax(state_code, taxable_income, filing_status='single', tax_year=2026):
         """
@@ -874,18 +1210,11 @@ class TaxCalculator:
         Returns:
             float: Surtax amount
         """
-        state_code = state_code.upper()
+        surtax = TaxCalculator.STATE_SURTAXES.get(tax_year, {}).get(state_code.upper())
         
-        if tax_year == 2026:
-            # California: 1% Behavioral Health Services Tax on taxable income over $1,000,000
-            if state_code == 'CA':
-                if taxable_income > 1000000:
-                    surtax = (taxable_income - 1000000) * 0.01
-                    return round(surtax, 2)
-            
-            # Massachusetts: Additional surtaxes (if any documented)
-            # Note: MA surtax details would need to be added based on reference file
-            
-            # Other states with surtaxes can be added here as needed
+        if surtax:
+            threshold, rate = surtax
+            if taxable_income > threshold:
+                return round((taxable_income - threshold) * rate, 2)
         
         return 0.0
\ No newline at end of file
@@ -2,6 +2,7 @@ from models import db, TaxBracket, StandardDeduction
 from datetime import datetime
 import os
 from services.state_tax_parser import get_state_tax_data
+from services.tax_schedule_cache import TaxScheduleCache
 
 class TaxDataService:
     """Service for fetching and populating tax tables from online sources"""
@@ -331,3 +332,6 @@ class TaxDataService:
             db.session.add(deduction)
         
         db.session.commit()
+        
+        # Drop compiled schedules for this year so the calculator reloads them
+        TaxScheduleCache.invalidate(tax_year)
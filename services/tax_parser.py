@@ -1,5 +1,174 @@
 import re
+import time
+from bisect import bisect_right
+from sqlalchemy import func, insert
 from models import db, ExtractedData
+from services.form_field_registry import FORM_FIELD_MATCHERS, compile_keyword_scanner
+
+
+class FormRegion:
+    """
+    The segments of a document's text that belong to one detected form.
+    
+    Field matchers search only inside the segments, and record where each value
+    was found so callers can show the page and character span it came from.
+    """
+    
+    def __init__(self, text, segments, page_starts=None, scan_text=None):
+        """
+        Args:
+            text: Full OCR text
+            segments: List of (start, end) offsets of the form's region in text
+            page_starts: Optional list of (offset, page_number) where each page begins
+            scan_text: Lower-cased text from TaxParser.fold_case(), computed if not given
+        """
+        self.text = text
+        self.segments = segments
+        self.page_starts = page_starts or []
+        self._page_offsets = [offset for offset, _ in self.page_starts]
+        self.scan_text = scan_text if scan_text is not None else TaxParser.fold_case(text)
+        # Lower-casing can change length for rare Unicode; then scan_text is text itself
+        self.scan_text_folded = self.scan_text is not text
+        self.provenance = {}
+    
+    def search(self, pattern):
+        """First case-insensitive match of pattern within the region, or None"""
+        compiled = re.compile(pattern, re.IGNORECASE)
+        for start, end in self.segments:
+            match = compiled.search(self.text, start, end)
+            if match:
+                return match
+        return None
+    
+    def locate(self, start, end):
+        """
+        Provenance for a character span of the text.
+        
+        Returns:
+            dict: {'page': page number or None, 'start': start, 'end': end}
+        """
+        page = None
+        index = bisect_right(self._page_offsets, start) - 1
+        if index >= 0:
+            page = self.page_starts[index][1]
+        return {'page': page, 'start': start, 'end': end}
+
+
+class StreamingFormParser:
+    """
+    Incremental form detection and field extraction, one page at a time.
+    
+    Each page is scanned on its own, continuing the forms that were open at the
+    end of the previous page, so only the current page's text is held. Values and
+    provenance offsets match extract_forms_with_provenance() on the joined text,
+    except that a label and its amount must be on the same page, and pages before
+    the first detected form are not read into it.
+    
+    A field is final once its first registry label matches (no later page can
+    replace it); fields matched by a fallback label stay provisional until finish().
+    """
+    
+    def __init__(self):
+        self.parsed_data = {}
+        self.provenance = {}
+        # {form_type: {field_name: index of the label that matched}}
+        self._label_index = {}
+        self._open_forms = None
+        self._offset = 0
+        self._page_count = 0
+    
+    def feed(self, page):
+        """
+        Detect forms and extract fields from the next page.
+        
+        Args:
+            page: Page dict with 'page_number' and 'text'
+        
+        Returns:
+            list: (form_type, field_name, value) for fields that became final on this page
+        """
+        text = page['text']
+        if not text:
+            return []
+        
+        # Offset of this page in the text join_pages() would build
+        if self._page_count:
+            self._offset += 2
+        page_offset = self._offset
+        self._offset += len(text)
+        self._page_count += 1
+        
+        form_offsets = TaxParser.detect_form_offsets(text)
+        regions, self._open_forms = TaxParser.split_form_regions(text, form_offsets, self._open_forms)
+        scan_text = TaxParser.fold_case(text)
+        
+        final = []
+        for form_type, segments in regions.items():
+            matcher = FORM_FIELD_MATCHERS.get(form_type)
+            
+            if form_type not in self.parsed_data:
+                presence_fields = matcher.presence_fields if matcher else {}
+                self.parsed_data[form_type] = dict(presence_fields)
+                self.provenance[form_type] = {}
+                self._label_index[form_type] = {}
+                final.extend((form_type, field_name, value) for field_name, value in presence_fields.items())
+            
+            if not matcher or not segments:
+                continue
+            
+            form_data = self.parsed_data[form_type]
+            label_index = self._label_index[form_type]
+            region = FormRegion(text, segments, scan_text=scan_text)
+            
+            for field_name, (index, match) in matcher.match(region, label_index).items():
+                start, end = match.span(1)
+                form_data[field_name] = TaxParser._clean_amount(match.group(1))
+                self.provenance[form_type][field_name] = {
+                    'page': page['page_number'],
+                    'start': page_offset + start,
+                    'end': page_offset + end
+                }
+                label_index[field_name] = index
+                if index == 0:
+                    final.append((form_type, field_name, form_data[field_name]))
+        
+        return final
+    
+    def finish(self):
+        """
+        Finalize after the last page, ordering results like extract_forms_with_provenance().
+        
+        Returns:
+            list: (form_type, field_name, value) for fields still provisional, now final
+        """
+        final = [
+            (form_type, field_name, self.parsed_data[form_type][field_name])
+            for form_type, label_index in self._label_index.items()
+            for field_name, index in label_index.items()
+            if index > 0
+        ]
+        
+        form_order = [form_type for form_type in TaxParser.FORM_PATTERNS if form_type in self.parsed_data]
+        self.parsed_data = {
+            form_type: self._ordered_fields(form_type, self.parsed_data[form_type])
+            for form_type in form_order
+        }
+        self.provenance = {
+            form_type: self._ordered_fields(form_type, self.provenance[form_type])
+            for form_type in form_order
+        }
+        
+        return final
+    
+    @staticmethod
+    def _ordered_fields(form_type, values):
+        """Reorder a form's fields to presence fields first, then registry order"""
+        matcher = FORM_FIELD_MATCHERS.get(form_type)
+        if not matcher:
+            return values
+        order = list(matcher.presence_fields) + [field_name for field_name, _ in matcher.fields]
+        return {field_name: values[field_name] for field_name in order if field_name in values}
+
 
 class TaxParser:
     """Service for parsing OCR text and extracting tax form data"""
@@ -33,6 +202,22 @@ class TaxParser:
         'K-1': r'Schedule\s+K-1|Partner\'s\s+Share\s+of\s+Income',
     }
     
+    # A mention followed by ", line N" on the same line points at a line of another
+    # form ("Schedule 1, line 10"); a header's next row may itself start with "Line N"
+    FORM_REFERENCE_SUFFIX = re.compile(r'[ \t]*,?[ \t]*line\b', re.IGNORECASE)
+    
+    # Streaming writes (parse_pages): rows per batch, and longest wait before a batch is written
+    DEFAULT_BATCH_SIZE = 50
+    DEFAULT_FLUSH_SECONDS = 2.0
+    
+    # Single-pass detector compiled from FORM_PATTERNS: each top-level alternative
+    # starts with a literal keyword ('Form', 'Schedule', 'W-2', 'Itemized', ...)
+    FORM_SCANNER, FORM_CANDIDATES = compile_keyword_scanner(
+        (form_type, alternative)
+        for form_type, pattern in FORM_PATTERNS.items()
+        for alternative in pattern.split('|')
+    )
+    
     @staticmethod
     def parse_text(text, document_id, client_id):
         """
@@ -46,457 +231,378 @@ class TaxParser:
         Returns:
             dict: Parsed data by form type
         """
-        if not text:
-            return {}
-        
-        # Detect forms in the text
-        detected_forms = TaxParser._detect_forms(text)
+        parsed_data = TaxParser.extract_forms(text)
         
-        parsed_data = {}
-        
-        for form_type in detected_forms:
-            form_data = TaxParser._extract_form_data(text, form_type)
-            parsed_data[form_type] = form_data
-            
-            # Store in database
-            TaxParser._store_extracted_data(document_id, client_id, form_type, form_data)
+        # Store in database
+        TaxParser.store_extracted_data(document_id, client_id, parsed_data)
         
         return parsed_data
     
     @staticmethod
-    def _detect_forms(text):
-        """Detect which tax forms are present in the text"""
-        detected = []
-        text_upper = text.upper()
+    def extract_forms(text, page_starts=None):
+        """
+        Detect forms in OCR text and extract their fields without touching the database
         
-        for form_type, pattern in TaxParser.FORM_PATTERNS.items():
-            if re.search(pattern, text_upper, re.IGNORECASE):
-                detected.append(form_type)
+        Args:
+            text: OCR extracted text
+            page_starts: Optional list of (offset, page_number) where each page begins in text
         
-        return detected
+        Returns:
+            dict: Parsed data by form type
+        """
+        parsed_data, _ = TaxParser.extract_forms_with_provenance(text, page_starts)
+        return parsed_data
     
     @staticmethod
-    def _extract_form_data(text, form_type):
-        """Extract data fields for a specific form type"""
-        form_data = {}
-        
-        if form_type == '1040':
-            form_data = TaxParser._extract_1040_data(text)
-        elif form_type == 'W-2':
-            form_data = TaxParser._extract_w2_data(text)
-        elif form_type.startswith('1099'):
-            form_data = TaxParser._extract_1099_data(text, form_type)
-        elif form_type == 'Schedule A':
-            form_data = TaxParser._extract_schedule_a_data(text)
-        elif form_type == 'Schedule C':
-            form_data = TaxParser._extract_schedule_c_data(text)
-        elif form_type == 'Schedule SE':
-            form_data = TaxParser._extract_schedule_se_data(text)
-        elif form_type == 'Schedule 1':
-            form_data = TaxParser._extract_schedule_1_data(text)
-        elif form_type == 'Schedule E':
-            form_data = TaxParser._extract_schedule_e_data(text)
-        elif form_type == 'Schedule D':
-            form_data = TaxParser._extract_schedule_d_data(text)
-        elif form_type == 'Form 4562':
-            form_data = TaxParser._extract_form_4562_data(text)
-        elif form_type == 'Form 8829':
-            form_data = TaxParser._extract_form_8829_data(text)
-        elif form_type == 'Form 8995':
-            form_data = TaxParser._extract_form_8995_data(text)
-        elif form_type == 'Form 8995-A':
-            form_data = TaxParser._extract_form_8995a_data(text)
-        elif form_type == 'Form 6765':
-            form_data = TaxParser._extract_form_6765_data(text)
-        elif form_type == 'Form 5498':
-            form_data = TaxParser._extract_form_5498_data(text)
-        elif form_type == 'Form 8949':
-            form_data = TaxParser._extract_form_8949_data(text)
-        elif form_type == 'Form 8994':
-            form_data = TaxParser._extract_form_8994_data(text)
-        elif form_type == 'Form 1095-A':
-            form_data = TaxParser._extract_form_1095a_data(text)
-        elif form_type == 'K-1':
-            form_data = TaxParser._extract_k1_data(text)
+    def extract_forms_with_provenance(text, page_starts=None):
+        """
+        Detect forms and extract each form's fields from its own region of the text.
         
-        return form_data
-    
-    @staticmethod
-    def _extract_1040_data(text):
-        """Extract key fields from Form 1040"""
-        data = {}
-        
-        # Extract AGI (Adjusted Gross Income)
-        agi_patterns = [
-            r'Adjusted\s+Gross\s+Income[:\s]+(\$?\d{1,3}(?:,\d{3})*(?:\.\d{2})?)',
-            r'AGI[:\s]+(\$?\d{1,3}(?:,\d{3})*(?:\.\d{2})?)',
-            r'Line\s+11[:\s]+(\$?\d{1,3}(?:,\d{3})*(?:\.\d{2})?)'
-        ]
-        for pattern in agi_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                data['agi'] = TaxParser._clean_amount(match.group(1))
-                break
+        Args:
+            text: OCR extracted text
+            page_starts: Optional list of (offset, page_number) where each page begins in text,
+                         as returned by join_pages()
         
-        # Extract Taxable Income
-        taxable_patterns = [
-            r'Taxable\s+Income[:\s]+(\$?\d{1,3}(?:,\d{3})*(?:\.\d{2})?)',
-            r'Line\s+15[:\s]+(\$?\d{1,3}(?:,\d{3})*(?:\.\d{2})?)'
-        ]
-        for pattern in taxable_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                data['taxable_income'] = TaxParser._clean_amount(match.group(1))
-                break
+        Returns:
+            tuple: (parsed_data, provenance) where parsed_data is {form_type: {field: value}}
+                   and provenance is {form_type: {field: {'page', 'start', 'end'}}} giving the
+                   page (None if unknown) and character span of each value in text
+        """
+        if not text:
+            return {}, {}
         
-        # Extract Total Tax
-        tax_patterns = [
-            r'Total\s+Tax[:\s]+(\$?\d{1,3}(?:,\d{3})*(?:\.\d{2})?)',
-            r'Line\s+16[:\s]+(\$?\d{1,3}(?:,\d{3})*(?:\.\d{2})?)'
-        ]
-        for pattern in tax_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                data['total_tax'] = TaxParser._clean_amount(match.group(1))
-                break
+        # Detect forms in the text
+        form_offsets = TaxParser.detect_form_offsets(text)
+        regions = TaxParser.build_form_regions(text, form_offsets)
+        scan_text = TaxParser.fold_case(text)
         
-        # Extract Wages
-        wages_patterns = [
-            r'Wages[,\s]+salaries[,\s]+tips[,\s]+etc\.?[:\s]+(\$?\d{1,3}(?:,\d{3})*(?:\.\d{2})?)',
-            r'Line\s+1[:\s]+(\$?\d{1,3}(?:,\d{3})*(?:\.\d{2})?)'
-        ]
-        for pattern in wages_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                data['wages'] = TaxParser._clean_amount(match.group(1))
-                break
+        parsed_data = {}
+        provenance = {}
+        
+        for form_type, segments in regions.items():
+            region = FormRegion(text, segments, page_starts, scan_text)
+            parsed_data[form_type] = TaxParser._extract_form_data(region, form_type)
+            provenance[form_type] = region.provenance
         
-        return data
+        return parsed_data, provenance
     
     @staticmethod
-    def _extract_w2_data(text):
-        """Extract key fields from W-2"""
-        data = {}
-        
-        # Extract Wages
-        wages_match = re.search(r'Box\s+1[:\s]+(\$?\d{1,3}(?:,\d{3})*(?:\.\d{2})?)', text, re.IGNORECASE)
-        if wages_match:
-            data['wages'] = TaxParser._clean_amount(wages_match.group(1))
+    def join_pages(pages):
+        """
+        Join page texts the way OCRService.extract_text does, recording where each page starts.
         
-        # Extract Federal Tax Withheld
-        fed_tax_match = re.search(r'Box\s+2[:\s]+(\$?\d{1,3}(?:,\d{3})*(?:\.\d{2})?)', text, re.IGNORECASE)
-        if fed_tax_match:
-            data['federal_tax_withheld'] = TaxParser._clean_amount(fed_tax_match.group(1))
+        Args:
+            pages: Page dicts with 'page_number' and 'text', as returned by OCRService.extract_pages()
         
-        return data
+        Returns:
+            tuple: (text, page_starts) where page_starts is a list of (offset, page_number)
+        """
+        parts = []
+        page_starts = []
+        offset = 0
+        
+        for page in pages:
+            if not page['text']:
+                continue
+            if parts:
+                offset += 2  # '\n\n' separator
+            page_starts.append((offset, page['page_number']))
+            parts.append(page['text'])
+            offset += len(page['text'])
+        
+        return '\n\n'.join(parts), page_starts
     
     @staticmethod
-    def _extract_1099_data(text, form_type):
-        """Extract key fields from 1099 forms"""
-        data = {}
-        
-        # Extract income amount
-        income_patterns = [
-            r'Interest\s+income[:\s]+(\$?\d{1,3}(?:,\d{3})*(?:\.\d{2})?)',
-            r'Dividends[:\s]+(\$?\d{1,3}(?:,\d{3})*(?:\.\d{2})?)',
-            r'Nonemployee\s+compensation[:\s]+(\$?\d{1,3}(?:,\d{3})*(?:\.\d{2})?)'
-        ]
-        for pattern in income_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                data['income'] = TaxParser._clean_amount(match.group(1))
-                break
+    def build_form_regions(text, form_offsets):
+        """
+        Split the text into per-form regions using detection offsets.
         
-        return data
-    
-    @staticmethod
-    def _extract_schedule_a_data(text):
-        """Extract key fields from Schedule A"""
-        data = {}
+        Each form header (see _is_form_header) starts a segment that runs until the
+        header of a different form; text before the first header belongs to that
+        form. References inside a form's body, such as "Attach Schedule D" or
+        "from Schedule 1, line 10", do not start a segment, so the referenced form
+        is detected but gets no text of its own. If no header comes before the
+        first mention, that mention is taken as the header. Forms headed at the
+        same position (e.g. Form 8995 and Form 8995-A) share the segment. A single
+        detected form gets the whole text.
         
-        # Extract Medical Expenses
-        med_match = re.search(r'Medical\s+and\s+dental\s+expenses[:\s]+(\$?\d{1,3}(?:,\d{3})*(?:\.\d{2})?)', text, re.IGNORECASE)
-        if med_match:
-            data['medical_expenses'] = TaxParser._clean_amount(med_match.group(1))
+        Args:
+            text: OCR extracted text
+            form_offsets: {form_type: [(start, end), ...]} from detect_form_offsets()
         
-        # Extract Charitable Contributions
-        charity_match = re.search(r'Gifts\s+to\s+charity[:\s]+(\$?\d{1,3}(?:,\d{3})*(?:\.\d{2})?)', text, re.IGNORECASE)
-        if charity_match:
-            data['charitable_contributions'] = TaxParser._clean_amount(charity_match.group(1))
+        Returns:
+            dict: {form_type: [(start, end), ...]} merged segments, in form_offsets order
+        
+        Example (a 1040 that references other forms keeps its own lines):
+            >>> text = ("Form 1040 U.S. Individual Income Tax Return\\n"
+            ...         "7 Capital gain or (loss). Attach Schedule D 0\\n"
+            ...         "8 Additional income from Schedule 1, line 10 7,000\\n"
+            ...         "Adjusted gross income 92,000\\n")
+            >>> TaxParser.extract_forms(text)
+            {'1040': {'agi': 92000.0}, 'Schedule D': {}, 'Schedule 1': {}}
+        
+        A header whose next row starts with "Line N" still opens its form:
+            >>> TaxParser.extract_forms(text + "Schedule C\\nLine 30: 5,000\\nNet profit: 40,000\\n")
+            {'1040': {'agi': 92000.0}, 'Schedule C': {'net_profit': 40000.0, 'home_office_deduction': 5000.0}, 'Schedule D': {}, 'Schedule 1': {}}
+        """
+        if len(form_offsets) <= 1:
+            return {form_type: [(0, len(text))] for form_type in form_offsets}
         
-        return data
-    
-    @staticmethod
-    def _extract_schedule_c_data(text):
-        """Extract key fields from Schedule C"""
-        data = {}
-        
-        # Extract Gross Receipts
-        receipts_match = re.search(r'Gross\s+receipts[:\s]+(\$?\d{1,3}(?:,\d{3})*(?:\.\d{2})?)', text, re.IGNORECASE)
-        if receipts_match:
-            data['gross_receipts'] = TaxParser._clean_amount(receipts_match.group(1))
-        
-        # Extract Net Profit
-        profit_match = re.search(r'Net\s+profit[:\s]+(\$?\d{1,3}(?:,\d{3})*(?:\.\d{2})?)', text, re.IGNORECASE)
-        if profit_match:
-            data['net_profit'] = TaxParser._clean_amount(profit_match.group(1))
-        
-        # Extract R&D expenses (line 27a)
-        rd_match = re.search(r'Line\s+27a[:\s]+(\$?\d{1,3}(?:,\d{3})*(?:\.\d{2})?)', text, re.IGNORECASE)
-        if rd_match:
-            data['rd_expenses'] = TaxParser._clean_amount(rd_match.group(1))
-        
-        # Extract simplified home office (line 18)
-        home_office_simple_match = re.search(r'Line\s+18[:\s]+(\$?\d{1,3}(?:,\d{3})*(?:\.\d{2})?)', text, re.IGNORECASE)
-        if home_office_simple_match:
-            data['simplified_home_office'] = TaxParser._clean_amount(home_office_simple_match.group(1))
-        
-        # Extract home office deduction (line 30)
-        home_office_match = re.search(r'Line\s+30[:\s]+(\$?\d{1,3}(?:,\d{3})*(?:\.\d{2})?)', text, re.IGNORECASE)
-        if home_office_match:
-            data['home_office_deduction'] = TaxParser._clean_amount(home_office_match.group(1))
-        
-        return data
+        regions, _ = TaxParser.split_form_regions(text, form_offsets)
+        return regions
     
     @staticmethod
-    def _extract_schedule_se_data(text):
-        """Extract key fields from Schedule SE"""
-        data = {}
+    def split_form_regions(text, form_offsets, leading_forms=None):
+        """
+        Split text into per-form segments, continuing from forms already being read.
         
-        # Extract total SE tax (line 6)
-        se_tax_match = re.search(r'Line\s+6[:\s]+(\$?\d{1,3}(?:,\d{3})*(?:\.\d{2})?)', text, re.IGNORECASE)
-        if se_tax_match:
-            data['total_se_tax'] = TaxParser._clean_amount(se_tax_match.group(1))
+        Like build_form_regions(), but text before the first mention belongs to
+        leading_forms when given (e.g. the forms open at the end of the previous
+        page), and the forms open at the end of the text are returned as well.
         
-        # Extract net earnings
-        net_earnings_match = re.search(r'Net\s+earnings[:\s]+(\$?\d{1,3}(?:,\d{3})*(?:\.\d{2})?)', text, re.IGNORECASE)
-        if net_earnings_match:
-            data['net_earnings'] = TaxParser._clean_amount(net_earnings_match.group(1))
+        Args:
+            text: OCR text, e.g. one page
+            form_offsets: {form_type: [(start, end), ...]} from detect_form_offsets()
+            leading_forms: Optional set of form types the text continues
         
-        return data
-    
-    @staticmethod
-    def _extract_schedule_1_data(text):
-        """Extract key fields from Schedule 1"""
-        data = {}
-        
-        # Extract SE tax deduction (line 15)
-        se_ded_match = re.search(r'Line\s+15[:\s]+(\$?\d{1,3}(?:,\d{3})*(?:\.\d{2})?)', text, re.IGNORECASE)
-        if se_ded_match:
-            data['se_tax_deduction'] = TaxParser._clean_amount(se_ded_match.group(1))
-        
-        # Extract retirement contributions (line 16)
-        retirement_match = re.search(r'Line\s+16[:\s]+(\$?\d{1,3}(?:,\d{3})*(?:\.\d{2})?)', text, re.IGNORECASE)
-        if retirement_match:
-            data['retirement_contributions'] = TaxParser._clean_amount(retirement_match.group(1))
-        
-        # Extract SE health insurance (line 17)
-        health_match = re.search(r'Line\s+17[:\s]+(\$?\d{1,3}(?:,\d{3})*(?:\.\d{2})?)', text, re.IGNORECASE)
-        if health_match:
-            data['se_health_insurance'] = TaxParser._clean_amount(health_match.group(1))
-        
-        return data
+        Returns:
+            tuple: (regions, trailing_forms) where regions is {form_type: [(start, end), ...]}
+                   and trailing_forms is the set of form types open at the end, or None
+        """
+        # Forms mentioned at each position, and whether any of them is a header there
+        mentions = {}
+        headers = set()
+        for form_type, spans in form_offsets.items():
+            for start, end in spans:
+                mentions.setdefault(start, set()).add(form_type)
+                if start not in headers and TaxParser._is_form_header(text, start, end):
+                    headers.add(start)
+        
+        regions = {form_type: [] for form_type in form_offsets}
+        current_forms = leading_forms or None
+        segment_start = 0
+        for form_type in current_forms or ():
+            regions.setdefault(form_type, [])
+        
+        for position in sorted(mentions):
+            # Body references never switch forms; the first mention does if nothing is open yet
+            if position not in headers and current_forms is not None:
+                continue
+            if mentions[position] == current_forms:
+                continue
+            if current_forms is not None:
+                for form_type in current_forms:
+                    TaxParser._add_segment(regions[form_type], segment_start, position)
+                segment_start = position
+            current_forms = mentions[position]
+        
+        for form_type in current_forms or ():
+            TaxParser._add_segment(regions[form_type], segment_start, len(text))
+        
+        return regions, current_forms
     
     @staticmethod
-    def _extract_schedule_e_data(text):
-        """Extract key fields from Schedule E"""
-        data = {}
-        
-        # Extract net income
-        net_income_match = re.search(r'Net\s+income[:\s]+(\$?\d{1,3}(?:,\d{3})*(?:\.\d{2})?)', text, re.IGNORECASE)
-        if net_income_match:
-            data['net_income'] = TaxParser._clean_amount(net_income_match.group(1))
+    def _is_form_header(text, start, end):
+        """
+        Whether a form mention at text[start:end] is the form's header rather than a reference.
         
-        return data
+        A header starts its line (or the page) and is not followed by ", line N"
+        on the same line.
+        """
+        line_start = text.rfind('\n', 0, start) + 1
+        if text[line_start:start].strip():
+            return False
+        return not TaxParser.FORM_REFERENCE_SUFFIX.match(text, end)
     
     @staticmethod
-    def _extract_schedule_d_data(text):
-        """Extract key fields from Schedule D"""
-        data = {}
-        
-        # Extract capital gains
-        gains_match = re.search(r'Capital\s+gains[:\s]+(\$?\d{1,3}(?:,\d{3})*(?:\.\d{2})?)', text, re.IGNORECASE)
-        if gains_match:
-            data['capital_gains'] = TaxParser._clean_amount(gains_match.group(1))
-        
-        return data
+    def _add_segment(segments, start, end):
+        """Append a segment, merging it with the previous one if they touch"""
+        if start >= end:
+            return
+        if segments and segments[-1][1] == start:
+            segments[-1] = (segments[-1][0], end)
+        else:
+            segments.append((start, end))
     
     @staticmethod
-    def _extract_form_4562_data(text):
-        """Extract key fields from Form 4562"""
-        data = {}
-        
-        # Extract Section 179 deduction (line 12)
-        section_179_match = re.search(r'Line\s+12[:\s]+(\$?\d{1,3}(?:,\d{3})*(?:\.\d{2})?)', text, re.IGNORECASE)
-        if section_179_match:
-            data['section_179_deduction'] = TaxParser._clean_amount(section_179_match.group(1))
-        
-        # Extract total cost of 179 property (line 2)
-        cost_179_match = re.search(r'Line\s+2[:\s]+(\$?\d{1,3}(?:,\d{3})*(?:\.\d{2})?)', text, re.IGNORECASE)
-        if cost_179_match:
-            data['total_cost_179_property'] = TaxParser._clean_amount(cost_179_match.group(1))
-        
-        # Extract business income limitation (line 11)
-        limitation_match = re.search(r'Line\s+11[:\s]+(\$?\d{1,3}(?:,\d{3})*(?:\.\d{2})?)', text, re.IGNORECASE)
-        if limitation_match:
-            data['business_income_limitation'] = TaxParser._clean_amount(limitation_match.group(1))
-        
-        # Extract bonus depreciation (line 14)
-        bonus_match = re.search(r'Line\s+14[:\s]+(\$?\d{1,3}(?:,\d{3})*(?:\.\d{2})?)', text, re.IGNORECASE)
-        if bonus_match:
-            data['bonus_depreciation'] = TaxParser._clean_amount(bonus_match.group(1))
-        
-        # Extract MACRS depreciation
-        macrs_match = re.search(r'MACRS\s+depreciation[:\s]+(\$?\d{1,3}(?:,\d{3})*(?:\.\d{2})?)', text, re.IGNORECASE)
-        if macrs_match:
-            data['macrs_depreciation'] = TaxParser._clean_amount(macrs_match.group(1))
-        
-        # Extract R&D amortization
-        rd_amort_match = re.search(r'R&D\s+amortization[:\s]+(\$?\d{1,3}(?:,\d{3})*(?:\.\d{2})?)', text, re.IGNORECASE)
-        if rd_amort_match:
-            data['rd_amortization'] = TaxParser._clean_amount(rd_amort_match.group(1))
-        
-        return data
+    def _detect_forms(text):
+        """Detect which tax forms are present in the text"""
+        return list(TaxParser.detect_form_offsets(text))
     
     @staticmethod
-    def _extract_form_8829_data(text):
-        """Extract key fields from Form 8829"""
-        data = {}
-        
-        # Extract home office deduction (line 36)
-        deduction_match = re.search(r'Line\s+36[:\s]+(\$?\d{1,3}(?:,\d{3})*(?:\.\d{2})?)', text, re.IGNORECASE)
-        if deduction_match:
-            data['home_office_deduction'] = TaxParser._clean_amount(deduction_match.group(1))
-        
-        # Extract tentative deduction (line 35)
-        tentative_match = re.search(r'Line\s+35[:\s]+(\$?\d{1,3}(?:,\d{3})*(?:\.\d{2})?)', text, re.IGNORECASE)
-        if tentative_match:
-            data['tentative_deduction'] = TaxParser._clean_amount(tentative_match.group(1))
+    def fold_case(text):
+        """
+        Lower-cased copy of text for keyword scanning.
         
-        return data
+        Returns text itself if lower-casing would change its length (rare Unicode),
+        since offsets into the copy must match offsets into text.
+        """
+        scan_text = text.lower()
+        return scan_text if len(scan_text) == len(text) else text
     
     @staticmethod
-    def _extract_form_8995_data(text):
-        """Extract key fields from Form 8995"""
-        data = {}
+    def detect_form_offsets(text):
+        """
+        Detect forms and every place they are mentioned, in a single pass over the text.
         
-        # Extract QBI deduction
-        qbi_match = re.search(r'QBI\s+deduction[:\s]+(\$?\d{1,3}(?:,\d{3})*(?:\.\d{2})?)', text, re.IGNORECASE)
-        if qbi_match:
-            data['qbi_deduction'] = TaxParser._clean_amount(qbi_match.group(1))
+        Args:
+            text: OCR extracted text
         
-        return data
+        Returns:
+            dict: {form_type: [(start, end), ...]} in FORM_PATTERNS order, spans sorted by start
+        """
+        scan_text = TaxParser.fold_case(text)
+        scanner = TaxParser.FORM_SCANNER
+        if scan_text is text:
+            scanner = re.compile(scanner.pattern, re.IGNORECASE)
+        
+        spans = {}
+        for keyword_match in scanner.finditer(scan_text):
+            position = keyword_match.start()
+            for form_type, alternative in TaxParser.FORM_CANDIDATES[keyword_match.group(1).lower()]:
+                form_match = alternative.match(scan_text, position)
+                if form_match:
+                    spans.setdefault(form_type, []).append(form_match.span())
+        
+        return {
+            form_type: spans[form_type]
+            for form_type in TaxParser.FORM_PATTERNS
+            if form_type in spans
+        }
     
     @staticmethod
-    def _extract_form_8995a_data(text):
-        """Extract key fields from Form 8995-A"""
-        data = {}
+    def _extract_form_data(region, form_type):
+        """
+        Extract data fields for a specific form type from its FormRegion
+        
+        Fields come from the compiled FIELD_REGISTRY in services/form_field_registry.py.
+        Each value's location is recorded in region.provenance.
+        """
+        matcher = FORM_FIELD_MATCHERS.get(form_type)
+        if not matcher:
+            return {}
+        
+        form_data = dict(matcher.presence_fields)
         
-        # Extract QBI deduction
-        qbi_match = re.search(r'QBI\s+deduction[:\s]+(\$?\d{1,3}(?:,\d{3})*(?:\.\d{2})?)', text, re.IGNORECASE)
-        if qbi_match:
-            data['qbi_deduction'] = TaxParser._clean_amount(qbi_match.group(1))
+        for field_name, (_, match) in matcher.match(region).items():
+            form_data[field_name] = TaxParser._clean_amount(match.group(1))
+            region.provenance[field_name] = region.locate(*match.span(1))
         
-        return data
+        return form_data
     
     @staticmethod
-    def _extract_form_6765_data(text):
-        """Extract key fields from Form 6765 (R&D Credit)"""
-        data = {}
-        # Form 6765 presence indicates R&D activities
-        data['filed'] = True
-        return data
+    def _clean_amount(amount_str):
+        """Clean and convert amount string to float"""
+        if not amount_str:
+            return None
+        # Remove $ and commas
+        cleaned = re.sub(r'[\$,\s]', '', amount_str)
+        try:
+            return float(cleaned)
+        except:
+            return None
     
     @staticmethod
-    def _extract_form_5498_data(text):
-        """Extract key fields from Form 5498"""
-        data = {}
-        
-        # Extract SEP contributions (box 8)
-        sep_match = re.search(r'Box\s+8[:\s]+(\$?\d{1,3}(?:,\d{3})*(?:\.\d{2})?)', text, re.IGNORECASE)
-        if sep_match:
-            data['sep_contributions'] = TaxParser._clean_amount(sep_match.group(1))
+    def store_extracted_data(document_id, client_id, parsed_data):
+        """
+        Store extracted data for every detected form in one bulk insert and one transaction
         
-        # Extract SIMPLE contributions (box 9)
-        simple_match = re.search(r'Box\s+9[:\s]+(\$?\d{1,3}(?:,\d{3})*(?:\.\d{2})?)', text, re.IGNORECASE)
-        if simple_match:
-            data['simple_contributions'] = TaxParser._clean_amount(simple_match.group(1))
+        Args:
+            document_id: ID of the document
+            client_id: ID of the client
+            parsed_data: Parsed data by form type, as returned by extract_forms()
         
-        return data
+        Returns:
+            int: Number of ExtractedData rows written
+        """
+        return TaxParser.store_extracted_fields(document_id, client_id, (
+            (form_type, field_name, field_value)
+            for form_type, form_data in parsed_data.items()
+            for field_name, field_value in form_data.items()
+        ))
     
     @staticmethod
-    def _extract_form_8949_data(text):
-        """Extract key fields from Form 8949"""
-        data = {}
+    def store_extracted_fields(document_id, client_id, fields):
+        """
+        Store a batch of extracted fields in one bulk insert and one transaction
         
-        # Extract QSBS exclusion (Code Q)
-        qsbs_match = re.search(r'Code\s+Q[:\s]+(\$?\d{1,3}(?:,\d{3})*(?:\.\d{2})?)', text, re.IGNORECASE)
-        if qsbs_match:
-            data['qsbs_exclusion'] = TaxParser._clean_amount(qsbs_match.group(1))
+        Args:
+            document_id: ID of the document
+            client_id: ID of the client
+            fields: Iterable of (form_type, field_name, field_value); None values are skipped
         
-        return data
-    
-    @staticmethod
-    def _extract_form_8994_data(text):
-        """Extract key fields from Form 8994 (FMLA Credit)"""
-        data = {}
+        Returns:
+            int: Number of ExtractedData rows written
+        """
+        rows = [
+            {
+                'document_id': document_id,
+                'client_id': client_id,
+                'form_type': form_type,
+                'field_name': field_name,
+                'field_value': str(field_value)
+            }
+            for form_type, field_name, field_value in fields
+            if field_value is not None
+        ]
         
-        # Extract credit amount (line 3)
-        credit_match = re.search(r'Line\s+3[:\s]+(\$?\d{1,3}(?:,\d{3})*(?:\.\d{2})?)', text, re.IGNORECASE)
-        if credit_match:
-            data['credit_amount'] = TaxParser._clean_amount(credit_match.group(1))
+        if rows:
+            try:
+                db.session.execute(insert(ExtractedData), rows)
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
         
-        return data
+        return len(rows)
     
     @staticmethod
-    def _extract_form_1095a_data(text):
-        """Extract key fields from Form 1095-A"""
-        data = {}
+    def parse_pages(pages, document_id, client_id, batch_size=None, flush_seconds=None):
+        """
+        Parse pages as they are extracted and store fields in batches (streaming parse_text())
         
-        # Extract premiums
-        premiums_match = re.search(r'Premiums[:\s]+(\$?\d{1,3}(?:,\d{3})*(?:\.\d{2})?)', text, re.IGNORECASE)
-        if premiums_match:
-            data['premiums'] = TaxParser._clean_amount(premiums_match.group(1))
+        Each final field value is queued as soon as its page is parsed; the queue is
+        written in its own transaction once it holds batch_size rows or flush_seconds
+        have passed since the last write, so the first fields can be read while later
+        pages are still being extracted. If parsing or extraction fails part way, the
+        rows already written for this run are deleted.
         
-        return data
-    
-    @staticmethod
-    def _extract_k1_data(text):
-        """Extract key fields from Schedule K-1"""
-        data = {}
+        Args:
+            pages: Iterable of page dicts, e.g. OCRService.iter_pages()
+            document_id: ID of the document
+            client_id: ID of the client
+            batch_size: Rows per write (default DEFAULT_BATCH_SIZE)
+            flush_seconds: Longest time a final field waits to be written (default DEFAULT_FLUSH_SECONDS)
         
-        # Extract QBI amount (box 20 code Z for 1065, box 17 code V for 1120-S)
-        qbi_match = re.search(r'QBI[:\s]+(\$?\d{1,3}(?:,\d{3})*(?:\.\d{2})?)', text, re.IGNORECASE)
-        if qbi_match:
-            data['qbi_amount'] = TaxParser._clean_amount(qbi_match.group(1))
+        Returns:
+            tuple: (parsed_data, provenance, fields_written) as from extract_forms_with_provenance()
+        """
+        batch_size = batch_size or TaxParser.DEFAULT_BATCH_SIZE
+        flush_seconds = TaxParser.DEFAULT_FLUSH_SECONDS if flush_seconds is None else flush_seconds
+        
+        parser = StreamingFormParser()
+        pending = []
+        fields_written = 0
+        last_flush = time.monotonic()
+        last_existing_id = db.session.query(func.max(ExtractedData.id)).scalar() or 0
         
-        return data
-    
-    @staticmethod
-    def _clean_amount(amount_str):
-        """Clean and convert amount string to float"""
-        if not amount_str:
-            return None
-        # Remove $ and commas
-        cleaned = re.sub(r'[\$,\s]', '', amount_str)
         try:
-            return float(cleaned)
-        except:
-            return None
-    
-    @staticmethod
-    def _store_extracted_data(document_id, client_id, form_type, form_data):
-        """Store extracted data in database"""
-        for field_name, field_value in form_data.items():
-            if field_value is not None:
-                extracted = ExtractedData(
-                    document_id=document_id,
-                    client_id=client_id,
-                    form_type=form_type,
-                    field_name=field_name,
-                    field_value=str(field_value)
-                )
-                db.session.add(extracted)
-        
-        db.session.commit()
-
+            for page in pages:
+                pending.extend(parser.feed(page))
+                if pending and (len(pending) >= batch_size or time.monotonic() - last_flush >= flush_seconds):
+                    fields_written += TaxParser.store_extracted_fields(document_id, client_id, pending)
+                    pending = []
+                    last_flush = time.monotonic()
+            
+            pending.extend(parser.finish())
+            fields_written += TaxParser.store_extracted_fields(document_id, client_id, pending)
+        except Exception:
+            if fields_written:
+                ExtractedData.query.filter(
+                    ExtractedData.document_id == document_id,
+                    ExtractedData.id > last_existing_id
+                ).delete(synchronize_session=False)
+                db.session.commit()
+            raise
+        
+        return parser.parsed_data, parser.provenance, fields_written
@@ -0,0 +1,180 @@
+"""
+Tax Schedule Cache - Compiled Bracket and Deduction Tables
+
+Process-wide, read-only cache of tax schedules compiled from the tax_brackets
+and standard_deductions tables. The first lookup for a tax year loads every
+schedule for that year in two queries; later lookups are dictionary reads.
+
+Each compiled schedule holds parallel tuples of bracket floors, ceilings and
+rates plus the cumulative tax owed at each bracket floor, so the calculator
+can price any income without walking TaxBracket rows.
+
+Cache Keys:
+- (tax_type, state_code, filing_status, tax_year)
+- state_code is None for federal schedules and upper-case for state schedules
+
+Invalidation:
+- TaxDataService.populate_tax_tables() calls invalidate(tax_year) after it
+  rewrites a year, so the next lookup reloads from the database
+"""
+
+from models import db, TaxBracket, StandardDeduction
+from collections import namedtuple
+import threading
+
+
+# Immutable compiled schedule. floors/ceilings/rates/base_taxes are parallel
+# tuples sorted by floor; base_taxes[i] is the tax owed on income up to floors[i].
+CompiledSchedule = namedtuple(
+    'CompiledSchedule',
+    ['floors', 'ceilings', 'rates', 'base_taxes', 'standard_deduction']
+)
+
+EMPTY_SCHEDULE = CompiledSchedule((), (), (), (), 0.0)
+
+
+class TaxScheduleCache:
+    """Process-wide cache of compiled tax schedules keyed by tax year"""
+
+    _schedules = {}
+    _loaded_years = set()
+    _lock = threading.Lock()
+
+    @staticmethod
+    def make_key(tax_type='federal', state_code=None, filing_status='single', tax_year=2026):
+        """
+        Build a normalized cache key.
+
+        Returns:
+            tuple: (tax_type, state_code, filing_status, tax_year)
+        """
+        if tax_type == 'federal' or not state_code:
+            state_code = None
+        else:
+            state_code = state_code.upper()
+        return (tax_type, state_code, filing_status, int(tax_year))
+
+    @staticmethod
+    def compile_schedule(rows, standard_deduction=0.0):
+        """
+        Compile bracket rows into a CompiledSchedule.
+
+        Args:
+            rows: Iterable of (bracket_min, bracket_max, tax_rate) sorted by bracket_min.
+                  bracket_max of None marks the open-ended top bracket.
+            standard_deduction: Standard deduction amount for the schedule
+
+        Returns:
+            CompiledSchedule
+        """
+        floors = []
+        ceilings = []
+        rates = []
+        base_taxes = []
+        cumulative_tax = 0.0
+
+        for bracket_min, bracket_max, tax_rate in rows:
+            bracket_min = float(bracket_min)
+            bracket_max = float(bracket_max) if bracket_max else float('inf')
+            tax_rate = float(tax_rate)
+
+            floors.append(bracket_min)
+            ceilings.append(bracket_max)
+            rates.append(tax_rate)
+            base_taxes.append(cumulative_tax)
+
+            if bracket_max != float('inf'):
+                cumulative_tax += (bracket_max - bracket_min) * tax_rate
+
+        return CompiledSchedule(
+            floors=tuple(floors),
+            ceilings=tuple(ceilings),
+            rates=tuple(rates),
+            base_taxes=tuple(base_taxes),
+            standard_deduction=float(standard_deduction or 0.0)
+        )
+
+    @staticmethod
+    def get_schedule(tax_type='federal', state_code=None, filing_status='single', tax_year=2026):
+        """
+        Get the compiled schedule for the given parameters, loading the tax year on first use.
+
+        Returns:
+            CompiledSchedule: EMPTY_SCHEDULE if no brackets or deduction exist
+        """
+        key = TaxScheduleCache.make_key(tax_type, state_code, filing_status, tax_year)
+
+        if key[3] not in TaxScheduleCache._loaded_years:
+            TaxScheduleCache._load_year(key[3])
+
+        return TaxScheduleCache._schedules.get(key, EMPTY_SCHEDULE)
+
+    @staticmethod
+    def invalidate(tax_year=None):
+        """
+        Drop cached schedules so the next lookup reloads from the database.
+
+        Args:
+            tax_year: Year to drop, or None to drop every year
+        """
+        with TaxScheduleCache._lock:
+            if tax_year is None:
+                TaxScheduleCache._schedules = {}
+                TaxScheduleCache._loaded_years = set()
+                return
+
+            tax_year = int(tax_year)
+            TaxScheduleCache._schedules = {
+                key: schedule for key, schedule in TaxScheduleCache._schedules.items()
+                if key[3] != tax_year
+            }
+            TaxScheduleCache._loaded_years = TaxScheduleCache._loaded_years - {tax_year}
+
+    @staticmethod
+    def _load_year(tax_year):
+        """Load and compile every bracket and deduction schedule for a tax year"""
+        with TaxScheduleCache._lock:
+            if tax_year in TaxScheduleCache._loaded_years:
+                return
+
+            bracket_rows = db.session.query(
+                TaxBracket.tax_type,
+                TaxBracket.state_code,
+                TaxBracket.filing_status,
+                TaxBracket.bracket_min,
+                TaxBracket.bracket_max,
+                TaxBracket.tax_rate
+            ).filter(
+                TaxBracket.tax_year == tax_year
+            ).order_by(TaxBracket.bracket_min.asc()).all()
+
+            deduction_rows = db.session.query(
+                StandardDeduction.tax_type,
+                StandardDeduction.state_code,
+                StandardDeduction.filing_status,
+                StandardDeduction.deduction_amount
+            ).filter(
+                StandardDeduction.tax_year == tax_year
+            ).order_by(StandardDeduction.id.asc()).all()
+
+            brackets_by_key = {}
+            for tax_type, state_code, filing_status, bracket_min, bracket_max, tax_rate in bracket_rows:
+                key = TaxScheduleCache.make_key(tax_type, state_code, filing_status, tax_year)
+                brackets_by_key.setdefault(key, []).append((bracket_min, bracket_max, tax_rate))
+
+            deductions_by_key = {}
+            for tax_type, state_code, filing_status, deduction_amount in deduction_rows:
+                key = TaxScheduleCache.make_key(tax_type, state_code, filing_status, tax_year)
+                # Keep the first row per key, matching query.first() in the uncached lookup
+                deductions_by_key.setdefault(key, deduction_amount)
+
+            schedules = dict(TaxScheduleCache._schedules)
+            for key in set(brackets_by_key) | set(deductions_by_key):
+                schedules[key] = TaxScheduleCache.compile_schedule(
+                    brackets_by_key.get(key, []),
+                    deductions_by_key.get(key, 0.0)
+                )
+
+            # Publish a new dict so concurrent readers never see a partial year
+            TaxScheduleCache._schedules = schedules
+            TaxScheduleCache._loaded_years = TaxScheduleCache._loaded_years | {tax_year}
@@ -4,8 +4,9 @@ Implements comprehensive analysis of 10 key tax strategies based on tax-strategi
 """
 
 from decimal import Decimal
-from typing import Dict, List, Optional, Tuple
+from typing import List, Optional, Tuple
 from models import AnalysisResult
+from services.form_data import FormData
 
 
 class TaxStrategyStatus:
@@ -75,24 +76,31 @@ class TaxStrategiesService:
     }
 
     @staticmethod
-    def detect_income_types(client_id):
+    def detect_income_types(client_id, form_types=None):
         """
         Detect income types from client's extracted data based on form types present.
 
         Args:
             client_id: Client ID to check
+            form_types: Optional form types already loaded for the client (e.g. the
+                        form types of the FormData), to skip the query
 
         Returns:
             list: Income type strings (e.g., ['w2_employee', 'self_employed'])
         """
         from models import ExtractedData
         from models import db
+        from sqlalchemy import select
 
-        # Query distinct form types for this client
-        forms = db.session.query(ExtractedData.form_type).filter_by(
-            client_id=client_id
-        ).distinct().all()
-        form_types = {f[0] for f in forms if f[0]}
+        if form_types is None:
+            # Distinct form types for this client, as plain values (no ORM rows)
+            db.session.flush()
+            form_types = db.session.connection().execute(
+                select(ExtractedData.form_type).where(
+                    ExtractedData.client_id == client_id
+                ).distinct()
+            ).scalars().all()
+        form_types = {form_type for form_type in form_types if form_type}
 
         income_types = []
 
@@ -146,24 +154,26 @@ class TaxStrategiesService:
         return sorted(strategies, key=get_relevance_key)
 
     @staticmethod
-    def get_personalized_strategies(data_by_form, client):
+    def get_personalized_strategies(form_data, client):
         """
         Get strategies personalized to client's income type.
 
         Analyzes all strategies, then prioritizes by income type relevance.
 
         Args:
-            data_by_form: Dictionary of form data
+            form_data: FormData (or a {form_type: {field_name: value}} dict)
             client: Client model instance
 
         Returns:
             tuple: (strategies_list, income_types_list)
         """
+        form_data = FormData.coerce(form_data)
+
         # Detect income types
-        income_types = TaxStrategiesService.detect_income_types(client.id)
+        income_types = TaxStrategiesService.detect_income_types(client.id, form_types=form_data.keys())
 
         # Analyze all strategies
-        strategies = TaxStrategiesService.analyze_all_strategies(data_by_form, client)
+        strategies = TaxStrategiesService.analyze_all_strategies(form_data, client)
 
         # Filter/prioritize by income type
         prioritized = TaxStrategiesService.filter_strategies_by_income_type(strategies, income_types)
@@ -171,64 +181,53 @@ class TaxStrategiesService:
         return prioritized, income_types
 
     @staticmethod
-    def analyze_all_strategies(data_by_form: Dict, client) -> List[AnalysisResult]:
+    def analyze_all_strategies(form_data: FormData, client) -> List[AnalysisResult]:
         """
         Analyze all 10 tax strategies and return results
         
         Args:
-            data_by_form: Dictionary of form data organized by form type
+            form_data: FormData (or a {form_type: {field_name: value}} dict)
             client: Client model instance
             
         Returns:
             List of AnalysisResult objects
         """
+        form_data = FormData.coerce(form_data)
         strategies = []
         
         # Strategy 1: QBI Deduction
-        strategies.append(TaxStrategiesService._analyze_qbi_deduction(data_by_form, client))
+        strategies.append(TaxStrategiesService._analyze_qbi_deduction(form_data, client))
         
         # Strategy 2: Section 179 Expensing
-        strategies.append(TaxStrategiesService._analyze_section_179(data_by_form, client))
+        strategies.append(TaxStrategiesService._analyze_section_179(form_data, client))
         
         # Strategy 3: Bonus Depreciation
-        strategies.append(TaxStrategiesService._analyze_bonus_depreciation(data_by_form, client))
+        strategies.append(TaxStrategiesService._analyze_bonus_depreciation(form_data, client))
         
         # Strategy 4: Domestic R&D Expense Deduction
-        strategies.append(TaxStrategiesService._analyze_rd_deduction(data_by_form, client))
+        strategies.append(TaxStrategiesService._analyze_rd_deduction(form_data, client))
         
         # Strategy 5: Retirement Plan Contributions
-        strategies.append(TaxStrategiesService._analyze_retirement_contributions(data_by_form, client))
+        strategies.append(TaxStrategiesService._analyze_retirement_contributions(form_data, client))
         
         # Strategy 6: Self-Employment Tax Deduction
-        strategies.append(TaxStrategiesService._analyze_se_tax_deduction(data_by_form, client))
+        strategies.append(TaxStrategiesService._analyze_se_tax_deduction(form_data, client))
         
         # Strategy 7: Self-Employed Health Insurance Deduction
-        strategies.append(TaxStrategiesService._analyze_se_health_insurance(data_by_form, client))
+        strategies.append(TaxStrategiesService._analyze_se_health_insurance(form_data, client))
         
         # Strategy 8: Home Office Deduction
-        strategies.append(TaxStrategiesService._analyze_home_office(data_by_form, client))
+        strategies.append(TaxStrategiesService._analyze_home_office(form_data, client))
         
         # Strategy 9: QSBS Exclusion
-        strategies.append(TaxStrategiesService._analyze_qsbs_exclusion(data_by_form, client))
+        strategies.append(TaxStrategiesService._analyze_qsbs_exclusion(form_data, client))
         
         # Strategy 10: Paid Family and Medical Leave Credit
-        strategies.append(TaxStrategiesService._analyze_fmla_credit(data_by_form, client))
+        strategies.append(TaxStrategiesService._analyze_fmla_credit(form_data, client))
         
         # Filter out None results (not applicable)
         return [s for s in strategies if s is not None]
     
-    @staticmethod
-    def _get_numeric_value(data_dict: Dict, form_type: str, field_name: str, default: float = 0.0) -> float:
-        """Helper to get numeric value from extracted data"""
-        try:
-            if form_type in data_dict and field_name in data_dict[form_type]:
-                value = data_dict[form_type][field_name]
-                if value:
-                    return float(value)
-        except (ValueError, TypeError, KeyError):
-            pass
-        return default
-    
     @staticmethod
     def _get_filing_status(client) -> str:
         """Get filing status from client, defaulting to single"""
@@ -305,14 +304,14 @@ class TaxStrategiesService:
     
     # Strategy 1: QBI Deduction (§ 199A)
     @staticmethod
-    def _analyze_qbi_deduction(data_by_form: Dict, client) -> Optional[AnalysisResult]:
+    def _analyze_qbi_deduction(form_data: FormData, client) -> Optional[AnalysisResult]:
         """Analyze Qualified Business Income Deduction"""
         forms_analyzed = []
         
         # Check for pass-through income
-        schedule_c_profit = TaxStrategiesService._get_numeric_value(data_by_form, 'Schedule C', 'net_profit', 0)
-        schedule_e_income = TaxStrategiesService._get_numeric_value(data_by_form, 'Schedule E', 'net_income', 0)
-        k1_qbi = TaxStrategiesService._get_numeric_value(data_by_form, 'K-1', 'qbi_amount', 0)
+        schedule_c_profit = form_data.number('Schedule C', 'net_profit', 0)
+        schedule_e_income = form_data.number('Schedule E', 'net_income', 0)
+        k1_qbi = form_data.number('K-1', 'qbi_amount', 0)
         
         has_pass_through = schedule_c_profit > 0 or schedule_e_income > 0 or k1_qbi > 0
         
@@ -331,10 +330,10 @@ class TaxStrategiesService:
         forms_analyzed.extend(['Schedule C', 'Schedule E', 'K-1'])
         
         # Check if Form 8995 or 8995-A was filed
-        form_8995_filed = 'Form 8995' in data_by_form or 'Form 8995-A' in data_by_form
-        qbi_deduction = TaxStrategiesService._get_numeric_value(data_by_form, 'Form 8995', 'qbi_deduction', 0)
+        form_8995_filed = 'Form 8995' in form_data or 'Form 8995-A' in form_data
+        qbi_deduction = form_data.number('Form 8995', 'qbi_deduction', 0)
         if qbi_deduction == 0:
-            qbi_deduction = TaxStrategiesService._get_numeric_value(data_by_form, 'Form 8995-A', 'qbi_deduction', 0)
+            qbi_deduction = form_data.number('Form 8995-A', 'qbi_deduction', 0)
         
         # Calculate qualified business income
         qbi = schedule_c_profit + schedule_e_income + k1_qbi
@@ -343,7 +342,7 @@ class TaxStrategiesService:
         expected_qbi_deduction = qbi * 0.20
         
         # Get taxable income for limitation check
-        taxable_income = TaxStrategiesService._get_numeric_value(data_by_form, '1040', 'taxable_income', 0)
+        taxable_income = form_data.number('1040', 'taxable_income', 0)
         qbi_limit_by_taxable = taxable_income * 0.20 if taxable_income > 0 else 0
         
         flags = []
@@ -390,18 +389,18 @@ class TaxStrategiesService:
     
     # Strategy 2: Section 179 Expensing
     @staticmethod
-    def _analyze_section_179(data_by_form: Dict, client) -> Optional[AnalysisResult]:
+    def _analyze_section_179(form_data: FormData, client) -> Optional[AnalysisResult]:
         """Analyze Section 179 Expensing"""
         forms_analyzed = []
         
         # Check Form 4562 for Section 179
-        form_4562_part1 = 'Form 4562' in data_by_form
-        line_12_deduction = TaxStrategiesService._get_numeric_value(data_by_form, 'Form 4562', 'section_179_deduction', 0)
-        line_2_cost = TaxStrategiesService._get_numeric_value(data_by_form, 'Form 4562', 'total_cost_179_property', 0)
-        line_11_limitation = TaxStrategiesService._get_numeric_value(data_by_form, 'Form 4562', 'business_income_limitation', 0)
+        form_4562_part1 = 'Form 4562' in form_data
+        line_12_deduction = form_data.number('Form 4562', 'section_179_deduction', 0)
+        line_2_cost = form_data.number('Form 4562', 'total_cost_179_property', 0)
+        line_11_limitation = form_data.number('Form 4562', 'business_income_limitation', 0)
         
         # Check Schedule C for business property
-        schedule_c_profit = TaxStrategiesService._get_numeric_value(data_by_form, 'Schedule C', 'net_profit', 0)
+        schedule_c_profit = form_data.number('Schedule C', 'net_profit', 0)
         business_property_acquired = line_2_cost > 0 or schedule_c_profit > 0
         
         if not business_property_acquired:
@@ -441,7 +440,7 @@ class TaxStrategiesService:
         
         # Calculate benefits
         marginal_rate = TaxStrategiesService._estimate_marginal_rate(
-            TaxStrategiesService._get_numeric_value(data_by_form, '1040', 'taxable_income', 0)
+            form_data.number('1040', 'taxable_income', 0)
         )
         current_benefit = line_12_deduction * (marginal_rate / 100)
         potential_benefit = min(line_2_cost, TaxStrategiesService.SECTION_179_MAX) * (marginal_rate / 100)
@@ -464,13 +463,13 @@ class TaxStrategiesService:
     
     # Strategy 3: Bonus Depreciation
     @staticmethod
-    def _analyze_bonus_depreciation(data_by_form: Dict, client) -> Optional[AnalysisResult]:
+    def _analyze_bonus_depreciation(form_data: FormData, client) -> Optional[AnalysisResult]:
         """Analyze Bonus Depreciation (Full Expensing)"""
         forms_analyzed = []
         
         # Check Form 4562 Part II for bonus depreciation
-        line_14_bonus = TaxStrategiesService._get_numeric_value(data_by_form, 'Form 4562', 'bonus_depreciation', 0)
-        form_4562_part3 = TaxStrategiesService._get_numeric_value(data_by_form, 'Form 4562', 'macrs_depreciation', 0)
+        line_14_bonus = form_data.number('Form 4562', 'bonus_depreciation', 0)
+        form_4562_part3 = form_data.number('Form 4562', 'macrs_depreciation', 0)
         
         depreciable_property = line_14_bonus > 0 or form_4562_part3 > 0
         
@@ -505,7 +504,7 @@ class TaxStrategiesService:
                 status = TaxStrategyStatus.NOT_APPLICABLE
         
         marginal_rate = TaxStrategiesService._estimate_marginal_rate(
-            TaxStrategiesService._get_numeric_value(data_by_form, '1040', 'taxable_income', 0)
+            form_data.number('1040', 'taxable_income', 0)
         )
         current_benefit = line_14_bonus * (marginal_rate / 100)
         potential_benefit = (line_14_bonus + form_4562_part3) * (marginal_rate / 100)
@@ -528,17 +527,17 @@ class TaxStrategiesService:
     
     # Strategy 4: Domestic R&D Expense Deduction
     @staticmethod
-    def _analyze_rd_deduction(data_by_form: Dict, client) -> Optional[AnalysisResult]:
+    def _analyze_rd_deduction(form_data: FormData, client) -> Optional[AnalysisResult]:
         """Analyze Domestic R&D Expense Deduction (§ 174A)"""
         forms_analyzed = []
         
         # Check for R&D indicators
-        form_6765_filed = 'Form 6765' in data_by_form
-        rd_expenses = TaxStrategiesService._get_numeric_value(data_by_form, 'Schedule C', 'rd_expenses', 0)
-        rd_amortization = TaxStrategiesService._get_numeric_value(data_by_form, 'Form 4562', 'rd_amortization', 0)
+        form_6765_filed = 'Form 6765' in form_data
+        rd_expenses = form_data.number('Schedule C', 'rd_expenses', 0)
+        rd_amortization = form_data.number('Form 4562', 'rd_amortization', 0)
         
         # Check business type indicators (simplified)
-        schedule_c_profit = TaxStrategiesService._get_numeric_value(data_by_form, 'Schedule C', 'net_profit', 0)
+        schedule_c_profit = form_data.number('Schedule C', 'net_profit', 0)
         
         if rd_expenses == 0 and not form_6765_filed and schedule_c_profit == 0:
             return TaxStrategiesService._create_strategy_result(
@@ -578,7 +577,7 @@ class TaxStrategiesService:
             recommendations.append("Review R&D expenses for § 174A deduction eligibility")
         
         marginal_rate = TaxStrategiesService._estimate_marginal_rate(
-            TaxStrategiesService._get_numeric_value(data_by_form, '1040', 'taxable_income', 0)
+            form_data.number('1040', 'taxable_income', 0)
         )
         current_benefit = 0  # Amortization provides less benefit
         potential_benefit = rd_expenses * (marginal_rate / 100) if rd_expenses > 0 else 0
@@ -601,18 +600,18 @@ class TaxStrategiesService:
     
     # Strategy 5: Retirement Plan Contributions
     @staticmethod
-    def _analyze_retirement_contributions(data_by_form: Dict, client) -> Optional[AnalysisResult]:
+    def _analyze_retirement_contributions(form_data: FormData, client) -> Optional[AnalysisResult]:
         """Analyze Retirement Plan Contributions"""
         forms_analyzed = []
         
         # Get self-employment income
-        schedule_c_profit = TaxStrategiesService._get_numeric_value(data_by_form, 'Schedule C', 'net_profit', 0)
-        schedule_se_income = TaxStrategiesService._get_numeric_value(data_by_form, 'Schedule SE', 'net_earnings', 0)
+        schedule_c_profit = form_data.number('Schedule C', 'net_profit', 0)
+        schedule_se_income = form_data.number('Schedule SE', 'net_earnings', 0)
         
         # Get retirement contributions
-        schedule_1_line_16 = TaxStrategiesService._get_numeric_value(data_by_form, 'Schedule 1', 'retirement_contributions', 0)
-        form_5498_sep = TaxStrategiesService._get_numeric_value(data_by_form, 'Form 5498', 'sep_contributions', 0)
-        form_5498_simple = TaxStrategiesService._get_numeric_value(data_by_form, 'Form 5498', 'simple_contributions', 0)
+        schedule_1_line_16 = form_data.number('Schedule 1', 'retirement_contributions', 0)
+        form_5498_sep = form_data.number('Form 5498', 'sep_contributions', 0)
+        form_5498_simple = form_data.number('Form 5498', 'simple_contributions', 0)
         
         self_employment_income = max(schedule_c_profit, schedule_se_income)
         
@@ -660,7 +659,7 @@ class TaxStrategiesService:
             recommendations.append("Solo 401(k) allows employee + employer contributions")
         
         marginal_rate = TaxStrategiesService._estimate_marginal_rate(
-            TaxStrategiesService._get_numeric_value(data_by_form, '1040', 'taxable_income', 0)
+            form_data.number('1040', 'taxable_income', 0)
         )
         current_benefit = total_contributions * (marginal_rate / 100)
         potential_benefit = max_sep_contribution * (marginal_rate / 100)
@@ -683,16 +682,16 @@ class TaxStrategiesService:
     
     # Strategy 6: Self-Employment Tax Deduction
     @staticmethod
-    def _analyze_se_tax_deduction(data_by_form: Dict, client) -> Optional[AnalysisResult]:
+    def _analyze_se_tax_deduction(form_data: FormData, client) -> Optional[AnalysisResult]:
         """Analyze Self-Employment Tax Deduction (§ 164(f))"""
         forms_analyzed = []
         
-        schedule_se_filed = 'Schedule SE' in data_by_form
-        schedule_se_line_6 = TaxStrategiesService._get_numeric_value(data_by_form, 'Schedule SE', 'total_se_tax', 0)
-        schedule_1_line_15 = TaxStrategiesService._get_numeric_value(data_by_form, 'Schedule 1', 'se_tax_deduction', 0)
+        schedule_se_filed = 'Schedule SE' in form_data
+        schedule_se_line_6 = form_data.number('Schedule SE', 'total_se_tax', 0)
+        schedule_1_line_15 = form_data.number('Schedule 1', 'se_tax_deduction', 0)
         
-        schedule_c_profit = TaxStrategiesService._get_numeric_value(data_by_form, 'Schedule C', 'net_profit', 0)
-        schedule_f_profit = TaxStrategiesService._get_numeric_value(data_by_form, 'Schedule F', 'net_profit', 0)
+        schedule_c_profit = form_data.number('Schedule C', 'net_profit', 0)
+        schedule_f_profit = form_data.number('Schedule F', 'net_profit', 0)
         
         if not schedule_se_filed:
             if schedule_c_profit > 400 or schedule_f_profit > 400:
@@ -738,7 +737,7 @@ class TaxStrategiesService:
             status = TaxStrategyStatus.FULLY_UTILIZED
         
         marginal_rate = TaxStrategiesService._estimate_marginal_rate(
-            TaxStrategiesService._get_numeric_value(data_by_form, '1040', 'taxable_income', 0)
+            form_data.number('1040', 'taxable_income', 0)
         )
         current_benefit = schedule_1_line_15 * (marginal_rate / 100)
         potential_benefit = expected_deduction * (marginal_rate / 100)
@@ -761,16 +760,16 @@ class TaxStrategiesService:
     
     # Strategy 7: Self-Employed Health Insurance Deduction
     @staticmethod
-    def _analyze_se_health_insurance(data_by_form: Dict, client) -> Optional[AnalysisResult]:
+    def _analyze_se_health_insurance(form_data: FormData, client) -> Optional[AnalysisResult]:
         """Analyze Self-Employed Health Insurance Deduction (§ 162(l))"""
         forms_analyzed = []
         
-        schedule_c_profit = TaxStrategiesService._get_numeric_value(data_by_form, 'Schedule C', 'net_profit', 0)
-        schedule_se_line_6 = TaxStrategiesService._get_numeric_value(data_by_form, 'Schedule SE', 'total_se_tax', 0)
-        schedule_1_line_17 = TaxStrategiesService._get_numeric_value(data_by_form, 'Schedule 1', 'se_health_insurance', 0)
+        schedule_c_profit = form_data.number('Schedule C', 'net_profit', 0)
+        schedule_se_line_6 = form_data.number('Schedule SE', 'total_se_tax', 0)
+        schedule_1_line_17 = form_data.number('Schedule 1', 'se_health_insurance', 0)
         
         # Estimate health insurance premiums (would need actual data)
-        health_premiums = TaxStrategiesService._get_numeric_value(data_by_form, '1095-A', 'premiums', 0)
+        health_premiums = form_data.number('1095-A', 'premiums', 0)
         
         if schedule_c_profit == 0:
             return TaxStrategiesService._create_strategy_result(
@@ -805,11 +804,11 @@ class TaxStrategiesService:
             recommendations.append("Claim self-employed health insurance deduction on Schedule 1 Line 17")
         
         # Check for PTC coordination
-        if 'Form 8962' in data_by_form:
+        if 'Form 8962' in form_data:
             flags.append("Verify PTC coordination is correct")
         
         marginal_rate = TaxStrategiesService._estimate_marginal_rate(
-            TaxStrategiesService._get_numeric_value(data_by_form, '1040', 'taxable_income', 0)
+            form_data.number('1040', 'taxable_income', 0)
         )
         current_benefit = schedule_1_line_17 * (marginal_rate / 100)
         potential_benefit = deduction_limit * (marginal_rate / 100)
@@ -832,17 +831,17 @@ class TaxStrategiesService:
     
     # Strategy 8: Home Office Deduction
     @staticmethod
-    def _analyze_home_office(data_by_form: Dict, client) -> Optional[AnalysisResult]:
+    def _analyze_home_office(form_data: FormData, client) -> Optional[AnalysisResult]:
         """Analyze Home Office Deduction (§ 280A(c))"""
         forms_analyzed = []
         
-        form_8829_filed = 'Form 8829' in data_by_form
-        form_8829_line_36 = TaxStrategiesService._get_numeric_value(data_by_form, 'Form 8829', 'home_office_deduction', 0)
-        form_8829_line_35 = TaxStrategiesService._get_numeric_value(data_by_form, 'Form 8829', 'tentative_deduction', 0)
-        schedule_c_line_18 = TaxStrategiesService._get_numeric_value(data_by_form, 'Schedule C', 'simplified_home_office', 0)
-        schedule_c_line_30 = TaxStrategiesService._get_numeric_value(data_by_form, 'Schedule C', 'home_office_deduction', 0)
+        form_8829_filed = 'Form 8829' in form_data
+        form_8829_line_36 = form_data.number('Form 8829', 'home_office_deduction', 0)
+        form_8829_line_35 = form_data.number('Form 8829', 'tentative_deduction', 0)
+        schedule_c_line_18 = form_data.number('Schedule C', 'simplified_home_office', 0)
+        schedule_c_line_30 = form_data.number('Schedule C', 'home_office_deduction', 0)
         
-        schedule_c_profit = TaxStrategiesService._get_numeric_value(data_by_form, 'Schedule C', 'net_profit', 0)
+        schedule_c_profit = form_data.number('Schedule C', 'net_profit', 0)
         
         if schedule_c_profit == 0:
             return TaxStrategiesService._create_strategy_result(
@@ -883,7 +882,7 @@ class TaxStrategiesService:
         
         deduction_amount = form_8829_line_36 if form_8829_line_36 > 0 else (schedule_c_line_18 + schedule_c_line_30)
         marginal_rate = TaxStrategiesService._estimate_marginal_rate(
-            TaxStrategiesService._get_numeric_value(data_by_form, '1040', 'taxable_income', 0)
+            form_data.number('1040', 'taxable_income', 0)
         )
         current_benefit = deduction_amount * (marginal_rate / 100)
         potential_benefit = current_benefit * 1.2  # Estimate 20% more potential
@@ -906,13 +905,13 @@ class TaxStrategiesService:
     
     # Strategy 9: QSBS Exclusion
     @staticmethod
-    def _analyze_qsbs_exclusion(data_by_form: Dict, client) -> Optional[AnalysisResult]:
+    def _analyze_qsbs_exclusion(form_data: FormData, client) -> Optional[AnalysisResult]:
         """Analyze Qualified Small Business Stock (QSBS) Exclusion (§ 1202)"""
         forms_analyzed = []
         
-        schedule_d_filed = 'Schedule D' in data_by_form
-        form_8949_code_q = TaxStrategiesService._get_numeric_value(data_by_form, 'Form 8949', 'qsbs_exclusion', 0)
-        capital_gains = TaxStrategiesService._get_numeric_value(data_by_form, 'Schedule D', 'capital_gains', 0)
+        schedule_d_filed = 'Schedule D' in form_data
+        form_8949_code_q = form_data.number('Form 8949', 'qsbs_exclusion', 0)
+        capital_gains = form_data.number('Schedule D', 'capital_gains', 0)
         
         if not schedule_d_filed and capital_gains == 0:
             return TaxStrategiesService._create_strategy_result(
@@ -949,7 +948,7 @@ class TaxStrategiesService:
                 status = TaxStrategyStatus.NOT_APPLICABLE
         
         marginal_rate = TaxStrategiesService._estimate_marginal_rate(
-            TaxStrategiesService._get_numeric_value(data_by_form, '1040', 'taxable_income', 0)
+            form_data.number('1040', 'taxable_income', 0)
         )
         current_benefit = form_8949_code_q * (marginal_rate / 100)
         potential_benefit = capital_gains * 0.5 * (marginal_rate / 100) if capital_gains > 0 else 0  # Estimate 50% exclusion
@@ -972,16 +971,16 @@ class TaxStrategiesService:
     
     # Strategy 10: Paid Family and Medical Leave Credit
     @staticmethod
-    def _analyze_fmla_credit(data_by_form: Dict, client) -> Optional[AnalysisResult]:
+    def _analyze_fmla_credit(form_data: FormData, client) -> Optional[AnalysisResult]:
         """Analyze Paid Family and Medical Leave Credit (§ 45S)"""
         forms_analyzed = []
         
-        form_8994_filed = 'Form 8994' in data_by_form
-        form_8994_line_3 = TaxStrategiesService._get_numeric_value(data_by_form, 'Form 8994', 'credit_amount', 0)
-        w2_employees = TaxStrategiesService._get_numeric_value(data_by_form, 'W-2', 'employee_count', 0)
+        form_8994_filed = 'Form 8994' in form_data
+        form_8994_line_3 = form_data.number('Form 8994', 'credit_amount', 0)
+        w2_employees = form_data.number('W-2', 'employee_count', 0)
         
         # Check for business with employees
-        schedule_c_profit = TaxStrategiesService._get_numeric_value(data_by_form, 'Schedule C', 'net_profit', 0)
+        schedule_c_profit = form_data.number('Schedule C', 'net_profit', 0)
         has_business = schedule_c_profit > 0 or w2_employees > 0
         
         if not has_business:
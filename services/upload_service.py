@@ -0,0 +1,85 @@
+"""
+Upload Service - Streamed Document Uploads
+
+Writes uploaded files to disk in fixed-size chunks and computes their SHA-256
+in the same pass, so an upload is never held in memory whole and is never read
+a second time just to hash it.
+
+The hash is stored on Document.content_hash and is used to:
+- Reject a client's duplicate uploads before a document (or OCR job) exists;
+  a unique (client_id, content_hash) index also stops concurrent duplicates.
+  The upload route streams to a temporary file and moves it to its final,
+  uniquely named path only after the document is committed, so a rejected
+  duplicate never overwrites or removes an existing document's file
+- Key the OCR cache without re-hashing the file when it is processed
+
+Size limit:
+- MAX_UPLOAD_BYTES (env, default 16MB) sets the request limit and is enforced
+  again while writing, for requests that do not send a Content-Length
+- Werkzeug spools multipart file parts over 500KB to a temporary file, so
+  raising the limit for large scanned returns does not raise memory use
+"""
+
+from models import Document
+from werkzeug.exceptions import RequestEntityTooLarge
+import hashlib
+import os
+
+
+class UploadService:
+    """Service for streaming uploads to disk and detecting duplicates"""
+
+    CHUNK_SIZE = 1024 * 1024
+
+    @staticmethod
+    def save_stream(stream, file_path, max_bytes=None):
+        """
+        Copy a stream to file_path in chunks, hashing it as it is written.
+
+        A partially written file is removed if the copy fails or exceeds max_bytes.
+
+        Args:
+            stream: Readable binary stream, e.g. FileStorage.stream
+            file_path: Destination path
+            max_bytes: Optional size limit in bytes
+
+        Returns:
+            tuple: (content_hash, size) with content_hash the SHA-256 hex digest
+
+        Raises:
+            RequestEntityTooLarge: If the stream is longer than max_bytes
+        """
+        digest = hashlib.sha256()
+        size = 0
+
+        try:
+            with open(file_path, 'wb') as f:
+                for chunk in iter(lambda: stream.read(UploadService.CHUNK_SIZE), b''):
+                    size += len(chunk)
+                    if max_bytes is not None and size > max_bytes:
+                        raise RequestEntityTooLarge()
+                    digest.update(chunk)
+                    f.write(chunk)
+        except BaseException:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+            raise
+
+        return digest.hexdigest(), size
+
+    @staticmethod
+    def find_duplicate(client_id, content_hash):
+        """
+        A client's existing document with the same content, or None.
+
+        Args:
+            client_id: ID of the client
+            content_hash: SHA-256 hex digest of the uploaded file
+
+        Returns:
+            Document or None
+        """
+        return Document.query.filter_by(
+            client_id=client_id,
+            content_hash=content_hash
+        ).order_by(Document.id.asc()).first()
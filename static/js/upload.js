@@ -273,14 +273,30 @@ async function processDocument(documentId) {
             method: 'POST'
         });
 
-        if (response.ok) {
-            const result = await response.json();
-            showSuccess(`Document processed. Forms detected: ${result.forms_detected.join(', ')}`);
-            loadDocuments();
-        } else {
+        if (!response.ok) {
             const error = await response.json();
             showError(error.error || 'Failed to process document');
+            return;
+        }
+
+        // Processing runs in the background; show the queued status, then long-poll the job
+        let { job } = await response.json();
+        loadDocuments();
+
+        while (job.status === 'queued' || job.status === 'processing') {
+            const pollResponse = await fetch(`${API_BASE}/documents/jobs/${job.id}?wait=25`);
+            if (!pollResponse.ok) {
+                throw new Error('Failed to check processing status');
+            }
+            job = await pollResponse.json();
+        }
+
+        if (job.status === 'completed') {
+            showSuccess(`Document processed. Forms detected: ${job.result.forms_detected.join(', ')}`);
+        } else {
+            showError(job.error || 'Failed to process document');
         }
+        loadDocuments();
     } catch (error) {
         console.error('Error processing document:', error);
         showError('Failed to process document');